@@ -0,0 +1,128 @@
+"""Online backups of the live database via the SQLite backup API.
+
+Copying the DB file while the app writes to it gives torn copies (and misses
+whatever still sits in the WAL). The backup API copies a consistent snapshot
+page by page; copying a bounded number of pages per step with a short sleep in
+between keeps the SD card free for kiosk writes during the backup.
+
+If the source keeps changing underneath a stepped backup SQLite restarts it
+from the first page; after a few restarts we finish with a single-step copy,
+which under WAL only holds a read snapshot and does not block writers.
+"""
+
+import glob
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional
+
+from .config import config
+from .db import DB_PATH
+
+logger = logging.getLogger("picontrol.backup")
+
+BACKUP_PREFIX = "pi_control.db.backup."
+_MAX_RESTARTS = 3
+
+
+class BackupResult(NamedTuple):
+    path: str
+    pages: int
+    steps: int
+    restarts: int
+    duration: float
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _stepped_copy(src: sqlite3.Connection, dst: sqlite3.Connection, pages: int, sleep: float, state: dict):
+    state["remaining"] = None
+
+    def progress(status, remaining, total):
+        state["steps"] += 1
+        state["total"] = total
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if pages > 0 and state["restarts"] > _MAX_RESTARTS:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        if remaining and sleep > 0:
+            time.sleep(sleep)
+
+    src.backup(dst, pages=pages, progress=progress)
+
+
+def online_backup(db_path: Optional[str] = None, backup_dir: Optional[str] = None, pages: Optional[int] = None, sleep_ms: Optional[float] = None) -> BackupResult:
+    """Back up db_path into backup_dir and return what was copied.
+
+    The copy is written to a .partial file and renamed once complete, so the
+    backup directory never holds a half-written database.
+    """
+    db_path = db_path or DB_PATH
+    backup_dir = backup_dir or config.BACKUP_DIR
+    pages = pages or config.BACKUP_STEP_PAGES
+    sleep = (config.BACKUP_STEP_SLEEP_MS if sleep_ms is None else sleep_ms) / 1000.0
+
+    os.makedirs(backup_dir, exist_ok=True)
+    # Microseconds, plus a counter in case two backups still land on the same name
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    dest = os.path.join(backup_dir, f"{BACKUP_PREFIX}{ts}")
+    n = 1
+    while os.path.exists(dest) or os.path.exists(dest + ".partial"):
+        dest = os.path.join(backup_dir, f"{BACKUP_PREFIX}{ts}-{n}")
+        n += 1
+    partial = dest + ".partial"
+
+    t0 = time.monotonic()
+    src = sqlite3.connect(db_path, timeout=config.DB_BUSY_TIMEOUT_MS / 1000.0)
+    dst = sqlite3.connect(partial)
+    state = {"steps": 0, "restarts": 0, "total": 0}
+    try:
+        try:
+            _stepped_copy(src, dst, pages, sleep, state)
+        except _TooManyRestarts:
+            logger.info("Backup restarted %d times under write load; finishing in one step", state["restarts"])
+            _stepped_copy(src, dst, -1, 0, state)
+        # Leave a standalone single-file database, not a WAL-mode copy
+        dst.execute("PRAGMA journal_mode=DELETE")
+    except Exception:
+        dst.close()
+        src.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    dst.close()
+    src.close()
+    os.replace(partial, dest)
+
+    result = BackupResult(dest, state["total"], state["steps"], state["restarts"], time.monotonic() - t0)
+    logger.info("Backup %s: %d pages in %d steps (%d restarts) in %.2fs", dest, result.pages, result.steps, result.restarts, result.duration)
+    return result
+
+
+def prune_backups(backup_dir: Optional[str] = None, retention_days: Optional[int] = None) -> List[str]:
+    """Delete backups older than retention_days; returns removed paths."""
+    backup_dir = backup_dir or config.BACKUP_DIR
+    retention_days = config.BACKUP_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = time.time() - retention_days * 86400
+    removed = []
+    for path in glob.glob(os.path.join(backup_dir, BACKUP_PREFIX + "*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed.append(path)
+        except OSError:
+            logger.warning("Could not remove old backup %s", path)
+    return removed
+
+
+def backup_with_retention(db_path: Optional[str] = None, backup_dir: Optional[str] = None) -> BackupResult:
+    """Take an online backup, then enforce BACKUP_RETENTION_DAYS."""
+    result = online_backup(db_path=db_path, backup_dir=backup_dir)
+    for path in prune_backups(backup_dir=os.path.dirname(result.path)):
+        logger.info("Removed expired backup %s", path)
+    return result
@@ -0,0 +1,182 @@
+"""Group-commit writer for check-ins.
+
+Every tap used to pay for its own commit (and fsync) plus a refresh round
+trip. The writer owns a single background thread that drains a queue of tap
+requests: the first request opens a short batching window, everything that
+arrives within it is inserted in one transaction and committed once, and each
+caller's future is resolved with the same (checkin, employee, message) tuple
+the crud functions return.
+
+Callers on any thread use checkin_by_rfid()/checkin_for_employee(); the writer
+is started lazily on first use and stopped from the application shutdown hook.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Session
+
+from . import metrics
+from .config import config
+from .db import get_engine
+from .crud import lookup_employee_by_rfid, get_employee, _record_checkin
+
+logger = logging.getLogger("picontrol.checkin_writer")
+
+_BY_RFID = "rfid"
+_BY_EMPLOYEE = "employee"
+
+
+class CheckinWriter:
+    def __init__(self, engine=None, window_ms: Optional[float] = None, max_batch: Optional[int] = None):
+        self.engine = engine
+        self.window = (config.CHECKIN_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000.0
+        self.max_batch = max_batch or config.CHECKIN_BATCH_MAX
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="checkin-writer", daemon=True)
+            self._thread.start()
+        logger.info("CheckinWriter started (window=%.1fms max_batch=%d)", self.window * 1000, self.max_batch)
+
+    def stop(self, timeout: float = 2):
+        thread = self._thread
+        if thread and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout=timeout)
+
+    def submit_rfid(self, rfid_uid: str, timestamp: Optional[datetime] = None) -> Future:
+        return self._submit(_BY_RFID, rfid_uid, timestamp)
+
+    def submit_employee(self, document_id: str) -> Future:
+        return self._submit(_BY_EMPLOYEE, document_id, None)
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _submit(self, kind: str, key: str, timestamp: Optional[datetime]) -> Future:
+        self.start()
+        fut = Future()
+        self._queue.put((kind, key, timestamp, fut))
+        return fut
+
+    # ------------------ writer thread ------------------
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _apply(self, session: Session, kind: str, key: str, timestamp: Optional[datetime]):
+        if kind == _BY_RFID:
+            employee = lookup_employee_by_rfid(session, key)
+        else:
+            employee = get_employee(session, key)
+        if not employee:
+            return None
+        checkin, message = _record_checkin(session, employee, timestamp)
+        return checkin, employee, message
+
+    def _write_batch(self, batch):
+        engine = self.engine or get_engine()
+        try:
+            # expire_on_commit=False keeps the returned objects readable by
+            # callers on other threads once the session is closed.
+            with Session(engine, expire_on_commit=False) as session:
+                results = [self._apply(session, kind, key, ts) for kind, key, ts, _ in batch]
+                session.commit()
+        except Exception:
+            logger.exception("Batched check-in commit failed; retrying %d taps one by one", len(batch))
+            self._write_each(engine, batch)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        for (_, _, _, fut), result in zip(batch, results):
+            fut.set_result(result)
+
+    def _write_each(self, engine, batch):
+        for kind, key, ts, fut in batch:
+            try:
+                with Session(engine, expire_on_commit=False) as session:
+                    result = self._apply(session, kind, key, ts)
+                    session.commit()
+                self.writes += 1
+                fut.set_result(result)
+            except Exception as e:
+                fut.set_exception(e)
+
+
+# Process-wide writer used by the RFID thread and the HTTP routes
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> CheckinWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = CheckinWriter()
+        return _writer
+
+
+def checkin_by_rfid(rfid_uid: str, timeout: Optional[float] = None, timestamp: Optional[datetime] = None):
+    """Queue a tap by RFID and wait for its result (or None if unknown).
+
+    As with crud.create_checkin_by_rfid, the employee in the result is an
+    rfid_cache.EmployeeRecord rather than an ORM Employee.
+
+    timestamp, when given, is when the reader saw the card; see _record_checkin.
+    """
+    return get_writer().submit_rfid(rfid_uid, timestamp).result(timeout=timeout or config.CHECKIN_RESULT_TIMEOUT)
+
+
+def checkin_for_employee(document_id: str, timeout: Optional[float] = None):
+    """Queue a manual check-in by document ID and wait for its result."""
+    return get_writer().submit_employee(document_id).result(timeout=timeout or config.CHECKIN_RESULT_TIMEOUT)
+
+
+def stop_writer():
+    if _writer is not None:
+        _writer.stop()
+
+
+def _collect_metrics():
+    if _writer is None:
+        return
+    yield ("picontrol_checkin_queue_depth", "gauge", "Check-ins waiting for the group-commit writer", _writer.depth())
+    yield ("picontrol_checkin_batches_total", "counter", "Group commits made by the check-in writer", _writer.batches)
+    yield ("picontrol_checkin_writes_total", "counter", "Check-in requests written by the check-in writer", _writer.writes)
+
+
+metrics.register_collector(_collect_metrics)
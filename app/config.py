@@ -4,6 +4,7 @@ Configuration management for PiControl.
 All settings loaded from environment variables for 12-factor app compliance.
 """
 
+import importlib.util
 import os
 from typing import Optional
 from pathlib import Path
@@ -49,9 +50,37 @@ class Config:
         """Build SQLite connection URL."""
         return f"sqlite:///{cls.get_db_path()}"
 
+    # SQLite engine profile applied to every connection (see app.db)
+    DB_JOURNAL_MODE: str = os.environ.get("PICONTROL_DB_JOURNAL_MODE", "WAL")
+    DB_SYNCHRONOUS: str = os.environ.get("PICONTROL_DB_SYNCHRONOUS", "NORMAL")
+    DB_BUSY_TIMEOUT_MS: int = int(os.environ.get("PICONTROL_DB_BUSY_TIMEOUT_MS", "5000"))
+    DB_MMAP_SIZE: int = int(os.environ.get("PICONTROL_DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+    DB_CACHE_SIZE: int = int(os.environ.get("PICONTROL_DB_CACHE_SIZE", "-8000"))  # negative = KiB
+    DB_TEMP_STORE: str = os.environ.get("PICONTROL_DB_TEMP_STORE", "MEMORY")
+    DB_READ_POOL_SIZE: int = int(os.environ.get("PICONTROL_DB_READ_POOL_SIZE", "4"))
+    DB_WRITE_POOL_TIMEOUT: float = float(os.environ.get("PICONTROL_DB_WRITE_POOL_TIMEOUT", "30"))
+    # Statements slower than this are logged with their query plan (0 disables)
+    DB_SLOW_QUERY_MS: float = float(os.environ.get("PICONTROL_DB_SLOW_QUERY_MS", "200"))
+    # Add a Server-Timing header with each request's query count and DB time
+    SERVER_TIMING: bool = os.environ.get("PICONTROL_SERVER_TIMING", "1") == "1"
+
+    # Group commit for check-ins (see app.checkin_writer)
+    CHECKIN_BATCH_WINDOW_MS: float = float(os.environ.get("PICONTROL_CHECKIN_BATCH_WINDOW_MS", "5"))
+    CHECKIN_BATCH_MAX: int = int(os.environ.get("PICONTROL_CHECKIN_BATCH_MAX", "64"))
+    CHECKIN_RESULT_TIMEOUT: float = float(os.environ.get("PICONTROL_CHECKIN_RESULT_TIMEOUT", "30"))
+
     HOST: str = os.environ.get("PICONTROL_HOST", "0.0.0.0")
     PORT: int = int(os.environ.get("PICONTROL_PORT", "8000"))
     WORKERS: int = int(os.environ.get("PICONTROL_WORKERS", "1"))
+    # Live event delivery across workers: auto|local|unix (see app.event_bus)
+    EVENT_BUS: str = os.environ.get("PICONTROL_EVENT_BUS", "auto")
+    EVENT_BUS_DIR: str = os.environ.get("PICONTROL_EVENT_BUS_DIR", os.path.join(DB_DIR, "events"))
+    # WebSocket fan-out: events queued per client before a resync marker, and
+    # seconds a single send may take before the client is dropped
+    WS_QUEUE_SIZE: int = int(os.environ.get("PICONTROL_WS_QUEUE_SIZE", "64"))
+    WS_SEND_TIMEOUT: float = float(os.environ.get("PICONTROL_WS_SEND_TIMEOUT", "5"))
+    # Recent events kept per worker so reconnecting clients can catch up
+    EVENT_BUFFER_SIZE: int = int(os.environ.get("PICONTROL_EVENT_BUFFER_SIZE", "256"))
 
     LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO")
     ADMIN_LOG_PATH: str = os.environ.get(
@@ -66,14 +95,33 @@ class Config:
     RFID_ENABLED: bool = os.environ.get("PICONTROL_RFID_ENABLED", "0") == "1"
     RFID_MODE: str = os.environ.get("PICONTROL_RFID_MODE", "evdev")
     RFID_DEVICE: Optional[str] = os.environ.get("PICONTROL_RFID_DEVICE")
+    # How often configured reader paths/globs are rescanned for hot-plugged devices
+    RFID_RESCAN_MS: float = float(os.environ.get("PICONTROL_RFID_RESCAN_MS", "2000"))
     RFID_PENDING_FILE: str = os.environ.get(
         "PICONTROL_RFID_PENDING_FILE",
         "/var/lib/picontrol/rfid_assign_pending.json"
     )
     RC522_ENABLED: bool = os.environ.get("PICONTROL_ENABLE_RC522", "0") == "1"
+    # RFID_MODE=rc522: poll interval, and how long a card must be gone before it can tap again
+    RC522_POLL_MS: float = float(os.environ.get("PICONTROL_RC522_POLL_MS", "50"))
+    RC522_RELEASE_MS: float = float(os.environ.get("PICONTROL_RC522_RELEASE_MS", "500"))
+    # Only the worker holding this lock runs the reader (see app.rfid)
+    RFID_LEADER_LOCK: str = os.environ.get("PICONTROL_RFID_LEADER_LOCK", os.path.join(DB_DIR, "rfid_reader.lock"))
+    RFID_LEADER_POLL_MS: float = float(os.environ.get("PICONTROL_RFID_LEADER_POLL_MS", "250"))
+    # Repeat reads of one UID within this window count as a single tap
+    RFID_DEBOUNCE_MS: float = float(os.environ.get("PICONTROL_RFID_DEBOUNCE_MS", "1500"))
+    RFID_DEBOUNCE_SIZE: int = int(os.environ.get("PICONTROL_RFID_DEBOUNCE_SIZE", "64"))
+    # Taps are journaled here before any DB work and replayed if it fails
+    TAP_JOURNAL_PATH: str = os.environ.get("PICONTROL_TAP_JOURNAL", os.path.join(DB_DIR, "tap_journal.jsonl"))
+    TAP_JOURNAL_RETRY_MS: float = float(os.environ.get("PICONTROL_TAP_JOURNAL_RETRY_MS", "1000"))
+    # Tries before a failing tap is moved to the dead-letter file (0 = never)
+    TAP_JOURNAL_MAX_ATTEMPTS: int = int(os.environ.get("PICONTROL_TAP_JOURNAL_MAX_ATTEMPTS", "300"))
 
     BACKUP_DIR: str = os.environ.get("PICONTROL_BACKUP_DIR", "/var/backups/picontrol")
     BACKUP_RETENTION_DAYS: int = int(os.environ.get("PICONTROL_BACKUP_RETENTION_DAYS", "30"))
+    # Online backup pacing: pages copied per step and pause between steps
+    BACKUP_STEP_PAGES: int = int(os.environ.get("PICONTROL_BACKUP_STEP_PAGES", "256"))
+    BACKUP_STEP_SLEEP_MS: float = float(os.environ.get("PICONTROL_BACKUP_STEP_SLEEP_MS", "5"))
 
     DATA_RETENTION_YEARS: int = int(os.environ.get("PICONTROL_DATA_RETENTION_YEARS", "4"))
 
@@ -113,12 +161,17 @@ class Config:
             messages.append(f"WARNING: Database directory does not exist: {cls.DB_DIR}")
         elif not os.access(cls.DB_DIR, os.W_OK):
             messages.append(f"WARNING: Database directory not writable: {cls.DB_DIR}")
-        
+
+        if cls.DB_JOURNAL_MODE.upper() != "WAL":
+            messages.append(f"WARNING: DB_JOURNAL_MODE={cls.DB_JOURNAL_MODE}; readers will block kiosk writes")
+
         if cls.RFID_ENABLED:
             if cls.RFID_MODE not in ("evdev", "rc522"):
                 messages.append(f"WARNING: Invalid RFID_MODE: {cls.RFID_MODE}")
             if cls.RFID_MODE == "evdev" and not cls.RFID_DEVICE:
                 messages.append("WARNING: RFID enabled but RFID_DEVICE not set")
+            if cls.RFID_MODE == "rc522" and importlib.util.find_spec("mfrc522") is None:
+                messages.append("WARNING: RFID_MODE=rc522 but the mfrc522 package is not installed")
         
         return messages
 
@@ -1,13 +1,18 @@
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
 from sqlmodel import Session, select
-from sqlalchemy import desc, asc
-from .models import Employee, CheckIn, Config
+from sqlalchemy import desc, asc, delete, text, or_, and_, bindparam, func, union_all
+from .models import Employee, CheckIn, Config, EmployeePresence, DailyWorkSummary
 from .models import User, AdminAction
 from .db import get_engine
-from datetime import datetime, timezone
+from . import rfid_cache
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
 from .models import User
 from passlib.context import CryptContext
 import logging
+import threading
+from time import sleep
 
 # PBKDF2-SHA256 chosen for broad compatibility across deployment environments
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -40,6 +45,7 @@ def create_employee(session: Session, document_id: str, name: str, rfid_uid: Opt
             employee.archived_at = None
         session.add(employee)
         session.commit()
+        rfid_cache.invalidate()
         session.refresh(employee)
         try:
             log_admin_action(session, performed_by, "update_employee", f"updated {employee.document_id} name={name} rfid={rfid_uid}")
@@ -50,6 +56,7 @@ def create_employee(session: Session, document_id: str, name: str, rfid_uid: Opt
     employee = Employee(document_id=document_id, name=name, rfid_uid=rfid_uid)
     session.add(employee)
     session.commit()
+    rfid_cache.invalidate()
     session.refresh(employee)
     try:
         log_admin_action(session, performed_by, "create_employee", f"created {employee.document_id} name={name} rfid={rfid_uid}")
@@ -64,6 +71,11 @@ def get_employee_by_rfid(session: Session, rfid_uid: str) -> Optional[Employee]:
     return result
 
 
+def lookup_employee_by_rfid(session: Session, rfid_uid: str) -> Optional[rfid_cache.EmployeeRecord]:
+    """Cached tap lookup; returns a compact record with document_id and name."""
+    return rfid_cache.get_cache().lookup(session, rfid_uid)
+
+
 def get_employee(session: Session, document_id: str) -> Optional[Employee]:
     if not document_id:
         return None
@@ -109,6 +121,7 @@ def assign_rfid(session: Session, document_id: str, rfid_uid: Optional[str], per
 
     session.add(employee)
     session.commit()
+    rfid_cache.invalidate()
     session.refresh(employee)
     try:
         log_admin_action(session, performed_by, "assign_rfid", f"assigned rfid={rfid_uid} to {employee.document_id}")
@@ -117,20 +130,65 @@ def assign_rfid(session: Session, document_id: str, rfid_uid: Optional[str], per
     return employee
 
 
-def create_checkin_by_rfid(session: Session, rfid_uid: str) -> Optional[Tuple[CheckIn, Employee, str]]:
+class OutOfOrderCheckin(ValueError):
+    """A timestamped check-in is older than the employee's latest check-in."""
+
+
+def create_checkin_by_rfid(session: Session, rfid_uid: str) -> Optional[Tuple[CheckIn, rfid_cache.EmployeeRecord, str]]:
     """Process RFID tap to create check-in.
 
-    Returns (checkin, employee, message) or None if RFID not found.
+    Returns (checkin, employee, message) or None if RFID not found. employee
+    is the cached rfid_cache.EmployeeRecord (document_id, name, archived), not an ORM
+    Employee: load that with get_employee if more is needed.
     Automatically toggles between entry and exit based on last check-in.
     """
-    employee = get_employee_by_rfid(session, rfid_uid)
+    employee = lookup_employee_by_rfid(session, rfid_uid)
     if not employee:
         return None
 
-    statement = select(CheckIn).where(CheckIn.employee_id == employee.document_id).order_by(desc(CheckIn.timestamp))
+    checkin, message = _record_checkin(session, employee)
+    session.commit()
+    session.refresh(checkin)
+    return checkin, employee, message
+
+
+def _get_presence(session: Session, employee_id: str) -> EmployeePresence:
+    """Return the presence row for an employee, seeding it from history if missing."""
+    presence = session.get(EmployeePresence, employee_id)
+    if presence is not None:
+        return presence
+    presence = EmployeePresence(employee_id=employee_id)
+    # One-off fallback for databases that predate the presence table
+    statement = select(CheckIn).where(CheckIn.employee_id == employee_id).order_by(desc(CheckIn.timestamp), desc(CheckIn.id))
     last = session.exec(statement).first()
-    
-    if not last or last.type == "exit":
+    if last:
+        presence.last_checkin_id = last.id
+        presence.last_type = last.type
+        presence.last_timestamp = last.timestamp
+    return presence
+
+
+def _record_checkin(session: Session, employee, timestamp: Optional[datetime] = None) -> Tuple[CheckIn, str]:
+    """Add the next entry/exit check-in for employee without committing.
+
+    The toggle is decided from EmployeePresence, which is updated in the same
+    transaction so the caller's commit persists both rows together. With an
+    explicit timestamp (taps replayed from the journal) an existing check-in
+    of the employee at that instant is returned instead of adding another,
+    and OutOfOrderCheckin is raised if the employee already has a later
+    check-in: toggling against it would pair the sessions out of order.
+    """
+    if timestamp is not None:
+        statement = select(CheckIn).where(CheckIn.employee_id == employee.document_id).where(CheckIn.timestamp == timestamp)
+        existing = session.exec(statement).first()
+        if existing is not None:
+            return existing, f"Already recorded for {employee.name}"
+    presence = _get_presence(session, employee.document_id)
+    if timestamp is not None and presence.last_timestamp is not None and _as_utc(timestamp) < _as_utc(presence.last_timestamp):
+        raise OutOfOrderCheckin(
+            f"check-in at {timestamp.isoformat()} for {employee.document_id} is older than its latest one ({presence.last_timestamp.isoformat()})"
+        )
+    if presence.last_type != "entry":
         type_val = "entry"
         message = f"Welcome, {employee.name}!"
     else:
@@ -138,14 +196,184 @@ def create_checkin_by_rfid(session: Session, rfid_uid: str) -> Optional[Tuple[Ch
         message = f"Goodbye, {employee.name}!"
 
     checkin = CheckIn(employee_id=employee.document_id, type=type_val)
+    if timestamp is not None:
+        checkin.timestamp = timestamp
     session.add(checkin)
+    session.flush()
+
+    tz = get_local_timezone(session)
+    if type_val == "exit":
+        _add_worked_time(session, employee.document_id, presence.last_timestamp, checkin.timestamp, tz)
+    else:
+        summary = _get_summary(session, employee.document_id, local_day(checkin.timestamp, tz))
+        summary.open_session = True
+        session.add(summary)
+
+    presence.last_checkin_id = checkin.id
+    presence.last_type = checkin.type
+    presence.last_timestamp = checkin.timestamp
+    session.add(presence)
+    return checkin, message
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; all stored timestamps are UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def get_local_timezone(session: Session):
+    """Timezone from the 'timezone' config key, falling back to UTC."""
+    try:
+        return ZoneInfo(get_config(session, "timezone") or "UTC")
+    except Exception:
+        return timezone.utc
+
+
+def local_day(value: datetime, tz) -> date:
+    return _as_utc(value).astimezone(tz).date()
+
+
+def split_by_local_day(start: datetime, end: datetime, tz) -> List[Tuple[date, float]]:
+    """Split [start, end) into (local date, seconds) segments at local midnight."""
+    segments = []
+    current = _as_utc(start)
+    end = _as_utc(end)
+    while current < end:
+        day = current.astimezone(tz).date()
+        next_midnight = datetime.combine(day + timedelta(days=1), time(0), tzinfo=tz).astimezone(timezone.utc)
+        segment_end = min(end, next_midnight)
+        segments.append((day, (segment_end - current).total_seconds()))
+        current = segment_end
+    return segments
+
+
+def _get_summary(session: Session, employee_id: str, day: date) -> DailyWorkSummary:
+    summary = session.get(DailyWorkSummary, (employee_id, day))
+    if summary is None:
+        summary = DailyWorkSummary(employee_id=employee_id, day=day)
+    return summary
+
+
+def _add_worked_time(session: Session, employee_id: str, entry_ts: Optional[datetime], exit_ts: datetime, tz):
+    """Fold a closed entry/exit session into the per-day summaries."""
+    if entry_ts is None:
+        return
+    opened = _get_summary(session, employee_id, local_day(entry_ts, tz))
+    opened.open_session = False
+    session.add(opened)
+    for day, seconds in split_by_local_day(entry_ts, exit_ts, tz):
+        summary = _get_summary(session, employee_id, day)
+        summary.worked_seconds = (summary.worked_seconds or 0.0) + seconds
+        session.add(summary)
+
+
+def list_daily_summaries(session: Session, employee_id: str, start: Optional[date] = None, end: Optional[date] = None) -> List[DailyWorkSummary]:
+    """Per-day worked time for an employee, as a range scan over summaries."""
+    employee_id = employee_id.strip().upper()
+    statement = select(DailyWorkSummary).where(DailyWorkSummary.employee_id == employee_id)
+    if start:
+        statement = statement.where(DailyWorkSummary.day >= start)
+    if end:
+        statement = statement.where(DailyWorkSummary.day <= end)
+    statement = statement.order_by(asc(DailyWorkSummary.day))
+    return session.exec(statement).all()
+
+
+# Rebuilds run at most one at a time: two overlapping ones (two quick
+# timezone changes) could otherwise interleave batches computed in different zones
+_summary_rebuild_lock = threading.Lock()
+
+
+def rebuild_daily_summaries(session: Session, batch_size: int = 200, pause: float = 0.0) -> int:
+    """Recompute DailyWorkSummary from CheckIn with the current timezone.
+
+    Employees are rebuilt batch_size at a time, each batch in its own
+    transaction with `pause` seconds between batches, so check-ins keep being
+    written while a large history is recomputed. A check-in for an employee
+    not rebuilt yet is folded into the old summaries and then recomputed with
+    the rest. Within a batch, check-ins are streamed in (employee, timestamp)
+    order and paired the same way the entry/exit toggle does. Returns the
+    number of summary rows written.
+    """
+    with _summary_rebuild_lock:
+        # Employees with summaries but no check-ins left lose their rows too
+        employee_ids = [row[0] for row in session.exec(
+            select(CheckIn.employee_id).union(select(DailyWorkSummary.employee_id))
+        )]
+        session.commit()
+        written = 0
+        for i in range(0, len(employee_ids), batch_size):
+            if i and pause > 0:
+                sleep(pause)
+            written += _rebuild_summaries_for(session, sorted(employee_ids[i:i + batch_size]))
+        return written
+
+
+def _rebuild_summaries_for(session: Session, employee_ids: List[str]) -> int:
+    # Read the zone per batch: it is committed before a rebuild is started
+    tz = get_local_timezone(session)
+    totals = {}
+    open_days = set()
+    statement = (
+        select(CheckIn.employee_id, CheckIn.type, CheckIn.timestamp)
+        .where(CheckIn.employee_id.in_(employee_ids))
+        .order_by(asc(CheckIn.employee_id), asc(CheckIn.timestamp), asc(CheckIn.id))
+        .execution_options(yield_per=1000)
+    )
+    current_employee = None
+    entry_ts = None
+    for employee_id, type_val, ts in session.exec(statement):
+        if employee_id != current_employee:
+            if entry_ts is not None:
+                open_days.add((current_employee, local_day(entry_ts, tz)))
+            current_employee = employee_id
+            entry_ts = None
+        if type_val == "entry":
+            entry_ts = ts
+        elif entry_ts is not None:
+            for day, seconds in split_by_local_day(entry_ts, ts, tz):
+                totals[(employee_id, day)] = totals.get((employee_id, day), 0.0) + seconds
+            entry_ts = None
+    if entry_ts is not None:
+        open_days.add((current_employee, local_day(entry_ts, tz)))
+
+    session.exec(delete(DailyWorkSummary).where(DailyWorkSummary.employee_id.in_(employee_ids)))
+    rows = [
+        {"employee_id": employee_id, "day": day, "worked_seconds": totals.get((employee_id, day), 0.0), "open_session": (employee_id, day) in open_days}
+        for employee_id, day in set(totals) | open_days
+    ]
+    if rows:
+        session.exec(DailyWorkSummary.__table__.insert(), params=rows)
     session.commit()
-    session.refresh(checkin)
-    return checkin, employee, message
+    return len(rows)
+
 
+def backfill_daily_summaries(session: Session) -> int:
+    """Rebuild daily summaries if there are check-ins but no summaries at all.
 
-def list_checkins(session: Session, employee_id: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[CheckIn]:
-    """Query check-ins with optional filters."""
+    That is the state of a database created before summaries existed, or
+    imported from one. Returns the number of rows written (0 if nothing to do).
+    """
+    has_summaries = session.exec(select(DailyWorkSummary.employee_id).limit(1)).first() is not None
+    has_checkins = session.exec(select(CheckIn.id).limit(1)).first() is not None
+    if has_summaries or not has_checkins:
+        return 0
+    return rebuild_daily_summaries(session)
+
+
+# Bounds for paginated check-in listings (API and admin pages)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def list_checkins(session: Session, employee_id: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None, before_id: Optional[int] = None, before_ts: Optional[datetime] = None, limit: Optional[int] = None) -> List[CheckIn]:
+    """Query check-ins with optional filters, newest first.
+
+    before_ts/before_id form a keyset cursor: only rows strictly older than
+    (before_ts, before_id) in (timestamp, id) order are returned.
+    """
     statement = select(CheckIn)
     if employee_id:
         employee_id = employee_id.strip().upper()
@@ -154,28 +382,36 @@ def list_checkins(session: Session, employee_id: Optional[str] = None, start: Op
         statement = statement.where(CheckIn.timestamp >= start)
     if end:
         statement = statement.where(CheckIn.timestamp <= end)
-    statement = statement.order_by(desc(CheckIn.timestamp))
+    if before_ts is not None and before_id is not None:
+        statement = statement.where(or_(CheckIn.timestamp < before_ts, and_(CheckIn.timestamp == before_ts, CheckIn.id < before_id)))
+    elif before_ts is not None:
+        statement = statement.where(CheckIn.timestamp < before_ts)
+    elif before_id is not None:
+        statement = statement.where(CheckIn.id < before_id)
+    statement = statement.order_by(desc(CheckIn.timestamp), desc(CheckIn.id))
+    if limit is not None:
+        statement = statement.limit(limit)
     return session.exec(statement).all()
 
 
+def list_checkins_page(session: Session, employee_id: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None, before_id: Optional[int] = None, before_ts: Optional[datetime] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[CheckIn], Optional[dict]]:
+    """Return one page of check-ins and the cursor for the next page (or None)."""
+    limit = max(1, min(MAX_PAGE_SIZE, limit))
+    rows = list_checkins(session, employee_id=employee_id, start=start, end=end, before_id=before_id, before_ts=before_ts, limit=limit + 1)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, {"before_id": last.id, "before_ts": last.timestamp.isoformat()}
+
+
 def create_checkin_for_employee(session: Session, document_id: str) -> Optional[Tuple[CheckIn, Employee, str]]:
     """Create manual check-in for employee by document ID."""
     employee = get_employee(session, document_id)
     if not employee:
         return None
-    
-    statement = select(CheckIn).where(CheckIn.employee_id == employee.document_id).order_by(desc(CheckIn.timestamp))
-    last = session.exec(statement).first()
-    
-    if not last or last.type == "exit":
-        type_val = "entry"
-        message = f"Welcome, {employee.name}!"
-    else:
-        type_val = "exit"
-        message = f"Goodbye, {employee.name}!"
 
-    checkin = CheckIn(employee_id=employee.document_id, type=type_val)
-    session.add(checkin)
+    checkin, message = _record_checkin(session, employee)
     session.commit()
     session.refresh(checkin)
     return checkin, employee, message
@@ -187,30 +423,165 @@ def list_recent_checkins(session: Session, limit: int = 20) -> List[CheckIn]:
     return session.exec(statement).all()
 
 
+def list_present_employees(session: Session) -> List[Tuple[Employee, EmployeePresence]]:
+    """Employees whose latest check-in is an entry, most recent first."""
+    statement = (
+        select(Employee, EmployeePresence)
+        .where(Employee.document_id == EmployeePresence.employee_id)
+        .where(EmployeePresence.last_type == "entry")
+        .order_by(desc(EmployeePresence.last_timestamp))
+    )
+    return session.exec(statement).all()
+
+
+def rebuild_presence(session: Session) -> int:
+    """Recompute EmployeePresence from CheckIn in a single pass.
+
+    Returns the number of presence rows written.
+    """
+    presence_table = EmployeePresence.__tablename__
+    checkin_table = CheckIn.__tablename__
+    session.exec(delete(EmployeePresence))
+    result = session.exec(text(
+        f"INSERT INTO {presence_table} (employee_id, last_checkin_id, last_type, last_timestamp) "
+        f"SELECT employee_id, id, type, timestamp FROM ("
+        f"  SELECT id, employee_id, type, timestamp, "
+        f"  ROW_NUMBER() OVER (PARTITION BY employee_id ORDER BY timestamp DESC, id DESC) AS rn "
+        f"  FROM {checkin_table}"
+        f") WHERE rn = 1"
+    ))
+    session.commit()
+    return result.rowcount
+
+
+def backfill_presence(session: Session) -> int:
+    """Rebuild presence if there are check-ins but no presence rows at all.
+
+    The per-employee fallback in _get_presence only seeds an employee on
+    their next tap, so without this the dashboard's present list of an
+    upgraded or imported database stays empty. Returns the rows written.
+    """
+    has_presence = session.exec(select(EmployeePresence.employee_id).limit(1)).first() is not None
+    has_checkins = session.exec(select(CheckIn.id).limit(1)).first() is not None
+    if has_presence or not has_checkins:
+        return 0
+    return rebuild_presence(session)
+
+
+class SessionBound(NamedTuple):
+    """Entry or exit end of a worked session, with CheckIn's attribute names."""
+    id: int
+    employee_id: str
+    type: str
+    timestamp: datetime
+
+
+@lru_cache(maxsize=None)
+def _work_sessions_statement(by_employee: bool, has_start: bool, has_end: bool):
+    """Build the session pairing statement once per filter combination."""
+    ts_type = CheckIn.__table__.c.timestamp.type
+    employee_id = bindparam("employee_id")
+    start = bindparam("start", type_=ts_type)
+    end = bindparam("end", type_=ts_type)
+    cols = (CheckIn.id, CheckIn.employee_id, CheckIn.type, CheckIn.timestamp)
+    employees = select(Employee.document_id)
+    in_range = select(*cols)
+    if by_employee:
+        employees = employees.where(Employee.document_id == employee_id)
+        in_range = in_range.where(CheckIn.employee_id == employee_id)
+    if has_start:
+        in_range = in_range.where(CheckIn.timestamp >= start)
+    if has_end:
+        in_range = in_range.where(CheckIn.timestamp <= end)
+    parts = [in_range]
+    boundaries = []
+    if has_start:
+        boundaries.append((CheckIn.timestamp < start, desc))
+    if has_end:
+        boundaries.append((CheckIn.timestamp > end, asc))
+    for outside, order in boundaries:
+        # One index seek per employee for the check-in just outside the range
+        nearest = (
+            select(CheckIn.id)
+            .where(CheckIn.employee_id == Employee.document_id, outside)
+            .order_by(order(CheckIn.timestamp), order(CheckIn.id))
+            .limit(1)
+            .correlate(Employee)
+            .scalar_subquery()
+        )
+        parts.append(select(*cols).where(CheckIn.id.in_(employees.with_only_columns(nearest, maintain_column_froms=True))))
+    rows = union_all(*parts).subquery() if len(parts) > 1 else in_range.subquery()
+
+    window = {"partition_by": rows.c.employee_id, "order_by": (rows.c.timestamp, rows.c.id)}
+    seq = select(
+        rows.c.employee_id,
+        rows.c.id.label("entry_id"),
+        rows.c.type,
+        rows.c.timestamp.label("entry_ts"),
+        func.lead(rows.c.id).over(**window).label("exit_id"),
+        func.lead(rows.c.type).over(**window).label("next_type"),
+        func.lead(rows.c.timestamp, type_=ts_type).over(**window).label("exit_ts"),
+    ).subquery()
+
+    entry_ts = func.max(seq.c.entry_ts, start, type_=ts_type) if has_start else seq.c.entry_ts
+    exit_ts = func.min(seq.c.exit_ts, end, type_=ts_type) if has_end else seq.c.exit_ts
+    statement = select(
+        seq.c.employee_id,
+        seq.c.entry_id,
+        entry_ts.label("entry_ts"),
+        seq.c.exit_id,
+        exit_ts.label("exit_ts"),
+        ((func.julianday(exit_ts) - func.julianday(entry_ts)) * 86400.0).label("seconds"),
+    ).where(seq.c.type == "entry", seq.c.next_type == "exit")
+    if has_start:
+        statement = statement.where(seq.c.exit_ts > start)
+    if has_end:
+        statement = statement.where(seq.c.entry_ts < end)
+    return statement.order_by(seq.c.employee_id, seq.c.entry_ts, seq.c.entry_id)
+
+
+def work_sessions(session: Session, employee_id: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None, yield_per: Optional[int] = None):
+    """Worked sessions overlapping [start, end] for one or all employees, in one statement.
+
+    Yields (employee_id, entry_id, entry_ts, exit_id, exit_ts, seconds) rows
+    ordered by employee and entry. An entry pairs with the check-in right
+    after it when that is an exit (LEAD over employee and timestamp), which
+    is what the entry/exit toggle produces. Besides the check-ins in range,
+    the last one before start and the first one after end are fed to the
+    window, so sessions straddling a boundary are kept; their timestamps and
+    seconds (millisecond precision, SQLite's julianday) are clipped to the
+    range, so consecutive ranges add up.
+    """
+    params = {}
+    if employee_id:
+        params["employee_id"] = employee_id.strip().upper()
+    if start:
+        params["start"] = start
+    if end:
+        params["end"] = end
+    statement = _work_sessions_statement(bool(employee_id), bool(start), bool(end))
+    return session.exec(statement, params=params, execution_options={"yield_per": yield_per} if yield_per else {})
+
+
 def hours_worked(session: Session, employee_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None):
-    """Calculate hours worked from entry/exit pairs in time range."""
+    """Calculate hours worked from entry/exit pairs in time range.
+
+    Returns (total hours, [(entry, exit)]) with sessions clipped to the range
+    as built by work_sessions; pair items are SessionBound tuples.
+    """
     if not employee_id:
         return 0, []
-    
-    employee_id = employee_id.strip().upper()
-    checkins = list_checkins(session, employee_id=employee_id, start=start, end=end)
-    
+
     pairs = []
-    entry = None
-    
-    for checkin in reversed(checkins):
-        if checkin.type == "entry":
-            entry = checkin
-        elif checkin.type == "exit" and entry:
-            pairs.append((entry, checkin))
-            entry = None
-    
-    total_hours = 0
-    for entry_checkin, exit_checkin in pairs:
-        delta = exit_checkin.timestamp - entry_checkin.timestamp
-        total_hours += delta.total_seconds() / 3600
-    
-    return total_hours, pairs
+    total_seconds = 0.0
+    for emp_id, entry_id, entry_ts, exit_id, exit_ts, seconds in work_sessions(session, employee_id, start, end):
+        pairs.append((
+            SessionBound(entry_id, emp_id, "entry", entry_ts),
+            SessionBound(exit_id, emp_id, "exit", exit_ts),
+        ))
+        total_seconds += seconds
+
+    return total_seconds / 3600, pairs
 
 
 def list_archived_employees(session: Session) -> List[Employee]:
@@ -231,6 +602,7 @@ def restore_employee(session: Session, document_id: str, performed_by: Optional[
     employee.archived_at = None
     session.add(employee)
     session.commit()
+    rfid_cache.invalidate()
     session.refresh(employee)
     try:
         log_admin_action(session, performed_by, "restore_employee", f"restored {employee.document_id}")
@@ -251,6 +623,7 @@ def archive_employee(session: Session, document_id: str, performed_by: Optional[
     employee.archived_at = datetime.now(tz=timezone.utc)
     session.add(employee)
     session.commit()
+    rfid_cache.invalidate()
     session.refresh(employee)
     try:
         log_admin_action(session, performed_by, "archive_employee", f"archived {employee.document_id}")
@@ -1,24 +1,151 @@
 from sqlmodel import SQLModel, create_engine
+from sqlalchemy import event
+from starlette.requests import Request
+import logging
 import os
+import time
+
+from . import metrics
+from .config import config
 
 # Database stored outside repository for security and permissions management
 DB_DIR = os.environ.get("PICONTROL_DB_DIR", "/var/lib/picontrol")
 DB_PATH = os.path.join(DB_DIR, "pi_control.db")
 sqlite_url = f"sqlite:///{DB_PATH}"
-engine = create_engine(sqlite_url, echo=False, connect_args={"check_same_thread": False})
+
+_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+_TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+# Methods whose requests only read from the database (see get_session)
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+logger = logging.getLogger("picontrol.db")
+
+QUERY_LATENCY = metrics.histogram("picontrol_db_query_duration_seconds", "SQL statement duration, by engine", ("engine",))
+
+
+def engine_profile() -> dict:
+    """Return the SQLite PRAGMA profile applied to every new connection.
+
+    Values come from the PICONTROL_DB_* settings; anything outside the set of
+    values SQLite accepts falls back to the tuned default.
+    """
+    journal_mode = config.DB_JOURNAL_MODE.upper()
+    synchronous = config.DB_SYNCHRONOUS.upper()
+    temp_store = config.DB_TEMP_STORE.upper()
+    return {
+        "journal_mode": journal_mode if journal_mode in _JOURNAL_MODES else "WAL",
+        "synchronous": synchronous if synchronous in _SYNCHRONOUS_MODES else "NORMAL",
+        "busy_timeout": int(config.DB_BUSY_TIMEOUT_MS),
+        "mmap_size": int(config.DB_MMAP_SIZE),
+        "cache_size": int(config.DB_CACHE_SIZE),
+        "temp_store": temp_store if temp_store in _TEMP_STORES else "MEMORY",
+    }
+
+
+def _apply_profile(dbapi_connection, readonly: bool):
+    profile = engine_profile()
+    cursor = dbapi_connection.cursor()
+    try:
+        # journal_mode is persistent in the file and needs a write lock, so
+        # only the writer sets it; readers just inherit WAL from the file.
+        if not readonly:
+            # Only takes effect on a brand-new file; lets cleanup release pages
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute(f"PRAGMA journal_mode={profile['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={profile['synchronous']}")
+        cursor.execute(f"PRAGMA busy_timeout={profile['busy_timeout']}")
+        cursor.execute(f"PRAGMA mmap_size={profile['mmap_size']}")
+        cursor.execute(f"PRAGMA cache_size={profile['cache_size']}")
+        cursor.execute(f"PRAGMA temp_store={profile['temp_store']}")
+        if readonly:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _make_engine(readonly: bool):
+    if readonly:
+        pool_args = {"pool_size": config.DB_READ_POOL_SIZE, "max_overflow": config.DB_READ_POOL_SIZE}
+    else:
+        # A single pooled connection serializes every write in this process,
+        # so read-then-insert toggles never race for the WAL write lock.
+        pool_args = {"pool_size": 1, "max_overflow": 0, "pool_timeout": config.DB_WRITE_POOL_TIMEOUT}
+    eng = create_engine(sqlite_url, echo=False, connect_args={"check_same_thread": False}, **pool_args)
+
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_profile(dbapi_connection, readonly)
+
+    engine_label = "reader" if readonly else "writer"
+
+    # The start time lives on the statement's execution context: a statement
+    # that raises never reaches after_cursor_execute, and a value left on the
+    # connection would be paired with the next statement's end
+    @event.listens_for(eng, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._picontrol_started = time.perf_counter()
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_picontrol_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        QUERY_LATENCY.observe(elapsed, engine_label)
+        metrics.record_request_query(elapsed)
+        if config.DB_SLOW_QUERY_MS and elapsed * 1000 >= config.DB_SLOW_QUERY_MS:
+            _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+    return eng
+
+
+def _log_slow_query(conn, statement: str, parameters, executemany: bool, elapsed: float):
+    plan = ""
+    if not executemany:
+        try:
+            # A separate cursor on the same connection: the statement's own
+            # cursor may still hold unread rows
+            rows = conn.connection.driver_connection.execute("EXPLAIN QUERY PLAN " + statement, parameters or ()).fetchall()
+            plan = "\n".join(f"  {row[3]}" for row in rows)
+        except Exception as e:
+            plan = f"  (no plan: {e})"
+    logger.warning("Slow query (%.1fms): %s\n%s", elapsed * 1000, " ".join(statement.split()), plan)
+
+
+engine = _make_engine(readonly=False)
+read_engine = _make_engine(readonly=True)
 
 
 def init_db():
     """Initialize database schema and create all tables."""
     import app.models  # noqa: F401
-    
+
     try:
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     except Exception:
         pass
-    
+
     SQLModel.metadata.create_all(engine)
-    
+    # create_all skips indexes on tables that already exist
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    # Databases from before presence/daily summaries existed (or imported
+    # from one) have check-ins but no derived rows: compute them once
+    from sqlmodel import Session
+    from app.crud import backfill_presence, backfill_daily_summaries
+    with Session(engine) as session:
+        presence_rows = backfill_presence(session)
+        summary_rows = backfill_daily_summaries(session)
+    if presence_rows:
+        logger.info("Backfilled presence for %d employees", presence_rows)
+    if summary_rows:
+        logger.info("Backfilled %d daily work summaries", summary_rows)
+
     try:
         with engine.connect() as conn:
             res = conn.exec("SELECT name FROM sqlite_master WHERE type='table';")
@@ -32,12 +159,52 @@ def get_engine():
     return engine
 
 
-def get_session():
+def get_read_engine():
+    return read_engine
+
+
+def dispose_engines():
+    """Checkpoint the WAL and close pooled connections on both engines.
+
+    Must be called before the database file is replaced on disk, otherwise
+    pooled connections keep using the old file and a stale WAL could be
+    applied to the new one.
+    """
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    except Exception:
+        pass
+    engine.dispose()
+    read_engine.dispose()
+
+
+def get_write_session():
     from sqlmodel import Session
     with Session(engine) as session:
         yield session
 
 
+def get_read_session():
+    from sqlmodel import Session
+    with Session(read_engine) as session:
+        yield session
+
+
+def get_session(request: Request):
+    """Yield a session bound to the engine matching the request.
+
+    GET/HEAD/OPTIONS routes get a read-only session from the pooled reader
+    engine so long report queries never hold the writer; everything else gets
+    the single-writer engine. Routes that read on a write method (or write on a
+    read method) depend on get_read_session/get_write_session explicitly.
+    """
+    from sqlmodel import Session
+    bind = read_engine if request.method in _READ_METHODS else engine
+    with Session(bind) as session:
+        yield session
+
+
 try:
     init_db()
 except Exception:
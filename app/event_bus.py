@@ -0,0 +1,175 @@
+"""Event bus that delivers live events to the broadcaster of every worker.
+
+With PICONTROL_WORKERS > 1 each uvicorn worker holds its own set of
+WebSockets, so an event pushed in one process must reach all of them.
+
+- LocalEventBus: single process; hands the event straight to this loop.
+- UnixSocketEventBus: every worker binds a Unix datagram socket in a shared
+  directory and publishing sends the serialized event to each socket there
+  (including its own), so all workers deliver through the same path.
+  Sockets left behind by dead workers are removed on the first failed send.
+
+Events are published already serialized, so each event is encoded once no
+matter how many workers and clients receive it. Each carries a sequence
+number from next_sequence(); the unix bus keeps the counter in a file under
+flock so numbers are increasing across all workers and survive restarts.
+"""
+
+import abc
+import fcntl
+import glob
+import itertools
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Optional
+
+from .config import config
+
+logger = logging.getLogger("picontrol.event_bus")
+
+_SOCKET_PREFIX = "worker-"
+_MAX_DATAGRAM = 64 * 1024
+
+
+class EventBus(abc.ABC):
+    """Base class: publish() may be called from any thread."""
+
+    def __init__(self):
+        self._loop = None
+        self._deliver: Optional[Callable[[int, str], None]] = None
+        self._counter = itertools.count(1)
+        self._counter_lock = threading.Lock()
+
+    def start(self, loop, deliver: Callable[[int, str], None]):
+        """Begin delivering events to deliver(seq, text), called on loop."""
+        self._loop = loop
+        self._deliver = deliver
+
+    def next_sequence(self) -> int:
+        with self._counter_lock:
+            return next(self._counter)
+
+    @abc.abstractmethod
+    def publish(self, seq: int, text: str) -> bool:
+        """Send a serialized event to every worker; False if it was not sent."""
+
+    def stop(self):
+        self._loop = None
+        self._deliver = None
+
+
+class LocalEventBus(EventBus):
+    def publish(self, seq: int, text: str) -> bool:
+        if self._loop is None:
+            return False
+        self._loop.call_soon_threadsafe(self._deliver, seq, text)
+        return True
+
+
+class UnixSocketEventBus(EventBus):
+    def __init__(self, directory: Optional[str] = None, name: Optional[str] = None):
+        super().__init__()
+        self.directory = directory or config.EVENT_BUS_DIR
+        self.name = name or str(os.getpid())
+        self.path = None
+        self._sock = None
+        self._send_sock = None
+        self._seq_fd = None
+
+    def start(self, loop, deliver):
+        super().start(loop, deliver)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{_SOCKET_PREFIX}{self.name}.sock")
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.setblocking(False)
+        # A full receiver buffer drops the datagram instead of blocking the sender
+        self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._send_sock.setblocking(False)
+        self._seq_fd = os.open(os.path.join(self.directory, "sequence"), os.O_RDWR | os.O_CREAT, 0o600)
+        loop.add_reader(self._sock.fileno(), self._on_readable)
+        logger.info("Event bus listening on %s", self.path)
+
+    def next_sequence(self) -> int:
+        if self._seq_fd is None:
+            return super().next_sequence()
+        with self._counter_lock:
+            fcntl.flock(self._seq_fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(self._seq_fd, 32, 0)
+                seq = int(raw or b"0") + 1
+                os.pwrite(self._seq_fd, str(seq).encode().ljust(20), 0)
+            finally:
+                fcntl.flock(self._seq_fd, fcntl.LOCK_UN)
+        return seq
+
+    def _on_readable(self):
+        while True:
+            try:
+                data = self._sock.recv(_MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                logger.exception("Event bus receive failed")
+                return
+            try:
+                header, _, text = data.partition(b"\n")
+                self._deliver(int(header), text.decode("utf-8"))
+            except Exception:
+                logger.exception("Event bus delivery failed")
+
+    def publish(self, seq: int, text: str) -> bool:
+        if self._send_sock is None:
+            return False
+        data = b"%d\n" % seq + text.encode("utf-8")
+        for path in glob.glob(os.path.join(self.directory, f"{_SOCKET_PREFIX}*.sock")):
+            try:
+                self._send_sock.sendto(data, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Worker exited without cleaning up
+                if path != self.path:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            except BlockingIOError:
+                logger.warning("Event bus receiver %s is full; event dropped", path)
+            except OSError:
+                logger.exception("Event bus send to %s failed", path)
+        return True
+
+    def stop(self):
+        if self._loop is not None and self._sock is not None:
+            try:
+                self._loop.remove_reader(self._sock.fileno())
+            except Exception:
+                pass
+        for sock in (self._sock, self._send_sock):
+            if sock is not None:
+                sock.close()
+        self._sock = self._send_sock = None
+        if self._seq_fd is not None:
+            os.close(self._seq_fd)
+            self._seq_fd = None
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        super().stop()
+
+
+def create_event_bus(kind: Optional[str] = None) -> EventBus:
+    """Build the bus named by PICONTROL_EVENT_BUS (auto picks unix for >1 worker)."""
+    kind = (kind or config.EVENT_BUS).lower()
+    if kind == "auto":
+        kind = "unix" if config.WORKERS > 1 else "local"
+    if kind == "unix":
+        return UnixSocketEventBus()
+    if kind != "local":
+        logger.warning("Unknown PICONTROL_EVENT_BUS=%s; using local", kind)
+    return LocalEventBus()
@@ -12,10 +12,15 @@ import logging
 from logging.handlers import TimedRotatingFileHandler
 
 from app.config import config
-from app.db import init_db
-from app.routers import employees, checkins, web
+from app.db import init_db, get_engine
+from app.routers import employees, checkins, web, export
 from app.routers import rfid as rfid_router
+from app.routers import metrics as metrics_router
 from app import rfid as rfid_service
+from app import checkin_writer
+from app import rfid_cache
+from app.metrics import MetricsMiddleware
+from sqlmodel import Session
 
 app = FastAPI(
     title=f"{config.APP_NAME} - API",
@@ -32,6 +37,8 @@ app.add_middleware(
     same_site=config.SESSION_SAME_SITE,
     https_only=config.SESSION_HTTPS_ONLY
 )
+# Outermost, so request timings include session handling
+app.add_middleware(MetricsMiddleware)
 
 
 def setup_admin_logging():
@@ -74,6 +81,8 @@ app.include_router(employees.router)
 app.include_router(checkins.router)
 app.include_router(web.router)
 app.include_router(rfid_router.router)
+app.include_router(export.router)
+app.include_router(metrics_router.router)
 
 static_dir = os.path.join(os.path.dirname(__file__), "static")
 if os.path.isdir(static_dir):
@@ -88,10 +97,21 @@ def root_redirect():
 	return RedirectResponse(url="/admin")
 
 
+@app.on_event("startup")
+def _warm_rfid_cache():
+	"""Load RFID assignments so the first taps skip the database lookup."""
+	try:
+		with Session(get_engine()) as session:
+			rfid_cache.get_cache().warm(session)
+	except Exception:
+		logging.getLogger("picontrol.rfid_cache").exception("Failed to warm RFID cache")
+
+
 @app.on_event("startup")
 def _start_rfid_service():
-	"""Initialize RFID hardware service if enabled in configuration."""
+	"""Start the event broadcaster and the RFID hardware service if enabled."""
 	try:
+		rfid_service.start_broadcaster()
 		rfid_service.start_service_if_configured()
 	except Exception:
 		logger = logging.getLogger("picontrol.rfid")
@@ -105,5 +125,9 @@ def _stop_rfid_service():
 		rfid_service.stop_service()
 	except Exception:
 		pass
+	try:
+		checkin_writer.stop_writer()
+	except Exception:
+		pass
 
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from sqlmodel import Field, SQLModel
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Index
 
 
 class Employee(SQLModel, table=True):
@@ -15,12 +15,34 @@ class Employee(SQLModel, table=True):
 
 class CheckIn(SQLModel, table=True):
     """Entry/exit timestamp record for employees."""
+    __table_args__ = (
+        Index("ix_checkin_employee_timestamp", "employee_id", "timestamp"),
+        # Range scans across all employees: recent check-ins, exports, payroll
+        Index("ix_checkin_timestamp", "timestamp"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     employee_id: str = Field(foreign_key="employee.document_id")
     type: str  # 'entry' or 'exit'
     timestamp: datetime = Field(default_factory=lambda: datetime.now(tz=timezone.utc))
 
 
+class EmployeePresence(SQLModel, table=True):
+    """Latest check-in per employee, updated in the same transaction as each insert."""
+    employee_id: str = Field(primary_key=True, foreign_key="employee.document_id")
+    last_checkin_id: Optional[int] = None
+    last_type: Optional[str] = Field(default=None, index=True)
+    last_timestamp: Optional[datetime] = None
+
+
+class DailyWorkSummary(SQLModel, table=True):
+    """Worked seconds per employee and local calendar day, updated as sessions close."""
+    employee_id: str = Field(primary_key=True, foreign_key="employee.document_id")
+    day: date = Field(primary_key=True)
+    worked_seconds: float = 0.0
+    open_session: bool = False
+
+
 class User(SQLModel, table=True):
     """Admin user account with hashed password."""
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -0,0 +1,172 @@
+"""All-employee payroll report for a range of local days, in one columnar pass.
+
+The check-ins in range come back from SQLite as three concatenated columns
+(employee, entry flag, timestamp) in a single row, which NumPy splits and
+parses without building a Python tuple per check-in. Rows are then sorted by
+employee and time, paired, clipped, split at local midnight and summed with
+array operations. Pairing follows the entry/exit toggle (an entry followed
+directly by an exit) and, like crud.work_sessions, the nearest check-in
+outside each bound is included so sessions straddling the range are clipped
+rather than lost.
+
+NumPy is optional: without it payroll_report raises PayrollUnavailable.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlmodel import Session, select
+
+from .crud import get_config, get_local_timezone
+from .models import CheckIn, Employee
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the install
+    np = None
+
+DEFAULT_MAX_HOURS_PER_DAY = 8.0
+# Unit separator: cannot appear in a document id typed at the admin page
+_SEP = "\x1f"
+
+
+class PayrollUnavailable(RuntimeError):
+    """NumPy is not installed."""
+
+
+def _max_hours_per_day(session: Session) -> float:
+    try:
+        return float(get_config(session, "max_hours_per_day") or DEFAULT_MAX_HOURS_PER_DAY)
+    except ValueError:
+        return DEFAULT_MAX_HOURS_PER_DAY
+
+
+def _fetch_columns(session: Session, start: datetime, end: datetime, employee_id: Optional[str]):
+    """(employee ids, is_entry, UTC epoch seconds) arrays, unordered."""
+    table = CheckIn.__tablename__
+    only = " AND employee_id = :employee_id" if employee_id else ""
+    params = {"start": start, "end": end}
+    if employee_id:
+        params["employee_id"] = employee_id
+    dates = (bindparam("start", type_=DateTime), bindparam("end", type_=DateTime))
+    ids, flags, stamps = session.exec(text(
+        f"SELECT group_concat(employee_id, :sep), group_concat(type = 'entry', ''), group_concat(timestamp, :sep) "
+        f"FROM {table} WHERE timestamp >= :start AND timestamp <= :end{only}"
+    ).bindparams(*dates), params=dict(params, sep=_SEP)).one()
+    # Nearest check-in before start and after end per employee (one index seek each)
+    edges = session.exec(text(
+        f"SELECT employee_id, type = 'entry', timestamp FROM {table} WHERE id IN ("
+        f"  SELECT (SELECT id FROM {table} WHERE employee_id = e.document_id AND timestamp < :start ORDER BY timestamp DESC, id DESC LIMIT 1) FROM employee e"
+        f"  UNION ALL"
+        f"  SELECT (SELECT id FROM {table} WHERE employee_id = e.document_id AND timestamp > :end ORDER BY timestamp, id LIMIT 1) FROM employee e"
+        f"){only}"
+    ).bindparams(*dates), params=params).all()
+
+    ids = ids.split(_SEP) if ids else []
+    stamps = stamps.split(_SEP) if stamps else []
+    flags = np.frombuffer((flags or "").encode(), dtype=np.uint8) == ord("1")
+    ids += [row[0] for row in edges]
+    stamps += [row[2] for row in edges]
+    flags = np.concatenate([flags, np.array([bool(row[1]) for row in edges], dtype=bool)])
+    epochs = np.array(stamps, dtype="datetime64[us]").astype(np.int64) / 1e6
+    return ids, flags, epochs
+
+
+def payroll_report(session: Session, start: date, end: date, employee_id: Optional[str] = None, max_hours_per_day: Optional[float] = None) -> dict:
+    """Hours per employee for local days start..end (inclusive).
+
+    Returns a dict with the range, the timezone, the overtime threshold, the
+    list of days and one entry per employee: total_hours, overtime_hours (the
+    sum over days of hours above max_hours_per_day), unmatched_entries
+    (entries in range not followed by an exit, including still open ones) and
+    hours_per_day, aligned with "days". Active employees without check-ins are
+    listed with zeros; archived ones only if they have check-ins in range.
+    """
+    if np is None:
+        raise PayrollUnavailable("numpy is required for payroll reports")
+    if end < start:
+        raise ValueError("end must not be before start")
+    tz = get_local_timezone(session)
+    if max_hours_per_day is None:
+        max_hours_per_day = _max_hours_per_day(session)
+    if employee_id:
+        employee_id = employee_id.strip().upper()
+
+    statement = select(Employee.document_id, Employee.name, Employee.archived_at)
+    if employee_id:
+        statement = statement.where(Employee.document_id == employee_id)
+    employees = session.exec(statement).all()
+
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    n_days = len(days)
+    # Local midnights as UTC epochs; DST days are 23 or 25 hours long
+    midnights = np.array([datetime.combine(d, time(0), tzinfo=tz).timestamp() for d in days + [end + timedelta(days=1)]])
+    lo, hi = midnights[0], midnights[-1]
+    # Check-ins are stored as naive UTC
+    as_db = lambda epoch: datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None)
+    ids, is_entry, ts = _fetch_columns(session, as_db(lo), as_db(hi), employee_id)
+
+    codes_of = {doc: k for k, (doc, _, _) in enumerate(employees)}
+    emp = np.fromiter((codes_of.setdefault(doc, len(codes_of)) for doc in ids), dtype=np.int64, count=len(ids))
+    order = np.lexsort((ts, emp))
+    emp, is_entry, ts = emp[order], is_entry[order], ts[order]
+    n_emp = len(codes_of)
+
+    same = emp[1:] == emp[:-1]
+    paired = np.zeros(len(ts), dtype=bool)
+    paired[:-1] = is_entry[:-1] & ~is_entry[1:] & same
+    unmatched = is_entry & ~paired & (ts >= lo) & (ts < hi)
+    i = np.flatnonzero(paired)
+    s = np.maximum(ts[i], lo)
+    e = np.minimum(ts[i + 1], hi)
+    keep = e > s
+    i, s, e = i[keep], s[keep], e[keep]
+
+    # One segment per local day each session touches
+    d0 = np.searchsorted(midnights, s, side="right") - 1
+    d1 = np.searchsorted(midnights, e, side="left") - 1
+    spans = d1 - d0 + 1
+    owner = np.repeat(np.arange(len(s)), spans)
+    day = d0[owner] + np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+    seconds = np.minimum(e[owner], midnights[day + 1]) - np.maximum(s[owner], midnights[day])
+
+    per_day = np.bincount(emp[i][owner] * n_days + day, weights=seconds, minlength=n_emp * n_days)
+    per_day = per_day.reshape(n_emp, n_days) / 3600.0
+    totals = per_day.sum(axis=1)
+    overtime = np.maximum(per_day - max_hours_per_day, 0.0).sum(axis=1)
+    open_entries = np.bincount(emp[unmatched], minlength=n_emp)
+    active = np.zeros(n_emp, dtype=bool)
+    active[np.unique(emp[(ts >= lo) & (ts < hi)])] = True
+
+    names = {doc: (name, archived) for doc, name, archived in employees}
+    report = []
+    for doc, k in sorted(codes_of.items()):
+        name, archived = names.get(doc, (None, None))
+        if archived is not None and not active[k] and not totals[k]:
+            continue
+        report.append({
+            "employee_id": doc,
+            "employee_name": name,
+            "total_hours": round(float(totals[k]), 4),
+            "overtime_hours": round(float(overtime[k]), 4),
+            "unmatched_entries": int(open_entries[k]),
+            "hours_per_day": np.round(per_day[k], 4).tolist(),
+        })
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "timezone": str(tz),
+        "max_hours_per_day": max_hours_per_day,
+        "days": [d.isoformat() for d in days],
+        "employees": report,
+    }
+
+
+def payroll_rows(report: dict):
+    """Flatten a report into (header, rows) with one column per day, for CSV/NDJSON."""
+    header = ("employee_id", "employee_name", "total_hours", "overtime_hours", "unmatched_entries") + tuple(report["days"])
+    rows = (
+        (e["employee_id"], e["employee_name"], e["total_hours"], e["overtime_hours"], e["unmatched_entries"], *e["hours_per_day"])
+        for e in report["employees"]
+    )
+    return header, rows
@@ -0,0 +1,137 @@
+"""Persistent RC522 (SPI) reader shared by tap polling and tag writes.
+
+The reader is initialised once and a background thread polls it for a card
+every PICONTROL_RC522_POLL_MS. A card produces one tap when it arrives;
+polls that keep seeing it are ignored until it has been absent for
+PICONTROL_RC522_RELEASE_MS (an RC522 does not answer every poll while a
+card rests on it). Writes take the same lock as polls, so they never talk
+to the chip at the same time, and the card that was written is treated as
+already present so writing it does not also check someone in.
+
+Each detection records an upper bound of its latency: the time from the
+last poll that found no card to the end of the poll that found it.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from .config import config
+
+logger = logging.getLogger("picontrol.rc522")
+
+try:
+    from mfrc522 import SimpleMFRC522  # type: ignore
+except Exception:
+    SimpleMFRC522 = None
+
+
+class RC522Reader:
+    def __init__(self, reader_factory: Optional[Callable] = None, poll_ms: Optional[float] = None,
+                 release_ms: Optional[float] = None):
+        factory = reader_factory or SimpleMFRC522
+        if factory is None:
+            raise RuntimeError("RC522 support not available on this system")
+        self._reader = factory()
+        self.poll_interval = (config.RC522_POLL_MS if poll_ms is None else poll_ms) / 1000.0
+        self.release = (config.RC522_RELEASE_MS if release_ms is None else release_ms) / 1000.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # UID currently resting on the reader and when a poll last saw it
+        self._present = None
+        self._last_seen = 0.0
+        self._last_empty = None
+        self.polls = 0
+        self.poll_seconds = 0.0
+        self.detections = 0
+        self.detect_seconds = 0.0
+        self.detect_max = 0.0
+
+    def poll(self) -> Optional[str]:
+        """Poll once; return the UID if a card has just arrived, else None."""
+        started = time.monotonic()
+        with self._lock:
+            try:
+                uid = self._reader.read_id_no_block()
+            except Exception as e:
+                logger.warning("RC522 poll failed: %s", e)
+                uid = None
+            now = time.monotonic()
+            self.polls += 1
+            self.poll_seconds += now - started
+            if uid is None:
+                if self._present is not None and now - self._last_seen >= self.release:
+                    self._present = None
+                self._last_empty = started
+                return None
+            uid = str(uid)
+            arrived = uid != self._present
+            self._present, self._last_seen = uid, now
+        if not arrived:
+            return None
+        if self._last_empty is not None:
+            latency = now - self._last_empty
+            self.detections += 1
+            self.detect_seconds += latency
+            self.detect_max = max(self.detect_max, latency)
+        return uid
+
+    def write(self, text: str, timeout: float = 30):
+        """Write text to the next card presented; returns (uid, stored text).
+
+        Polling pauses between attempts only for as long as each attempt
+        holds the reader, so taps keep working while an admin is waiting.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                uid, stored = self._reader.write_no_block(text)
+                if uid is not None:
+                    self._present, self._last_seen = str(uid), time.monotonic()
+                    return uid, stored
+            time.sleep(self.poll_interval)
+        raise RuntimeError(f"No tag presented within {timeout}s")
+
+    def start(self, on_tag: Callable[[str, float], None]):
+        """Poll on a background thread, calling on_tag(uid, epoch time) for each arrival."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll_loop, args=(on_tag,), name="rfid-rc522", daemon=True)
+        self._thread.start()
+
+    def _poll_loop(self, on_tag):
+        while not self._stop.is_set():
+            uid = self.poll()
+            if uid is not None:
+                try:
+                    on_tag(uid, time.time())
+                except Exception:
+                    logger.exception("Failed to dispatch RC522 tap %s", uid)
+            self._stop.wait(self.poll_interval)
+
+    def stats(self) -> dict:
+        return {
+            "poll_interval_ms": round(self.poll_interval * 1000, 1),
+            "polls": self.polls,
+            "avg_poll_ms": round(self.poll_seconds / self.polls * 1000, 3) if self.polls else 0.0,
+            "detections": self.detections,
+            "avg_detect_latency_ms": round(self.detect_seconds / self.detections * 1000, 1) if self.detections else 0.0,
+            "max_detect_latency_ms": round(self.detect_max * 1000, 1),
+        }
+
+    def close(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        with self._lock:
+            try:
+                self._reader.READER.Close_MFRC522()
+            except Exception:
+                try:
+                    import RPi.GPIO as GPIO  # type: ignore
+                    GPIO.cleanup()
+                except Exception:
+                    pass
@@ -5,13 +5,18 @@ dispatch them to the application (either creating checkins or producing a
 pending assignment token when the 'assign' button is pressed).
 
 Supported backends:
-- evdev: read from an input device (USB HID readers that act like keyboards)
+- evdev: read from an input device (USB HID readers that act like keyboards);
+  the device fd is registered with the asyncio loop, no blocking thread
+- rc522: an SPI RC522 module kept open and polled for cards (see app.rc522);
+  tag writes go through the same reader
 - mock: in-memory (for tests or environments without hardware)
 
 Configuration via environment variables:
 - PICONTROL_RFID_ENABLED=1 to enable
-- PICONTROL_RFID_MODE=evdev|mock  (default: evdev)
-- PICONTROL_RFID_DEVICE=/dev/input/eventX (for evdev)
+- PICONTROL_RFID_MODE=evdev|rc522|mock  (default: evdev)
+- PICONTROL_RFID_DEVICE=/dev/input/eventX (for evdev; comma-separated paths or
+  globs such as /dev/input/by-id/*RFID* for several readers)
+- PICONTROL_RC522_POLL_MS / PICONTROL_RC522_RELEASE_MS (for rc522)
 - PICONTROL_RFID_ASSIGN_BUTTON_GPIO=<BCM pin> (optional, gpiozero required)
 - PICONTROL_RFID_PENDING_FILE=/var/lib/picontrol/rfid_assign_pending.json
 
@@ -20,49 +25,93 @@ will disable the corresponding features and log warnings.
 """
 
 import os
+import fcntl
+import glob
 import threading
 import time
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 import asyncio
+from collections import OrderedDict, deque
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import config
+from app.event_bus import create_event_bus
+from app import metrics
+from app.rfid_decoder import KeycodeDecoder
+from app import tap_journal
+from app.tap_journal import TapJournal, TapRejected
 
 logger = logging.getLogger("picontrol.rfid")
 
 try:
-    from sqlmodel import Session
-    from app.db import get_engine
-    from app.crud import create_checkin_by_rfid, assign_rfid
+    from app.checkin_writer import checkin_by_rfid
+    from app.crud import assign_rfid, OutOfOrderCheckin
 except Exception:
     # import-time resilience for test/static analysis
-    get_engine = None
-    create_checkin_by_rfid = None
+    checkin_by_rfid = None
     assign_rfid = None
+    OutOfOrderCheckin = ()  # an empty except tuple matches nothing
 
-# Optional RC522 support (mfrc522 library). Provide a helper to write/read tags
-_rc522_available = False
-_rc522_cls = None
-try:
-    from mfrc522 import SimpleMFRC522  # type: ignore
-    _rc522_available = True
-    _rc522_cls = SimpleMFRC522
-except Exception:
-    # Not available (not running on Raspberry Pi or package not installed)
-    _rc522_available = False
-    _rc522_cls = None
+# Optional RC522 support (mfrc522 library); RC522Reader raises if it is missing
+from app.rc522 import RC522Reader
 
 
 PENDING_FILE = os.environ.get("PICONTROL_RFID_PENDING_FILE", "/var/lib/picontrol/rfid_assign_pending.json")
 
+# Seconds from the moment a UID is decoded to each stage of handling it:
+# dispatch (tap worker picks it up), journal, commit, publish, then in every
+# worker broadcast (dequeued for fan-out) and ws_send (written to a client).
+# Taps carry time.monotonic() as "read_at", which is system-wide on Linux, so
+# workers other than the reader's can time the last two stages.
+TAP_LATENCY = metrics.histogram("picontrol_tap_latency_seconds", "Time from a card read to each stage of the tap", ("stage",))
+
+
+class _Reader:
+    """One open evdev device with its own UID buffer."""
+
+    __slots__ = ("path", "device", "decoder", "reader_id")
+
+    def __init__(self, path: str, device):
+        self.path = path
+        self.device = device
+        self.decoder = KeycodeDecoder()
+        # by-id/by-path names are stable across reboots; eventN is not
+        self.reader_id = os.path.basename(path)
+
 
 class RFIDService:
-    def __init__(self, mode="evdev", device=None, assign_button_gpio=None):
+    def __init__(self, mode="evdev", device=None, assign_button_gpio=None, loop=None, debounce_ms=None, journal=None):
         self.mode = mode
-        self.device = device
+        # One or more device paths or glob patterns (list or comma-separated)
+        if isinstance(device, str):
+            device = [d.strip() for d in device.split(",") if d.strip()]
+        self.devices = list(device or [])
+        self.device = ",".join(self.devices) or None
+        self.rescan_interval = config.RFID_RESCAN_MS / 1000.0
         self.assign_button_gpio = assign_button_gpio
         self._stop = threading.Event()
         self._thread = None
         self._button = None
+        self._started = False
+        self._loop = loop
+        self._own_loop = False
+        self._readers = {}  # path -> _Reader
+        self._rescan_handle = None
+        self._rc522 = None
+        # Why the RC522 could not be opened, if it could not
+        self._rc522_error = None
+        self._tap_executor = None
+        # uid -> (monotonic time of last read, details of the tap it counted as)
+        self.debounce = (config.RFID_DEBOUNCE_MS if debounce_ms is None else debounce_ms) / 1000.0
+        self._recent_taps = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self.duplicates = 0
+        # Optional TapJournal; when set, taps are journaled before any DB work
+        self.journal = journal
         # backend helpers
         self._use_evdev = False
         try:
@@ -84,92 +133,145 @@ class RFIDService:
             logger.warning("gpiozero not available or button init failed; assign-button disabled")
 
     def start(self):
-        if self._thread and self._thread.is_alive():
+        if self._started:
             return
         self._stop.clear()
-        self._thread = threading.Thread(target=self._run, name="rfid-reader", daemon=True)
-        self._thread.start()
+        self._started = True
+        if self.mode == "evdev" and self._use_evdev:
+            # Taps are processed on one worker thread, in order, so the event
+            # loop never blocks on the check-in writer.
+            self._tap_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rfid-tap")
+            loop = self._loop or event_loop
+            if loop is None or not loop.is_running():
+                loop = self._start_private_loop()
+            self._loop = loop
+            loop.call_soon_threadsafe(self._scan_evdev)
+        elif self.mode == "rc522":
+            try:
+                self._rc522 = RC522Reader()
+            except Exception as e:
+                self._rc522_error = str(e)
+                logger.warning("RC522 reader unavailable (%s); RFID taps disabled", e)
+            if self._rc522 is not None:
+                # The poll thread only detects cards; taps run on the tap worker
+                self._tap_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rfid-tap")
+                self._rc522.start(lambda uid, ts: self._tap_executor.submit(self._process_tag, uid, ts, "rc522", time.monotonic()))
+        else:
+            logger.info("RFIDService running in mock mode (no hardware).")
+        if self.journal is not None:
+            self.journal.start_replayer(self._apply_journaled)
         logger.info("RFIDService started (mode=%s device=%s assign_button=%s)", self.mode, self.device, self.assign_button_gpio)
 
     def stop(self):
         self._stop.set()
-        if self._thread:
-            self._thread.join(timeout=2)
-
-    def _run(self):
-        if self.mode == "evdev" and self._use_evdev:
-            self._run_evdev()
-        else:
-            logger.info("RFIDService running in mock mode (no hardware).")
-            # Mock loop does nothing; sleep until stopped
-            while not self._stop.is_set():
-                time.sleep(1)
+        self._started = False
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            if _running_loop() is loop:
+                self._close_evdev()
+            else:
+                done = threading.Event()
+                loop.call_soon_threadsafe(lambda: (self._close_evdev(), done.set()))
+                done.wait(timeout=1)
+            if self._own_loop:
+                loop.call_soon_threadsafe(loop.stop)
+                self._loop = None
+                self._own_loop = False
+        if self._rc522 is not None:
+            self._rc522.close()
+            self._rc522 = None
+        if self._tap_executor is not None:
+            self._tap_executor.shutdown(wait=False)
+            self._tap_executor = None
+        if self.journal is not None:
+            self.journal.close()
+
+    def _start_private_loop(self):
+        """Run a dedicated event loop thread when started outside the app loop."""
+        loop = asyncio.new_event_loop()
+        self._own_loop = True
+        self._thread = threading.Thread(target=loop.run_forever, name="rfid-reader", daemon=True)
+        self._thread.start()
+        return loop
 
     # ------------------ evdev backend ------------------
-    def _run_evdev(self):
-        # Find device
-        try:
-            dev_path = self.device
-            if not dev_path:
-                # choose first keyboard-like device if not provided
-                from evdev import list_devices, InputDevice
-                devices = list_devices()
-                if not devices:
-                    logger.warning("No evdev devices found")
-                    return
-                dev_path = devices[0]
-
-            device = self.evdev.InputDevice(dev_path)
-            logger.info("Listening for RFID events on %s", dev_path)
-        except Exception as e:
-            logger.exception("Failed to open evdev device: %s", e)
+    def _device_paths(self):
+        """Resolve configured paths and glob patterns to the devices present now."""
+        if not self.devices:
+            # choose first keyboard-like device if none configured
+            found = self.evdev.list_devices()
+            return sorted(found)[:1]
+        paths = []
+        for pattern in self.devices:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            for path in matches:
+                real = os.path.realpath(path)
+                if os.path.exists(real) and real not in (os.path.realpath(p) for p in paths):
+                    paths.append(path)
+        return paths
+
+    def _scan_evdev(self):
+        """Open readers not open yet and schedule the next hot-plug rescan (runs on the loop)."""
+        if self._stop.is_set():
             return
-
-        buffer = []
-        # minimal mapping from KEY_* to characters (numbers/letters)
-        keymap = {
-            # numbers
-            'KEY_0': '0','KEY_1':'1','KEY_2':'2','KEY_3':'3','KEY_4':'4','KEY_5':'5','KEY_6':'6','KEY_7':'7','KEY_8':'8','KEY_9':'9',
-            # letters
-        }
-        # add letters A..Z
-        for c in range(ord('A'), ord('Z')+1):
-            keymap[f'KEY_{chr(c)}'] = chr(c).lower()
-
-        # common punctuation
-        keymap.update({
-            'KEY_MINUS': '-', 'KEY_EQUAL': '=', 'KEY_SPACE': ' ', 'KEY_ENTER': '\n', 'KEY_KPENTER': '\n'
-        })
-
-        for event in device.read_loop():
-            if self._stop.is_set():
-                break
+        try:
+            paths = self._device_paths()
+        except Exception:
+            logger.exception("Failed to list RFID devices")
+            paths = []
+        if not paths and not self._readers:
+            logger.warning("No evdev devices found for %s", self.devices or "auto-detect")
+        for path in paths:
+            if path in self._readers:
+                continue
             try:
-                if event.type == self.evdev.ecodes.EV_KEY:
-                    keyevent = self.evdev.categorize(event)
-                    if keyevent.keystate == keyevent.key_down:
-                        code = keyevent.keycode
-                        # keycode can be list on some devices
-                        if isinstance(code, list):
-                            code = code[0]
-                        ch = keymap.get(code)
-                        if ch is None:
-                            # ignore unknown key
-                            continue
-                        if ch == '\n':
-                            if buffer:
-                                uid = ''.join(buffer).strip()
-                                buffer = []
-                                self._process_tag(uid)
-                        else:
-                            buffer.append(ch)
-            except Exception:
-                logger.exception("Error while reading evdev event")
+                reader = _Reader(path, self.evdev.InputDevice(path))
+            except Exception as e:
+                logger.warning("Failed to open evdev device %s: %s", path, e)
+                continue
+            self._readers[path] = reader
+            self._loop.add_reader(reader.device.fd, self._on_evdev_readable, reader)
+            logger.info("Listening for RFID events on %s (reader %s)", path, reader.reader_id)
+        self._rescan_handle = self._loop.call_later(self.rescan_interval, self._scan_evdev)
+
+    def _on_evdev_readable(self, reader):
+        try:
+            for event in reader.device.read():
+                uid = reader.decoder.feed(event.type, event.code, event.value)
+                if uid:
+                    self._tap_executor.submit(self._process_tag, uid, event.timestamp(), reader.reader_id, time.monotonic())
+        except BlockingIOError:
+            pass
+        except OSError:
+            # Unplugged: close it; the next rescan reopens it when it returns
+            logger.warning("RFID reader %s disappeared; waiting for it to come back", reader.reader_id)
+            self._close_reader(reader)
+
+    def _close_reader(self, reader):
+        self._readers.pop(reader.path, None)
+        try:
+            self._loop.remove_reader(reader.device.fd)
+        except Exception:
+            pass
+        try:
+            reader.device.close()
+        except Exception:
+            pass
+
+    def _close_evdev(self):
+        if self._rescan_handle is not None:
+            self._rescan_handle.cancel()
+            self._rescan_handle = None
+        for reader in list(self._readers.values()):
+            self._close_reader(reader)
 
     # ------------------ tag processing ------------------
-    def _process_tag(self, uid: str):
-        """Called when a full UID is read from hardware."""
-        logger.info("RFID tag read: %s", uid)
+    def _process_tag(self, uid: str, ts: Optional[float] = None, reader_id: Optional[str] = None, read_at: Optional[float] = None):
+        """Called when a full UID is read from hardware at epoch time ts (monotonic read_at)."""
+        if read_at is None:
+            read_at = time.monotonic()
+        TAP_LATENCY.observe(time.monotonic() - read_at, "dispatch")
+        logger.info("RFID tag read: %s (reader %s)", uid, reader_id)
         # check if assign button is pressed (if available)
         assign_mode = False
         try:
@@ -183,44 +285,104 @@ class RFIDService:
             self._write_pending(uid)
             return
 
-        # Normal checkin flow: create checkin via DB
-        # Normal checkin flow: create checkin via DB
-        try:
-            if get_engine is None or create_checkin_by_rfid is None:
-                logger.warning("DB/CRUD not available in this environment; dropping tag %s", uid)
+        # A card held against the reader repeats its UID; merge the repeats
+        # into the first tap instead of toggling entry/exit again.
+        previous = self._debounce(uid)
+        if previous is not None:
+            self.duplicates += 1
+            logger.info("Duplicate read of %s within %.0fms; ignored", uid, self.debounce * 1000)
+            try:
+                push_event(dict(previous, type="rfid_duplicate", rfid_uid=uid, reader_id=reader_id, timestamp=datetime.utcnow().isoformat()))
+            except Exception:
+                pass
+            return
+
+        if self.journal is not None:
+            # Durable first: the replayer thread applies journaled taps in order
+            try:
+                entry = self.journal.append(uid, ts if ts is not None else time.time(), reader_id)
+                TAP_LATENCY.observe(time.monotonic() - read_at, "journal")
+                # Kept in memory only: after a restart the delay is not the tap's
+                entry["read_at"] = read_at
+                self.journal.wake()
                 return
-            engine = get_engine()
-            from sqlmodel import Session
-            with Session(engine) as session:
-                res = create_checkin_by_rfid(session, uid)
-                if res:
-                    checkin, employee, message = res
-                    logger.info("Checkin created for %s: %s", employee.document_id, message)
-                    # Broadcast event with checkin details
-                    try:
-                        ev = {
-                            "type": "checkin",
-                            "rfid_uid": uid,
-                            "employee_id": employee.document_id,
-                            "employee_name": employee.name,
-                            "checkin_type": checkin.type,
-                            "checkin_id": checkin.id,
-                            "timestamp": checkin.timestamp.isoformat(),
-                            "message": message,
-                        }
-                        push_event(ev)
-                    except Exception:
-                        logger.exception("Failed to push checkin event")
-                else:
-                    logger.info("No employee found for RFID %s", uid)
-                    # broadcast unknown tag event
-                    try:
-                        push_event({"type": "rfid_unknown", "rfid_uid": uid, "timestamp": datetime.utcnow().isoformat()})
-                    except Exception:
-                        pass
+            except Exception:
+                logger.exception("Failed to journal tap %s; applying it directly", uid)
+
+        try:
+            self._apply_tap(uid, ts, reader_id, read_at)
         except Exception:
             logger.exception("Failed to create checkin for RFID %s", uid)
 
+    def _apply_journaled(self, entry: dict):
+        try:
+            self._apply_tap(entry["uid"], entry["ts"], entry.get("reader"), entry.get("read_at"))
+        except OutOfOrderCheckin as e:
+            # A newer check-in (manual, API) was stored while this tap waited
+            raise TapRejected(str(e)) from e
+
+    def _apply_tap(self, uid: str, ts: Optional[float] = None, reader_id: Optional[str] = None, read_at: Optional[float] = None):
+        """Record the check-in for uid and broadcast it; raises if the DB write fails."""
+        if checkin_by_rfid is None:
+            logger.warning("DB/CRUD not available in this environment; dropping tag %s", uid)
+            return
+        timestamp = datetime.fromtimestamp(ts, tz=timezone.utc) if ts is not None else None
+        # Queue the tap on the group-commit writer
+        res = checkin_by_rfid(uid, timestamp=timestamp)
+        if read_at is not None:
+            TAP_LATENCY.observe(time.monotonic() - read_at, "commit")
+        if res:
+            checkin, employee, message = res
+            logger.info("Checkin created for %s: %s", employee.document_id, message)
+            self._note_tap(uid, {"employee_id": employee.document_id, "employee_name": employee.name, "checkin_type": checkin.type})
+            # Broadcast event with checkin details
+            try:
+                ev = {
+                    "type": "checkin",
+                    "rfid_uid": uid,
+                    "employee_id": employee.document_id,
+                    "employee_name": employee.name,
+                    "checkin_type": checkin.type,
+                    "checkin_id": checkin.id,
+                    "timestamp": checkin.timestamp.isoformat(),
+                    "message": message,
+                    "reader_id": reader_id,
+                }
+                if read_at is not None:
+                    ev["read_at"] = read_at
+                push_event(ev)
+                if read_at is not None:
+                    TAP_LATENCY.observe(time.monotonic() - read_at, "publish")
+            except Exception:
+                logger.exception("Failed to push checkin event")
+        else:
+            logger.info("No employee found for RFID %s", uid)
+            # broadcast unknown tag event
+            try:
+                push_event({"type": "rfid_unknown", "rfid_uid": uid, "reader_id": reader_id, "timestamp": datetime.utcnow().isoformat()})
+            except Exception:
+                pass
+
+    def _debounce(self, uid: str):
+        """Return the earlier tap's details if uid was read within the window, else None.
+
+        Every read slides the window, so a card left on the reader stays one tap.
+        """
+        now = time.monotonic()
+        with self._recent_lock:
+            entry = self._recent_taps.get(uid)
+            info = entry[1] if entry is not None and now - entry[0] < self.debounce else None
+            self._recent_taps[uid] = (now, entry[1] if info is not None else {})
+            self._recent_taps.move_to_end(uid)
+            while len(self._recent_taps) > config.RFID_DEBOUNCE_SIZE:
+                self._recent_taps.popitem(last=False)
+        return info
+
+    def _note_tap(self, uid: str, info: dict):
+        with self._recent_lock:
+            if uid in self._recent_taps:
+                self._recent_taps[uid] = (self._recent_taps[uid][0], info)
+
     def _write_pending(self, uid: str):
         payload = {"rfid_uid": uid, "timestamp": datetime.utcnow().isoformat()}
         try:
@@ -238,7 +400,14 @@ class RFIDService:
     # ------------------ helpers for external injection ------------------
     def inject_tag(self, uid: str):
         """Inject a tag programmatically (useful for tests)."""
-        self._process_tag(uid)
+        self._process_tag(uid, time.time())
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
 
 # Singleton service holder
@@ -246,51 +415,231 @@ _service = None
 # Async event queue and broadcaster loop (set at startup)
 event_queue = None  # type: asyncio.Queue | None
 event_loop = None
+_broadcaster_handle = None
+_bus = None
 _ws_connections = set()
 
+# Recent (seq, text) events kept so reconnecting clients can catch up
+_recent_events = deque(maxlen=config.EVENT_BUFFER_SIZE)
+# Sent instead of the dropped backlog when a client's queue overflows, or on
+# reconnect when the missed events are no longer buffered; the page should
+# reload its state rather than trust the event stream.
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+
+
+class _WebSocketClient:
+    """One connected WebSocket with its own bounded send queue and writer task.
+
+    The broadcaster only enqueues; sends happen concurrently in each client's
+    task, so a slow tablet backs up its own queue instead of everyone's.
+    """
+
+    def __init__(self, ws, backlog=()):
+        self.ws = ws
+        # Room for the replayed backlog on top of the live queue bound
+        # (text, monotonic tap read time or None)
+        self.queue = asyncio.Queue(maxsize=config.WS_QUEUE_SIZE + len(backlog))
+        for text in backlog:
+            self.queue.put_nowait((text, None))
+        self.task = None
+        self.overflows = 0
+        self._resync_pending = False
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._writer())
+
+    def offer(self, text: str, read_at: Optional[float] = None) -> bool:
+        """Queue a serialized event; returns False if the client should be dropped."""
+        try:
+            self.queue.put_nowait((text, read_at))
+            return True
+        except asyncio.QueueFull:
+            pass
+        if self._resync_pending:
+            # Still hasn't drained the previous resync marker: give up on it
+            return False
+        self.overflows += 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait((RESYNC_MESSAGE, None))
+        self._resync_pending = True
+        return True
+
+    async def _writer(self):
+        try:
+            while True:
+                text, read_at = await self.queue.get()
+                if text is RESYNC_MESSAGE:
+                    self._resync_pending = False
+                await asyncio.wait_for(self.ws.send_text(text), timeout=config.WS_SEND_TIMEOUT)
+                if read_at is not None:
+                    TAP_LATENCY.observe(time.monotonic() - read_at, "ws_send")
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.info("Dropping WebSocket client after failed send")
+            _ws_connections.discard(self)
+
+    def close(self):
+        _ws_connections.discard(self)
+        if self.task is not None:
+            self.task.cancel()
+
+
+def broadcast(ev: dict):
+    """Serialize ev once and queue it on every connected client (event loop only)."""
+    broadcast_text(json.dumps(ev, default=str))
+
+
+def broadcast_text(text: str, read_at: Optional[float] = None):
+    for client in list(_ws_connections):
+        if not client.offer(text, read_at):
+            logger.warning("WebSocket client too slow, disconnecting")
+            client.close()
+            try:
+                asyncio.get_running_loop().create_task(client.ws.close())
+            except Exception:
+                pass
+
+
+def replay_since(since: int):
+    """Return buffered event texts with seq > since, or None if some are gone.
+
+    None means the client missed more than the buffer holds (or the sequence
+    restarted) and has to reload instead of replaying.
+    """
+    if not _recent_events:
+        return None if since > 0 else []
+    seqs = [seq for seq, _ in _recent_events]
+    if since > max(seqs) or since < min(seqs) - 1:
+        return None
+    return [text for seq, text in sorted(_recent_events) if seq > since]
+
 
 async def _broadcaster_task():
-    """Background async task that broadcasts events from event_queue to connected websockets."""
-    global event_queue, _ws_connections
+    """Background async task that fans events from event_queue out to client queues."""
+    global event_queue
     if event_queue is None:
         return
     while True:
         try:
-            ev = await event_queue.get()
-            # broadcast to all websockets
-            dead = []
-            for ws in list(_ws_connections):
-                try:
-                    # send_json is async
-                    await ws.send_json(ev)
-                except Exception:
-                    # mark dead connection for removal
-                    dead.append(ws)
-            for d in dead:
-                try:
-                    _ws_connections.discard(d)
-                except Exception:
-                    pass
+            seq, text = await event_queue.get()
+            _recent_events.append((seq, text))
+            read_at = None
+            if '"read_at"' in text:
+                read_at = json.loads(text).get("read_at")
+                TAP_LATENCY.observe(time.monotonic() - read_at, "broadcast")
+            broadcast_text(text, read_at)
         except asyncio.CancelledError:
             break
         except Exception:
             logger.exception("Exception in broadcaster task")
 
 
-def register_websocket(ws):
-    """Register a WebSocket connection (must be called from event loop)."""
-    _ws_connections.add(ws)
+def register_websocket(ws, since: int = None):
+    """Register a WebSocket connection (must be called from event loop).
+
+    With since, events after that sequence number are queued ahead of live
+    ones; nothing awaits in between, so none are lost or sent twice.
+    """
+    backlog = ()
+    if since is not None:
+        backlog = replay_since(since)
+        if backlog is None:
+            backlog = (RESYNC_MESSAGE,)
+    client = _WebSocketClient(ws, backlog)
+    client.start()
+    _ws_connections.add(client)
+    return client
 
 
 def unregister_websocket(ws):
+    for client in list(_ws_connections):
+        if client is ws or client.ws is ws:
+            client.close()
+
+
+def start_broadcaster():
+    """Create the event queue and broadcaster task on the running event loop.
+
+    Independent of the RFID hardware so manual and API check-ins still reach
+    the kiosk and dashboard screens. Safe to call more than once.
+    """
+    global event_queue, event_loop, _broadcaster_handle, _bus
+    if _broadcaster_handle is not None and not _broadcaster_handle.done():
+        return
     try:
-        _ws_connections.discard(ws)
+        event_loop = asyncio.get_event_loop()
+        event_queue = asyncio.Queue()
+        _broadcaster_handle = event_loop.create_task(_broadcaster_task())
     except Exception:
-        pass
+        logger.warning("Could not start RFID event broadcaster (no event loop?)")
+        return
+    try:
+        _bus = create_event_bus()
+        _bus.start(event_loop, _enqueue)
+    except Exception:
+        logger.exception("Could not start event bus; falling back to local delivery")
+        _bus = create_event_bus("local")
+        _bus.start(event_loop, _enqueue)
+
+
+def _enqueue(seq: int, text: str):
+    event_queue.put_nowait((seq, text))
+
+
+class LeaderLock:
+    """Exclusive flock on a file, held by the one worker that owns the reader.
+
+    The kernel drops the lock when the holder exits, however it dies, so a
+    waiting worker can take over without any stale-lock cleanup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+_leader_lock = None
+_election_stop = threading.Event()
+_election_thread = None
+
+
+def _wait_for_leadership(on_elected, interval: float):
+    while not _election_stop.wait(interval):
+        if _leader_lock.try_acquire():
+            logger.info("Acquired RFID reader lock %s (pid %d)", _leader_lock.path, os.getpid())
+            on_elected()
+            return
 
 
 def start_service_if_configured():
-    global _service
+    global _service, _leader_lock, _election_thread
     enabled = os.environ.get("PICONTROL_RFID_ENABLED", "0")
     if enabled not in ("1", "true", "True"):
         logger.info("RFID disabled by configuration")
@@ -299,46 +648,85 @@ def start_service_if_configured():
     mode = os.environ.get("PICONTROL_RFID_MODE", "evdev")
     device = os.environ.get("PICONTROL_RFID_DEVICE")
     assign_pin = os.environ.get("PICONTROL_RFID_ASSIGN_BUTTON_GPIO")
-    _service = RFIDService(mode=mode, device=device, assign_button_gpio=assign_pin)
-    # Prepare async event queue and broadcaster if running inside an event loop
-    try:
-        global event_queue, event_loop, _broadcaster_handle
-        event_loop = asyncio.get_event_loop()
-        event_queue = asyncio.Queue()
-        # start broadcaster task
-        _broadcaster_handle = event_loop.create_task(_broadcaster_task())
-    except Exception:
-        logger.warning("Could not start RFID event broadcaster (no event loop?)")
+    start_broadcaster()
 
-    _service.start()
+    def start_reader():
+        global _service
+        try:
+            journal = TapJournal()
+        except Exception:
+            logger.exception("Could not open tap journal %s; taps will not survive DB outages", config.TAP_JOURNAL_PATH)
+            journal = None
+        _service = RFIDService(mode=mode, device=device, assign_button_gpio=assign_pin, journal=journal)
+        _service.start()
+
+    # With several workers only the lock holder opens the device; the others
+    # poll the lock and take over when the holder exits.
+    _leader_lock = LeaderLock(config.RFID_LEADER_LOCK)
+    _election_stop.clear()
+    if _leader_lock.try_acquire():
+        logger.info("Acquired RFID reader lock %s (pid %d)", _leader_lock.path, os.getpid())
+        start_reader()
+        return
+    logger.info("RFID reader owned by another worker; standing by")
+    _election_thread = threading.Thread(
+        target=_wait_for_leadership, args=(start_reader, config.RFID_LEADER_POLL_MS / 1000.0),
+        name="rfid-election", daemon=True,
+    )
+    _election_thread.start()
 
 
 def push_event(ev: dict):
     """Push an event into the asyncio queue for broadcasting.
 
-    This can be called from any thread.
+    This can be called from any thread; the event bus delivers it to the
+    broadcaster of every worker. The event is sent with a "seq" field that
+    clients pass back as ?since= when they reconnect.
     """
-    global event_loop, event_queue
     try:
-        if event_loop is not None and event_queue is not None:
-            event_loop.call_soon_threadsafe(event_queue.put_nowait, ev)
-            return True
+        if _bus is not None:
+            seq = _bus.next_sequence()
+            return _bus.publish(seq, json.dumps(dict(ev, seq=seq), default=str))
     except Exception:
-        logger.exception("Failed to call_soon_threadsafe to push event")
+        logger.exception("Failed to publish event")
     return False
 
 
 def stop_service():
     global _service
+    _election_stop.set()
     if _service:
         _service.stop()
-    # cancel broadcaster task if present
+    # Release after the device is closed so the next leader can open it
+    if _leader_lock is not None:
+        _leader_lock.release()
+    # cancel broadcaster and client writer tasks if present
+    global _broadcaster_handle, _bus
     try:
-        global _broadcaster_handle
-        if '_broadcaster_handle' in globals() and _broadcaster_handle:
+        if _broadcaster_handle:
             _broadcaster_handle.cancel()
+            _broadcaster_handle = None
     except Exception:
         pass
+    if _bus is not None:
+        _bus.stop()
+        _bus = None
+    for client in list(_ws_connections):
+        client.close()
+
+
+def journal_stats() -> dict:
+    """Pending tap journal depth/age; live counters only in the reader's worker."""
+    if _service is not None and _service.journal is not None:
+        return _service.journal.stats()
+    return tap_journal.file_stats()
+
+
+def reader_stats() -> Optional[dict]:
+    """RC522 poll and detection latency counters, if this worker polls one."""
+    if _service is not None and _service._rc522 is not None:
+        return _service._rc522.stats()
+    return None
 
 
 def inject_tag(uid: str):
@@ -351,35 +739,65 @@ def inject_tag(uid: str):
     _service.inject_tag(uid)
 
 
-def write_rc522_tag(text: str, timeout: int = 30):
-    """Blocking write to an RC522 tag using mfrc522.SimpleMFRC522.
+class RC522Unavailable(RuntimeError):
+    """This process cannot open the RC522 (no mfrc522, or no SPI/GPIO access)."""
 
-    Returns the numeric UID read from the tag after writing. Raises RuntimeError
-    if RC522 support is not available or the write fails.
-    """
-    if not _rc522_available or _rc522_cls is None:
-        raise RuntimeError("RC522 support not available on this system")
 
-    # The SimpleMFRC522.write method will block waiting for a tag to be presented.
-    # We create an instance and call write(text). It will use RPi.GPIO internally.
-    try:
-        reader = _rc522_cls()
-        # write returns nothing; after writing, do a read to obtain UID/text
-        reader.write(text)
-        # read back to obtain UID (blocks until a tag is presented again, but most readers keep the tag present)
-        uid, stored = reader.read()
-        # cleanup handled by underlying library; attempt to cleanup GPIO
+class RC522Busy(RuntimeError):
+    """The RC522 is polled by another worker; opening it here would collide."""
+
+
+def write_rc522_tag(text: str, timeout: int = 30):
+    """Blocking write to an RC522 tag; returns (uid, stored text).
+
+    Uses the polling reader when this worker runs it. Otherwise the reader is
+    opened just for the write, unless another worker holds the reader lock, in
+    which case opening it here would collide with that worker's polling and
+    RC522Busy is raised. RC522Unavailable means the reader cannot be opened
+    from this process at all, including a reader service here that failed to
+    open it (the privileged wrapper may still work); any other failure,
+    including a timeout waiting for the tag, raises RuntimeError.
+    """
+    if _service is not None and _service._rc522 is not None:
+        reader, owned = _service._rc522, False
+    elif _leader_lock is not None and not _leader_lock.held:
+        raise RC522Busy("RC522 reader is owned by another worker")
+    elif _service is not None and _service._rc522_error:
+        raise RC522Unavailable(_service._rc522_error)
+    else:
         try:
-            import RPi.GPIO as GPIO  # type: ignore
-            GPIO.cleanup()
-        except Exception:
-            pass
-        return uid, stored
+            reader, owned = RC522Reader(), True
+        except Exception as e:
+            raise RC522Unavailable(str(e))
+    try:
+        return reader.write(text, timeout)
     except Exception as e:
-        # Try to cleanup and re-raise
-        try:
-            import RPi.GPIO as GPIO  # type: ignore
-            GPIO.cleanup()
-        except Exception:
-            pass
         raise RuntimeError(f"RC522 write failed: {e}")
+    finally:
+        if owned:
+            reader.close()
+
+
+def _collect_metrics():
+    queues = [client.queue.qsize() for client in list(_ws_connections)]
+    yield ("picontrol_ws_clients", "gauge", "Connected WebSocket clients in this worker", len(queues))
+    yield ("picontrol_ws_queue_depth_max", "gauge", "Deepest per-client WebSocket send queue", max(queues, default=0))
+    yield ("picontrol_ws_resyncs_total", "counter", "Resyncs sent to clients whose queue overflowed",
+           sum(client.overflows for client in list(_ws_connections)))
+    yield ("picontrol_event_queue_depth", "gauge", "Events waiting for the broadcaster", event_queue.qsize() if event_queue else 0)
+    if _service is not None:
+        yield ("picontrol_rfid_duplicates_total", "counter", "Repeat reads merged into an earlier tap", _service.duplicates)
+        yield ("picontrol_rfid_readers", "gauge", "Open evdev readers", len(_service._readers))
+        if _service.journal is not None:
+            stats = _service.journal.stats()
+            yield ("picontrol_tap_journal_depth", "gauge", "Taps journaled but not yet in the database", stats["depth"])
+            yield ("picontrol_tap_journal_oldest_age_seconds", "gauge", "Age of the oldest pending journaled tap", stats["oldest_age_seconds"])
+            yield ("picontrol_tap_journal_applied_total", "counter", "Journaled taps written to the database", stats["applied"])
+            yield ("picontrol_tap_journal_dead_lettered_total", "counter", "Journaled taps given up on and moved to the dead-letter file", stats["dead_lettered"])
+        if _service._rc522 is not None:
+            stats = _service._rc522.stats()
+            yield ("picontrol_rc522_polls_total", "counter", "RC522 card polls", stats["polls"])
+            yield ("picontrol_rc522_detections_total", "counter", "Cards detected by RC522 polling", stats["detections"])
+
+
+metrics.register_collector(_collect_metrics)
@@ -0,0 +1,102 @@
+"""Process-wide RFID-to-employee lookup cache.
+
+Taps vastly outnumber changes to the employee table, so the RFID lookup on
+every tap is served from a dict of compact records instead of a query. The
+crud functions that change RFID assignments (create_employee, assign_rfid,
+archive_employee, restore_employee) invalidate it after committing.
+
+Changes made outside those functions - another worker process, the cleanup
+tool, a database import - are caught with PRAGMA data_version: SQLite bumps it
+on a connection whenever another connection commits to the file, so the cache
+remembers the connection and version it was loaded under and reloads when
+either differs.
+"""
+
+import logging
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from sqlmodel import Session, select
+
+from . import metrics
+from .models import Employee
+
+logger = logging.getLogger("picontrol.rfid_cache")
+
+
+class EmployeeRecord(NamedTuple):
+    """The fields a tap needs; attribute names match Employee."""
+    document_id: str
+    name: str
+    archived: bool
+
+
+class RfidCache:
+    def __init__(self):
+        self._by_uid: Dict[str, EmployeeRecord] = {}
+        self._lock = threading.Lock()
+        self._stamp = None  # (id of DB-API connection, data_version) at load time
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._stamp = None
+
+    def warm(self, session: Session):
+        with self._lock:
+            self._load(session, self._current_stamp(session))
+
+    def lookup(self, session: Session, rfid_uid: str) -> Optional[EmployeeRecord]:
+        """Return the record for rfid_uid, reloading first if the table changed."""
+        stamp = self._current_stamp(session)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._load(session, stamp)
+        record = self._by_uid.get(rfid_uid)
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def stats(self) -> dict:
+        return {"entries": len(self._by_uid), "hits": self.hits, "misses": self.misses, "reloads": self.reloads}
+
+    def _current_stamp(self, session: Session):
+        conn = session.connection()
+        version = conn.exec_driver_sql("PRAGMA data_version").scalar()
+        return (id(conn.connection.driver_connection), version)
+
+    def _load(self, session: Session, stamp):
+        statement = select(Employee.rfid_uid, Employee.document_id, Employee.name, Employee.archived_at).where(Employee.rfid_uid != None)
+        self._by_uid = {
+            uid: EmployeeRecord(document_id, name, archived_at is not None)
+            for uid, document_id, name, archived_at in session.exec(statement)
+        }
+        self._stamp = stamp
+        self.reloads += 1
+        logger.debug("RFID cache loaded with %d entries", len(self._by_uid))
+
+
+_cache = RfidCache()
+
+
+def get_cache() -> RfidCache:
+    return _cache
+
+
+def invalidate():
+    _cache.invalidate()
+
+
+def _collect_metrics():
+    yield ("picontrol_rfid_cache_entries", "gauge", "RFID assignments held in the lookup cache", len(_cache._by_uid))
+    yield ("picontrol_rfid_cache_lookups_total", "counter", "RFID cache lookups by result",
+           [({"result": "hit"}, _cache.hits), ({"result": "miss"}, _cache.misses)])
+    yield ("picontrol_rfid_cache_reloads_total", "counter", "RFID cache reloads from the database", _cache.reloads)
+
+
+metrics.register_collector(_collect_metrics)
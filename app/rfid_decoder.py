@@ -0,0 +1,100 @@
+"""Decode raw evdev key events from HID-keyboard RFID readers into UIDs.
+
+USB readers "type" the card UID followed by Enter. Instead of running every
+event through evdev.categorize() and looking up KEY_* names, events are
+decoded from their integer (type, code, value) through a table indexed by
+Linux input keycode, built once at import.
+
+Letters are emitted in lowercase whether or not the reader holds shift, so
+hex UIDs decode the same from readers that send them in either case (and
+match the UIDs stored by earlier versions). Shift does apply to the digit
+and punctuation keys, following the US layout readers assume.
+"""
+
+from typing import Optional
+
+EV_KEY = 1
+KEY_UP, KEY_DOWN, KEY_HOLD = 0, 1, 2
+
+KEY_LEFTSHIFT = 42
+KEY_RIGHTSHIFT = 54
+KEY_ENTER = 28
+KEY_KPENTER = 96
+
+# Max characters buffered without an Enter; guards against a stuck reader
+MAX_UID_LENGTH = 64
+
+# Linux input keycodes (include/uapi/linux/input-event-codes.h) -> (plain, shifted)
+_KEYS = {
+    2: ("1", "!"), 3: ("2", "@"), 4: ("3", "#"), 5: ("4", "$"), 6: ("5", "%"),
+    7: ("6", "^"), 8: ("7", "&"), 9: ("8", "*"), 10: ("9", "("), 11: ("0", ")"),
+    12: ("-", "_"), 13: ("=", "+"), 57: (" ", " "),
+    # keypad digits (some readers use the numeric keypad)
+    71: ("7", "7"), 72: ("8", "8"), 73: ("9", "9"), 75: ("4", "4"), 76: ("5", "5"),
+    77: ("6", "6"), 79: ("1", "1"), 80: ("2", "2"), 81: ("3", "3"), 82: ("0", "0"),
+}
+_LETTER_CODES = {
+    16: "q", 17: "w", 18: "e", 19: "r", 20: "t", 21: "y", 22: "u", 23: "i", 24: "o", 25: "p",
+    30: "a", 31: "s", 32: "d", 33: "f", 34: "g", 35: "h", 36: "j", 37: "k", 38: "l",
+    44: "z", 45: "x", 46: "c", 47: "v", 48: "b", 49: "n", 50: "m",
+}
+for _code, _ch in _LETTER_CODES.items():
+    _KEYS[_code] = (_ch, _ch)
+
+KEYCODE_TABLE = [None] * 256
+for _code, _chars in _KEYS.items():
+    KEYCODE_TABLE[_code] = _chars
+
+
+class KeycodeDecoder:
+    """Stateful decoder for one reader; feed() returns a UID on Enter."""
+
+    __slots__ = ("_buffer", "_shift")
+
+    def __init__(self):
+        self._buffer = []
+        self._shift = False
+
+    def reset(self):
+        self._buffer = []
+        self._shift = False
+
+    def feed(self, type_: int, code: int, value: int) -> Optional[str]:
+        if type_ != EV_KEY:
+            return None
+        if code == KEY_LEFTSHIFT or code == KEY_RIGHTSHIFT:
+            self._shift = value != KEY_UP
+            return None
+        if value != KEY_DOWN:
+            return None
+        if code == KEY_ENTER or code == KEY_KPENTER:
+            if not self._buffer:
+                return None
+            uid = "".join(self._buffer).strip()
+            self._buffer = []
+            return uid or None
+        chars = KEYCODE_TABLE[code] if code < 256 else None
+        if chars is not None and len(self._buffer) < MAX_UID_LENGTH:
+            self._buffer.append(chars[1] if self._shift else chars[0])
+        return None
+
+
+def read_recorded_events(path: str):
+    """Load a recording made for replay: returns ([(ts, type, code, value)], [uid]).
+
+    Each line is "<timestamp> <type> <code> <value>"; "# uid <uid>" lines give
+    the UIDs the events decode to and other "#" lines are comments.
+    """
+    events, uids = [], []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                if line.startswith("# uid "):
+                    uids.append(line[6:])
+                continue
+            ts, type_, code, value = line.split()
+            events.append((float(ts), int(type_), int(code), int(value)))
+    return events, uids
@@ -1,24 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
-from typing import List, Optional
+from typing import Optional
 from datetime import datetime
 
 from app.db import get_session
-from app.crud import create_checkin_by_rfid, list_checkins, hours_worked
-from app.models import CheckIn
+from app.crud import list_checkins, list_checkins_page, hours_worked, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.checkin_writer import checkin_by_rfid
 
 router = APIRouter()
 
 
 @router.post("/checkins/")
-def api_create_checkin(payload: dict, session: Session = Depends(get_session)):
+def api_create_checkin(payload: dict):
     rfid_uid = payload.get("rfid_uid")
     if not rfid_uid:
         raise HTTPException(status_code=400, detail="'rfid_uid' is required")
-    result = create_checkin_by_rfid(session, rfid_uid)
+    result = checkin_by_rfid(rfid_uid)
     if not result:
         raise HTTPException(status_code=404, detail="Employee with that RFID not found")
     checkin, employee, message = result
+    # Software readers (simulador.py, kiosks posting here) show up live like hardware taps
+    try:
+        from app.rfid import push_event
+        push_event({"type": "checkin", "rfid_uid": rfid_uid, "employee_id": employee.document_id, "employee_name": employee.name, "checkin_type": checkin.type, "checkin_id": checkin.id, "timestamp": checkin.timestamp.isoformat(), "message": message})
+    except Exception:
+        pass
     return {
         "id": checkin.id,
         "employee_id": checkin.employee_id,
@@ -29,9 +35,22 @@ def api_create_checkin(payload: dict, session: Session = Depends(get_session)):
     }
 
 
-@router.get("/checkins/", response_model=List[CheckIn])
-def api_list_checkins(employee_id: Optional[str] = None, session: Session = Depends(get_session)):
-    return list_checkins(session, employee_id=employee_id)
+@router.get("/checkins/")
+def api_list_checkins(employee_id: Optional[str] = None, before_id: Optional[int] = None, before_ts: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), session: Session = Depends(get_session)):
+    """List check-ins newest first, one page at a time.
+
+    Pass the returned next_cursor values as before_id/before_ts to fetch the
+    following page; next_cursor is null on the last page.
+    """
+    try:
+        before_ts_dt = datetime.fromisoformat(before_ts) if before_ts else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="'before_ts' must be an ISO 8601 timestamp from next_cursor")
+    checkins, next_cursor = list_checkins_page(session, employee_id=employee_id, before_id=before_id, before_ts=before_ts_dt, limit=limit)
+    return {
+        "items": [{"id": c.id, "employee_id": c.employee_id, "type": c.type, "timestamp": c.timestamp.isoformat()} for c in checkins],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/checkins/employee/{employee_id}")
@@ -0,0 +1,170 @@
+"""Streaming exports of check-ins and worked hours for payroll.
+
+Rows are read from a server-side cursor (yield_per) inside the response
+generator and encoded in small chunks, so memory stays flat regardless of the
+date range. Output is CSV or NDJSON, optionally gzip-compressed on the fly.
+The payroll report is computed up front (see app.payroll) and only encoded
+while streaming.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+from sqlalchemy import asc
+from typing import Optional
+from datetime import date, datetime
+import csv
+import io
+import json
+import zlib
+
+from app.db import get_session, get_read_engine
+from app.crud import get_user, work_sessions
+from app.models import CheckIn, Employee
+from app.payroll import PayrollUnavailable, payroll_report, payroll_rows
+
+router = APIRouter()
+
+_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+_CHUNK_SIZE = 64 * 1024
+_YIELD_PER = 1000
+
+
+def _require_admin(request: Request, session: Session):
+    session_user = None
+    try:
+        session_user = request.session.get("user")
+    except Exception:
+        session_user = None
+    if not session_user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    user = get_user(session, session_user)
+    if not user or not getattr(user, "is_admin", False):
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+
+
+def _parse_range(start: Optional[str], end: Optional[str]):
+    try:
+        start_dt = datetime.fromisoformat(start) if start else None
+        end_dt = datetime.fromisoformat(end) if end else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start/end must be ISO 8601 datetimes")
+    return start_dt, end_dt
+
+
+def _checkin_rows(employee_id: Optional[str], start: Optional[datetime], end: Optional[datetime]):
+    """Yield (id, employee_id, name, type, timestamp) tuples from a streaming cursor."""
+    statement = (
+        select(CheckIn.id, CheckIn.employee_id, Employee.name, CheckIn.type, CheckIn.timestamp)
+        .join(Employee, Employee.document_id == CheckIn.employee_id)
+    )
+    if employee_id:
+        statement = statement.where(CheckIn.employee_id == employee_id.strip().upper())
+    if start:
+        statement = statement.where(CheckIn.timestamp >= start)
+    if end:
+        statement = statement.where(CheckIn.timestamp <= end)
+    statement = statement.order_by(asc(CheckIn.timestamp), asc(CheckIn.id))
+    with Session(get_read_engine()) as session:
+        for row in session.exec(statement.execution_options(yield_per=_YIELD_PER)):
+            yield tuple(row)
+
+
+def _hours_rows(employee_id: Optional[str], start: Optional[datetime], end: Optional[datetime]):
+    """Worked periods from crud.work_sessions, clipped to the range like the hours report."""
+    with Session(get_read_engine()) as session:
+        names = dict(session.exec(select(Employee.document_id, Employee.name)).all())
+        for emp_id, _, entry, _, exit_, seconds in work_sessions(session, employee_id, start, end, yield_per=_YIELD_PER):
+            yield (emp_id, names.get(emp_id), entry.isoformat(), exit_.isoformat(), round(seconds / 3600, 4))
+
+
+def _encode(rows, header, fmt: str):
+    """Encode row tuples into CSV/NDJSON byte chunks of roughly _CHUNK_SIZE."""
+    buf = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buf)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            if buf.tell() >= _CHUNK_SIZE:
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+    else:
+        for row in rows:
+            buf.write(json.dumps(dict(zip(header, row)), default=str))
+            buf.write("\n")
+            if buf.tell() >= _CHUNK_SIZE:
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _stream(rows, header, name: str, fmt: str, compress: Optional[str]):
+    if fmt not in _FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+    if compress not in (None, "", "gzip"):
+        raise HTTPException(status_code=400, detail="compress must be 'gzip'")
+    body = _encode(rows, header, fmt)
+    filename = f"{name}.{fmt}"
+    media_type = _FORMATS[fmt]
+    if compress == "gzip":
+        body = _gzip(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@router.get("/export/checkins")
+def export_checkins(request: Request, start: Optional[str] = None, end: Optional[str] = None, employee_id: Optional[str] = None, format: str = "csv", compress: Optional[str] = None, session: Session = Depends(get_session)):
+    """Stream check-ins in the range as CSV or NDJSON."""
+    _require_admin(request, session)
+    start_dt, end_dt = _parse_range(start, end)
+    rows = ((cid, emp, name, type_val, ts.isoformat()) for cid, emp, name, type_val, ts in _checkin_rows(employee_id, start_dt, end_dt))
+    return _stream(rows, ("id", "employee_id", "employee_name", "type", "timestamp"), "checkins", format, compress)
+
+
+@router.get("/export/hours")
+def export_hours(request: Request, start: Optional[str] = None, end: Optional[str] = None, employee_id: Optional[str] = None, format: str = "csv", compress: Optional[str] = None, session: Session = Depends(get_session)):
+    """Stream worked periods (entry/exit pairs with hours) in the range."""
+    _require_admin(request, session)
+    start_dt, end_dt = _parse_range(start, end)
+    rows = _hours_rows(employee_id, start_dt, end_dt)
+    return _stream(rows, ("employee_id", "employee_name", "entry", "exit", "hours"), "hours", format, compress)
+
+
+@router.get("/export/payroll")
+def export_payroll(request: Request, start: str, end: str, employee_id: Optional[str] = None, format: str = "csv", compress: Optional[str] = None, session: Session = Depends(get_session)):
+    """Per-employee totals, overtime, open entries and hours per local day for start..end (dates, inclusive).
+
+    format=json returns the whole report; csv/ndjson give one row per employee
+    with a column per day.
+    """
+    _require_admin(request, session)
+    try:
+        start_day, end_day = date.fromisoformat(start), date.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start/end must be YYYY-MM-DD dates")
+    if end_day < start_day:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if format != "json" and format not in _FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'json', 'csv' or 'ndjson'")
+    try:
+        with Session(get_read_engine()) as read_session:
+            report = payroll_report(read_session, start_day, end_day, employee_id=employee_id)
+    except PayrollUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if format == "json":
+        return report
+    header, rows = payroll_rows(report)
+    return _stream(rows, header, f"payroll_{start_day.isoformat()}_{end_day.isoformat()}", format, compress)
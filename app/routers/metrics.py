@@ -0,0 +1,16 @@
+"""Prometheus scrape endpoint.
+
+Left unauthenticated so a scraper needs no admin session; the output holds
+counts and timings only, never employee data.
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def api_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -2,14 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisco
 from sqlmodel import Session
 import os
 import json
-from app.db import get_session
+from app.db import get_session, get_read_session
 from app.crud import assign_rfid, get_user
 from datetime import datetime
 from app import rfid as rfid_service
+from app import rfid_cache
 import asyncio
+from typing import Optional
 
 try:
-    from app.rfid import write_rc522_tag
+    from app.rfid import write_rc522_tag, RC522Busy, RC522Unavailable
 except Exception:
     write_rc522_tag = None
 
@@ -91,7 +93,7 @@ def api_rfid_assign(request: Request, payload: dict, session: Session = Depends(
 
 
 @router.post("/rfid/mock")
-def api_rfid_mock(request: Request, payload: dict, session: Session = Depends(get_session)):
+def api_rfid_mock(request: Request, payload: dict, session: Session = Depends(get_read_session)):
     """Inject fake RFID tag for testing. Development/test environments only."""
     session_user = None
     try:
@@ -122,12 +124,73 @@ def api_rfid_mock(request: Request, payload: dict, session: Session = Depends(ge
         raise HTTPException(status_code=500, detail="Failed to inject tag")
 
 
+@router.get("/rfid/cache/stats")
+def api_rfid_cache_stats(request: Request, session: Session = Depends(get_session)):
+    """Hit/miss counters of the RFID lookup cache. Requires admin authentication."""
+    session_user = None
+    try:
+        session_user = request.session.get("user")
+    except Exception:
+        session_user = None
+
+    if not session_user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    user = get_user(session, session_user)
+    if not user or not getattr(user, "is_admin", False):
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return rfid_cache.get_cache().stats()
+
+
+@router.get("/rfid/journal/stats")
+def api_rfid_journal_stats(request: Request, session: Session = Depends(get_session)):
+    """Pending taps in the offline journal and the age of the oldest one. Requires admin authentication."""
+    session_user = None
+    try:
+        session_user = request.session.get("user")
+    except Exception:
+        session_user = None
+
+    if not session_user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    user = get_user(session, session_user)
+    if not user or not getattr(user, "is_admin", False):
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return rfid_service.journal_stats()
+
+
+@router.get("/rfid/reader/stats")
+def api_rfid_reader_stats(request: Request, session: Session = Depends(get_session)):
+    """RC522 polling counters and poll-to-detect latency. Requires admin authentication."""
+    session_user = None
+    try:
+        session_user = request.session.get("user")
+    except Exception:
+        session_user = None
+
+    if not session_user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    user = get_user(session, session_user)
+    if not user or not getattr(user, "is_admin", False):
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    stats = rfid_service.reader_stats()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No RC522 reader polling in this worker")
+    return stats
+
+
 @router.websocket("/ws/rfid")
-async def websocket_rfid(ws: WebSocket):
-    """Stream RFID events to WebSocket clients in real-time."""
+async def websocket_rfid(ws: WebSocket, since: Optional[int] = None):
+    """Stream RFID events to WebSocket clients in real-time.
+
+    Clients reconnecting with ?since=<last seq> first get the events they
+    missed, or a resync message if those are no longer buffered.
+    """
     await ws.accept()
     try:
-        rfid_service.register_websocket(ws)
+        rfid_service.register_websocket(ws, since=since)
         while True:
             try:
                 await ws.receive_text()
@@ -176,6 +239,8 @@ async def api_rfid_write_assign(request: Request, payload: dict, session: Sessio
         raise
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to verify user permissions")
+    # Release the writer connection while blocking on the tag (up to 30s)
+    session.close()
 
     uid = None
     stored = None
@@ -184,11 +249,17 @@ async def api_rfid_write_assign(request: Request, payload: dict, session: Sessio
     write_err = None
 
     if write_rc522_tag is not None:
+        # Only fall back to the wrapper when no process can be colliding with it:
+        # it opens the RC522 itself and would fight a polling loop for SPI
         try:
             uid, stored = await asyncio.to_thread(write_rc522_tag, write_text)
-        except Exception as e:
+        except RC522Unavailable as e:
             use_wrapper = True
             write_err = e
+        except RC522Busy as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=str(e))
     else:
         use_wrapper = True
 
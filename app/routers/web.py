@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Request, Form, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Form, UploadFile, File
 from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
 from starlette.status import HTTP_302_FOUND
 from starlette.templating import Jinja2Templates
@@ -10,16 +10,15 @@ from typing import Optional
 import os
 from zoneinfo import available_timezones
 
-from app.db import get_session
+from app.db import get_engine, get_session, get_read_session
 from app.crud import (
     list_employees,
     create_employee,
     assign_rfid,
     list_checkins,
-    hours_worked,
-    create_checkin_by_rfid,
-    create_checkin_for_employee,
+    list_checkins_page,
     list_recent_checkins,
+    list_present_employees,
     archive_employee,
     list_archived_employees,
     get_employee,
@@ -33,7 +32,11 @@ from app.crud import (
     get_config,
     log_admin_action,
     list_admin_actions,
+    list_daily_summaries,
+    rebuild_daily_summaries,
 )
+from app.checkin_writer import checkin_by_rfid, checkin_for_employee
+from app import rfid_cache
 import json
 
 PENDING_FILE = os.environ.get("PICONTROL_RFID_PENDING_FILE", "/var/lib/picontrol/rfid_assign_pending.json")
@@ -112,6 +115,7 @@ def admin_index(request: Request, session: Session = Depends(get_session)):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
     flash = request.session.pop("flash", None)
     recent_checkins = list_recent_checkins(session, limit=20)
+    present = list_present_employees(session)
     employees = list_employees(session, active_only=True)
     employees_map = {e.document_id: e.name for e in employees}
 
@@ -120,6 +124,7 @@ def admin_index(request: Request, session: Session = Depends(get_session)):
         {
             "request": request,
             "recent_checkins": recent_checkins,
+            "present": present,
             "flash": flash,
             "employees_map": employees_map,
             "employees": employees,
@@ -208,9 +213,9 @@ def admin_checkin_manual(request: Request, employee_id: Optional[str] = Form(Non
     
     result = None
     if employee_id is not None:
-        result = create_checkin_for_employee(session, employee_id)
+        result = checkin_for_employee(employee_id)
     elif rfid_uid:
-        result = create_checkin_by_rfid(session, rfid_uid)
+        result = checkin_by_rfid(rfid_uid)
     
     try:
         username = request.session.get("user")
@@ -237,9 +242,9 @@ def admin_checkin_manual_ajax(request: Request, employee_id: Optional[str] = For
     
     result = None
     if employee_id is not None:
-        result = create_checkin_for_employee(session, employee_id)
+        result = checkin_for_employee(employee_id)
     elif rfid_uid:
-        result = create_checkin_by_rfid(session, rfid_uid)
+        result = checkin_by_rfid(rfid_uid)
     
     if not result:
         return {"success": False, "error": "Employee not found"}
@@ -375,36 +380,65 @@ def admin_employees_assign_ajax(request: Request, employee_id: str, rfid_uid: st
     return {"success": True, "name": employee.name, "rfid_uid": employee.rfid_uid}
 
 
+def _parse_checkin_filters(start: Optional[str], end: Optional[str], before_ts: Optional[str] = None):
+    from datetime import datetime
+
+    parsed = []
+    for value in (start, end, before_ts):
+        try:
+            parsed.append(datetime.fromisoformat(value) if value else None)
+        except Exception:
+            parsed.append(None)
+    return parsed
+
+
 @router.get("/admin/checkins", response_class=HTMLResponse)
 def admin_checkins(request: Request, employee_id: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, session: Session = Depends(get_session)):
-    """Check-in history page with optional employee and date filters."""
+    """Check-in history page with optional employee and date filters.
+
+    Only the first page is rendered; further pages are fetched on demand
+    from /admin/checkins/page.
+    """
     if not require_login(request):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
 
-    # parse optional dates
-    start_dt = None
-    end_dt = None
-    from datetime import datetime
+    start_dt, end_dt, _ = _parse_checkin_filters(start, end)
 
-    try:
-        if start:
-            start_dt = datetime.fromisoformat(start)
-    except Exception:
-        start_dt = None
-    try:
-        if end:
-            end_dt = datetime.fromisoformat(end)
-    except Exception:
-        end_dt = None
-
-    fichas = list_checkins(session, employee_id=employee_id, start=start_dt, end=end_dt)
+    fichas, next_cursor = list_checkins_page(session, employee_id=employee_id, start=start_dt, end=end_dt)
 
     employees = list_employees(session)
     employees_map = {e.document_id: e.name for e in employees}
 
     checkins = fichas
     employees = employees
-    return templates.TemplateResponse("checkins.html", {"request": request, "fichas": fichas, "checkins": checkins, "employees": employees, "employees": employees, "employees_map": employees_map, "filter": {"employee_id": employee_id, "start": start, "end": end}})
+    return templates.TemplateResponse("checkins.html", {"request": request, "fichas": fichas, "checkins": checkins, "employees": employees, "employees": employees, "employees_map": employees_map, "next_cursor": next_cursor, "filter": {"employee_id": employee_id, "start": start, "end": end}})
+
+
+@router.get("/admin/checkins/page")
+def admin_checkins_page(request: Request, employee_id: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, before_id: Optional[int] = None, before_ts: Optional[str] = None, session: Session = Depends(get_session)):
+    """Next page of the check-in history as JSON."""
+    if not require_login(request):
+        return {"success": False, "error": "Not authenticated"}
+
+    start_dt, end_dt, before_ts_dt = _parse_checkin_filters(start, end, before_ts)
+    checkins, next_cursor = list_checkins_page(session, employee_id=employee_id, start=start_dt, end=end_dt, before_id=before_id, before_ts=before_ts_dt)
+
+    ids = {c.employee_id for c in checkins}
+    employees_map = {e.document_id: e.name for e in list_employees(session) if e.document_id in ids}
+    return {
+        "success": True,
+        "items": [
+            {
+                "id": c.id,
+                "timestamp": format_datetime(c.timestamp),
+                "employee_id": c.employee_id,
+                "employee_name": employees_map.get(c.employee_id, c.employee_id),
+                "type": c.type,
+            }
+            for c in checkins
+        ],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/admin/reports", response_class=HTMLResponse)
@@ -461,44 +495,32 @@ def admin_reports_result(request: Request, employee_id: str, start: Optional[str
     if not require_login(request):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
 
-    from datetime import datetime, time, timedelta
+    from datetime import date
 
-    start_dt = None
-    end_dt = None
+    # Day-granular: the report sums per-day summaries, so a time of day
+    # cannot be honoured (use /reports/hours for exact instants)
+    start_day = None
+    end_day = None
     try:
         if start:
-            start_dt = datetime.fromisoformat(start)
+            start_day = date.fromisoformat(start)
     except Exception:
-        start_dt = None
+        start = None
     try:
         if end:
-            end_dt = datetime.fromisoformat(end)
+            end_day = date.fromisoformat(end)
     except Exception:
-        end_dt = None
+        end = None
+
+    summaries = list_daily_summaries(session, employee_id, start=start_day, end=end_day)
 
-    total_hours, pairs = hours_worked(session, employee_id, start=start_dt, end=end_dt)
-
-    per_day_seconds = {}
-    for entrada, salida, _ in pairs:
-        if not salida:
-            continue
-        current = entrada
-        tz = entrada.tzinfo
-        while current < salida:
-            next_day = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            if tz is not None and next_day.tzinfo is None:
-                next_day = next_day.replace(tzinfo=tz)
-            segment_end = min(salida, next_day)
-            seconds = (segment_end - current).total_seconds()
-            day_key = current.date().isoformat()
-            per_day_seconds[day_key] = per_day_seconds.get(day_key, 0.0) + seconds
-            current = segment_end
-
-    # convert seconds to decimal hours (float) and create a sorted list by date
     per_day = []
-    for day in sorted(per_day_seconds.keys()):
-        hours = per_day_seconds[day] / 3600.0
-        per_day.append((day, round(hours, 2)))
+    total_hours = 0.0
+    for summary in summaries:
+        hours = summary.worked_seconds / 3600.0
+        total_hours += hours
+        if summary.worked_seconds:
+            per_day.append((summary.day.isoformat(), round(hours, 2)))
 
     total_hours_rounded = round(total_hours, 2)
 
@@ -551,7 +573,6 @@ def kiosk_view():
 @router.post("/admin/restart")
 def admin_restart(request: Request, session: Session = Depends(get_session)):
     """Restart PiControl service via wrapper script."""
-    - Registra la acción en la tabla de auditoría y guarda un message flash.
     if not require_login(request):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
 
@@ -578,7 +599,7 @@ def admin_restart(request: Request, session: Session = Depends(get_session)):
             log_admin_action(session, username or "unknown", "restart_service_error", str(e)[:2000])
         except Exception:
             pass
-    request.session["flash"] = f"Exception while requesting restart: {e}"
+        request.session["flash"] = f"Exception while requesting restart: {e}"
 
     return RedirectResponse(url="/admin/configuration", status_code=HTTP_302_FOUND)
 
@@ -600,30 +621,51 @@ def admin_change_password(request: Request, new_password: str = Form(...), confi
 
 
 @router.get("/admin/configuration/export_db")
-def admin_export_db(request: Request, session: Session = Depends(get_session)):
+def admin_export_db(request: Request, session: Session = Depends(get_read_session)):
     if not require_login(request):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
     username = request.session.get("user")
     user = get_user(session, username) if username else None
+    # Release the read connection before the paced backup starts
+    session.close()
     if not user or not user.is_admin:
         request.session["flash"] = "Admin privileges required"
         return RedirectResponse(url="/admin/configuration", status_code=HTTP_302_FOUND)
     
     from app.db import DB_PATH
+    from app.backup import backup_with_retention
     if not os.path.exists(DB_PATH):
         request.session["flash"] = "Database file not found"
         return RedirectResponse(url="/admin/configuration", status_code=HTTP_302_FOUND)
-    
+
+    # Serve a consistent online snapshot instead of the live file. No writer
+    # session is open while it runs, so the check-in writer keeps its connection.
+    try:
+        backup = backup_with_retention()
+    except Exception as e:
+        request.session["flash"] = f"Error creating backup: {e}"
+        return RedirectResponse(url="/admin/configuration", status_code=HTTP_302_FOUND)
+
     try:
-        log_admin_action(session, username, "export_db", "Database exported")
+        with Session(get_engine()) as write_session:
+            log_admin_action(write_session, username, "export_db", f"Database exported via backup {os.path.basename(backup.path)} ({backup.pages} pages, {backup.duration:.2f}s)")
     except Exception:
         pass
-    
-    return FileResponse(DB_PATH, media_type="application/x-sqlite3", filename="pi_control.db")
+
+    return FileResponse(backup.path, media_type="application/x-sqlite3", filename="pi_control.db")
+
+
+# Pause between summary rebuild batches so kiosk check-ins get the writer
+SUMMARY_REBUILD_PAUSE = 0.05
+
+
+def _rebuild_summaries_in_background():
+    with Session(get_engine()) as session:
+        rebuild_daily_summaries(session, pause=SUMMARY_REBUILD_PAUSE)
 
 
 @router.post("/admin/configuration/import_db")
-def admin_import_db(request: Request, file: UploadFile = File(...), session: Session = Depends(get_session)):
+def admin_import_db(request: Request, background_tasks: BackgroundTasks, file: UploadFile = File(...), session: Session = Depends(get_session)):
     if not require_login(request):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
     username = request.session.get("user")
@@ -632,12 +674,21 @@ def admin_import_db(request: Request, file: UploadFile = File(...), session: Ses
         request.session["flash"] = "Admin privileges required"
         return RedirectResponse(url="/admin/configuration", status_code=HTTP_302_FOUND)
     
-    from app.db import DB_PATH
+    from app.db import DB_PATH, dispose_engines, init_db
     try:
         tmp_path = DB_PATH + ".upload_tmp"
         with open(tmp_path, "wb") as f:
             shutil.copyfileobj(file.file, f)
+        session.close()
+        dispose_engines()
         shutil.move(tmp_path, DB_PATH)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(DB_PATH + suffix):
+                os.remove(DB_PATH + suffix)
+        rfid_cache.invalidate()
+        # Creates tables/indexes the uploaded file lacks and backfills daily
+        # summaries if it has none, after the response is sent
+        background_tasks.add_task(init_db)
         request.session["flash"] = "Database imported. Restart the server if required."
         try:
             log_admin_action(session, username, "import_db", f"Replaced database with uploaded file")
@@ -654,10 +705,13 @@ def admin_import_db(request: Request, file: UploadFile = File(...), session: Ses
 
 
 @router.post("/admin/configuration/set_timezone")
-def admin_set_timezone(request: Request, timezone: str = Form(...), session: Session = Depends(get_session)):
+def admin_set_timezone(request: Request, background_tasks: BackgroundTasks, timezone: str = Form(...), session: Session = Depends(get_session)):
     if not require_login(request):
         return RedirectResponse(url="/admin/login", status_code=HTTP_302_FOUND)
     set_config(session, "timezone", timezone)
+    # Daily summaries are keyed by local date, so recompute them for the new
+    # zone, in batches after the response is sent
+    background_tasks.add_task(_rebuild_summaries_in_background)
     try:
         subprocess.run(["timedatectl", "set-timezone", timezone], check=True, capture_output=True)
         request.session["flash"] = f"Timezone set to {timezone}"
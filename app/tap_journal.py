@@ -0,0 +1,198 @@
+"""Append-only journal that keeps RFID taps until the database has them.
+
+The reader service writes every tap here, with the time the reader produced
+it, before any database work, and wakes the replayer thread, which applies
+pending taps strictly in order. A tap stays pending until it is applied; if
+the database is locked (backup, import) or failing (disk full), the
+replayer retries from that tap once it is writable again, keeping the
+original timestamps, and later taps queue behind it so the entry/exit
+toggle sees them in the order they happened. A tap that still fails after
+max_attempts tries is moved to a dead-letter file next to the journal
+("<path>.dead", one JSON line per tap with the last error) so it cannot hold
+up the taps behind it forever; apply() raises TapRejected for a tap that can
+never succeed, which is dead-lettered at once.
+
+The file is JSON lines: {"id", "uid", "ts"[, "reader"]} for a tap and {"done": id} once
+it is applied. Tap records are fsync'd; done records are not, because
+replaying an applied tap is harmless: check-ins with an explicit timestamp
+are skipped if that employee already has one at the same instant.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .config import config
+
+logger = logging.getLogger("picontrol.tap_journal")
+
+# Start a fresh file once everything is applied and the file grew past this
+_COMPACT_BYTES = 1024 * 1024
+
+
+def _read_pending(path: str) -> "OrderedDict[int, dict]":
+    pending = OrderedDict()
+    if not os.path.exists(path):
+        return pending
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line after a crash
+            if "done" in record:
+                pending.pop(record["done"], None)
+            else:
+                pending[record["id"]] = record
+    return pending
+
+
+def _stats(pending, applied: Optional[int], dead_lettered: Optional[int] = None) -> dict:
+    oldest = next(iter(pending.values()), None)
+    stats = {
+        "depth": len(pending),
+        "oldest_age_seconds": round(time.time() - oldest["ts"], 3) if oldest else 0.0,
+    }
+    if applied is not None:
+        stats["applied"] = applied
+    if dead_lettered is not None:
+        stats["dead_lettered"] = dead_lettered
+    return stats
+
+
+def file_stats(path: Optional[str] = None) -> dict:
+    """Depth and oldest-pending age read from the file, for workers not owning it."""
+    return _stats(_read_pending(path or config.TAP_JOURNAL_PATH), None)
+
+
+class TapRejected(Exception):
+    """Raised by apply() for a tap that retrying cannot store."""
+
+
+class TapJournal:
+    def __init__(self, path: Optional[str] = None, retry_ms: Optional[float] = None, max_attempts: Optional[int] = None):
+        self.path = path or config.TAP_JOURNAL_PATH
+        self.dead_letter_path = self.path + ".dead"
+        self.retry = (config.TAP_JOURNAL_RETRY_MS if retry_ms is None else retry_ms) / 1000.0
+        # 0 retries a failing tap forever
+        self.max_attempts = config.TAP_JOURNAL_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._next_id = 1
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.applied = 0
+        self.dead_lettered = 0
+        # Failed attempts per pending tap, reset by a restart
+        self._attempts = {}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._load()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._pending:
+            logger.warning("Tap journal %s has %d pending taps from a previous run", self.path, len(self._pending))
+
+    def _load(self):
+        self._pending = _read_pending(self.path)
+        if self._pending:
+            self._next_id = max(self._pending) + 1
+
+    def _write(self, record: dict, sync: bool):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def append(self, uid: str, ts: float, reader: Optional[str] = None) -> dict:
+        """Durably record a tap and return its entry."""
+        with self._lock:
+            entry = {"id": self._next_id, "uid": uid, "ts": ts}
+            if reader:
+                entry["reader"] = reader
+            self._next_id += 1
+            self._write(entry, sync=True)
+            self._pending[entry["id"]] = entry
+            return entry
+
+    def mark_done(self, entry_id: int):
+        with self._lock:
+            if self._pending.pop(entry_id, None) is None:
+                return
+            self._write({"done": entry_id}, sync=False)
+            if not self._pending and self._file.tell() > _COMPACT_BYTES:
+                self._file.close()
+                self._file = open(self.path, "w", encoding="utf-8")
+
+    def pending(self) -> list:
+        with self._lock:
+            return list(self._pending.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return _stats(self._pending, self.applied, self.dead_lettered)
+
+    # ------------------ replayer ------------------
+    def start_replayer(self, apply: Callable[[dict], None]):
+        """Apply pending taps in order on a background thread.
+
+        apply(entry) must raise if the tap could not be stored; the replayer
+        then waits for the retry interval (or wake()) and starts again from
+        that tap, until it has failed max_attempts times and is dead-lettered.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._replay_loop, args=(apply,), name="tap-replayer", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _replay_loop(self, apply):
+        while not self._stop.is_set():
+            self._wake.clear()
+            for entry in self.pending():
+                if self._stop.is_set():
+                    return
+                try:
+                    apply(entry)
+                except TapRejected as e:
+                    self._dead_letter(entry, e, self._attempts.get(entry["id"], 0) + 1)
+                    continue
+                except Exception as e:
+                    attempts = self._attempts.get(entry["id"], 0) + 1
+                    if self.max_attempts and attempts >= self.max_attempts:
+                        self._dead_letter(entry, e, attempts)
+                        continue
+                    self._attempts[entry["id"]] = attempts
+                    logger.warning("Tap %s still pending (%s); retrying in %.1fs", entry["id"], e, self.retry)
+                    break
+                self._attempts.pop(entry["id"], None)
+                self.mark_done(entry["id"])
+                self.applied += 1
+            self._wake.wait(self.retry)
+
+    def _dead_letter(self, entry: dict, error: Exception, attempts: int):
+        """Move a tap that keeps failing out of the journal, keeping it on disk."""
+        record = {key: entry[key] for key in ("id", "uid", "ts", "reader") if key in entry}
+        record.update(error=str(error), attempts=attempts, dead_lettered_at=time.time())
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._attempts.pop(entry["id"], None)
+        self.mark_done(entry["id"])
+        self.dead_lettered += 1
+        logger.error("Tap %s (%s) failed %d times (%s); moved to %s", entry["id"], entry["uid"], attempts, error, self.dead_letter_path)
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        with self._lock:
+            self._file.close()
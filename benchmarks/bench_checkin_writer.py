@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare tap throughput with and without group commit on the same DB file.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_checkin_writer --taps 2000 --threads 8
+
+"direct" runs create_checkin_by_rfid with one commit per tap from every
+thread; "batched" submits the same taps to the CheckinWriter.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark check-in group commit")
+    p.add_argument("--db-dir", default=None, help="Directory for the benchmark DB (default: temp dir)")
+    p.add_argument("--employees", type=int, default=200)
+    p.add_argument("--taps", type=int, default=2000, help="Taps per mode")
+    p.add_argument("--threads", type=int, default=8, help="Concurrent tapping threads")
+    p.add_argument("--window-ms", type=float, default=5.0, help="Batching window for the writer")
+    p.add_argument("--synchronous", default=None, help="Override PRAGMA synchronous (FULL approximates fsync-bound SD cards)")
+    return p.parse_args()
+
+
+def run_threads(threads: int, taps: int, employees: int, tap):
+    per_thread = taps // threads
+
+    def worker(offset):
+        for i in range(per_thread):
+            tap(f"bench-{(offset + i * threads) % employees:05d}")
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return per_thread * threads, time.perf_counter() - t0
+
+
+def main():
+    args = parse_args()
+    db_dir = args.db_dir or tempfile.mkdtemp(prefix="picontrol-bench-")
+    # app.db resolves the DB path at import time
+    os.environ["PICONTROL_DB_DIR"] = db_dir
+    if args.synchronous:
+        os.environ["PICONTROL_DB_SYNCHRONOUS"] = args.synchronous
+
+    from sqlmodel import Session
+    from app.db import get_engine, init_db
+    from app.crud import create_checkin_by_rfid
+    from app.models import Employee
+    from app.checkin_writer import CheckinWriter
+
+    init_db()
+    engine = get_engine()
+    with Session(engine) as session:
+        for i in range(args.employees):
+            session.merge(Employee(document_id=f"B{i:05d}", name=f"Bench {i}", rfid_uid=f"bench-{i:05d}"))
+        session.commit()
+
+    def direct_tap(uid):
+        with Session(engine) as session:
+            create_checkin_by_rfid(session, uid)
+
+    writer = CheckinWriter(engine=engine, window_ms=args.window_ms)
+
+    def batched_tap(uid):
+        writer.submit_rfid(uid).result()
+
+    print(f"DB: {os.path.join(db_dir, 'pi_control.db')}")
+    for name, tap in (("direct", direct_tap), ("batched", batched_tap)):
+        n, elapsed = run_threads(args.threads, args.taps, args.employees, tap)
+        print(f"{name:8s} {n} taps in {elapsed:.2f}s -> {n / elapsed:.0f} taps/s")
+    writer.stop()
+    print(f"batched: {writer.writes} taps in {writer.batches} commits "
+          f"(avg {writer.writes / max(writer.batches, 1):.1f} per commit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Time crud hot paths on generated databases and catch regressions.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_crud --save-baseline      # record this machine's baseline
+    python -m benchmarks.bench_crud --threshold 25       # exit 1 if anything got >25% slower
+
+Each --sizes entry (EMPLOYEESxYEARS) is generated once with
+tools/generate_history.py into --data-dir (a temp dir unless given, so
+repeated runs can reuse it) with a fixed seed and end date. Every run
+measures a fresh copy of it, because create_checkin_by_rfid writes.
+Measurements happen in a child process per dataset: app.db binds its
+database path at import, from PICONTROL_DB_DIR.
+
+For every function the median, p95 and min of --repeat calls are
+recorded. A function regresses when its median exceeds the baseline
+median by more than --threshold percent. Baselines only mean something on
+the machine that recorded them, so they are kept outside the repository by
+default.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(os.path.expanduser("~"), ".cache", "picontrol", "bench_crud_baseline.json")
+# Fixed so the same size always produces the same data
+DATASET_END = "2025-12-31"
+DATASET_SEED = 7
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark crud hot paths with regression thresholds")
+    p.add_argument("--sizes", nargs="+", default=["200x1", "1000x2"], help="Datasets as EMPLOYEESxYEARS")
+    p.add_argument("--repeat", type=int, default=200, help="Calls per function")
+    p.add_argument("--data-dir", default=None, help="Where generated datasets are kept (default: temp dir)")
+    p.add_argument("--baseline", default=DEFAULT_BASELINE)
+    p.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    p.add_argument("--threshold", type=float, default=25.0, help="Allowed median slowdown in percent")
+    p.add_argument("--output", help="Also write this run's results as JSON")
+    p.add_argument("--measure", help=argparse.SUPPRESS)  # child mode: DB dir to measure
+    return p.parse_args()
+
+
+# ------------------ child: measure one database ------------------
+
+def _timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        t0 = time.perf_counter_ns()
+        fn(*args)
+        samples.append(time.perf_counter_ns() - t0)
+    samples.sort()
+    ms = lambda ns: round(ns / 1e6, 4)
+    return {"median_ms": ms(samples[len(samples) // 2]), "p95_ms": ms(samples[int(0.95 * (len(samples) - 1))]),
+            "min_ms": ms(samples[0]), "calls": len(samples)}
+
+
+def measure(repeat: int) -> dict:
+    from datetime import datetime, timedelta
+    from sqlmodel import Session, select
+    from app import crud
+    from app.db import get_engine
+    from app.models import Employee
+
+    engine = get_engine()
+    rng = random.Random(DATASET_SEED)
+    with Session(engine) as session:
+        uids = session.exec(select(Employee.rfid_uid).where(Employee.rfid_uid != None)).all()
+        employees = session.exec(select(Employee.document_id)).all()
+    end = datetime.fromisoformat(DATASET_END) + timedelta(days=1)
+    month = (end - timedelta(days=31), end)
+
+    def with_session(fn):
+        def call(*args):
+            with Session(engine) as session:
+                return fn(session, *args)
+        return call
+
+    pick_uids = [(rng.choice(uids),) for _ in range(repeat)]
+    pick_employees = [(rng.choice(employees),) for _ in range(repeat)]
+    no_args = [()] * repeat
+    results = {
+        "get_employee_by_rfid": _timed(with_session(crud.get_employee_by_rfid), pick_uids),
+        "hours_worked_month": _timed(with_session(lambda s, e: crud.hours_worked(s, e, start=month[0], end=month[1])), pick_employees),
+        "hours_worked_all": _timed(with_session(crud.hours_worked), pick_employees[: max(1, repeat // 10)]),
+        "list_recent_checkins": _timed(with_session(crud.list_recent_checkins), no_args),
+        "list_admin_actions": _timed(with_session(crud.list_admin_actions), no_args),
+        "list_admin_actions_filtered": _timed(with_session(lambda s: crud.list_admin_actions(s, action="manual_checkin")), no_args),
+        # Last: it writes
+        "create_checkin_by_rfid": _timed(with_session(crud.create_checkin_by_rfid), pick_uids),
+    }
+    return results
+
+
+# ------------------ parent: datasets, runs, comparison ------------------
+
+def ensure_dataset(data_dir: str, size: str) -> str:
+    employees, years = size.lower().split("x")
+    path = os.path.join(data_dir, size)
+    db_path = os.path.join(path, "pi_control.db")
+    marker = os.path.join(path, "generated.json")
+    params = {"employees": int(employees), "years": float(years), "end": DATASET_END, "seed": DATASET_SEED}
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if json.load(f) == params:
+                return db_path
+    os.makedirs(path, exist_ok=True)
+    print(f"Generating dataset {size} ...", flush=True)
+    t0 = time.monotonic()
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, "tools", "generate_history.py"), "--db-path", db_path, "--force",
+         "--employees", employees, "--years", years, "--end", DATASET_END, "--seed", str(DATASET_SEED)],
+        env=dict(os.environ, PICONTROL_DB_DIR=path, PYTHONPATH=ROOT), check=True, stdout=subprocess.DEVNULL,
+    )
+    with open(marker, "w") as f:
+        json.dump(params, f)
+    print(f"  done in {time.monotonic() - t0:.1f}s", flush=True)
+    return db_path
+
+
+def run_size(db_path: str, repeat: int) -> dict:
+    scratch = tempfile.mkdtemp(prefix="picontrol-bench-crud-")
+    try:
+        # sqlite backup gives a consistent copy without the source's WAL files
+        src, dst = sqlite3.connect(db_path), sqlite3.connect(os.path.join(scratch, "pi_control.db"))
+        src.backup(dst)
+        src.close()
+        dst.close()
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_crud", "--measure", scratch, "--repeat", str(repeat)],
+            env=dict(os.environ, PICONTROL_DB_DIR=scratch, PYTHONPATH=ROOT), cwd=ROOT,
+            check=True, capture_output=True, text=True,
+        ).stdout
+        return json.loads(out.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Print a table against the baseline; return the regressed (size, function) pairs."""
+    regressions = []
+    print(f"{'dataset':>9} {'function':<28} {'median':>10} {'p95':>10} {'baseline':>10} {'change':>8}")
+    for size, functions in results.items():
+        for name, stats in functions.items():
+            base = baseline.get(size, {}).get(name)
+            line = f"{size:>9} {name:<28} {stats['median_ms']:>8.3f}ms {stats['p95_ms']:>8.3f}ms"
+            if base:
+                change = (stats["median_ms"] / base["median_ms"] - 1) * 100 if base["median_ms"] else 0.0
+                flag = "  REGRESSION" if change > threshold else ""
+                if flag:
+                    regressions.append((size, name))
+                line += f" {base['median_ms']:>8.3f}ms {change:>+7.1f}%{flag}"
+            print(line)
+    return regressions
+
+
+def main():
+    args = parse_args()
+    if args.measure:
+        print(json.dumps(measure(args.repeat)))
+        return 0
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="picontrol-bench-data-")
+    try:
+        results = {size: run_size(ensure_dataset(data_dir, size), args.repeat) for size in args.sizes}
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.threshold)
+
+    record = {"machine": platform.node(), "python": platform.python_version(), "repeat": args.repeat, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(record, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(record, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+    elif regressions:
+        print(f"{len(regressions)} function(s) regressed more than {args.threshold:.0f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Measure the latency the cross-worker event bus adds to live events.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_event_bus --workers 4 --events 2000
+
+"local" delivers events on the publishing process's own loop (the single
+worker case). "unix" starts --workers receiver processes, each with a
+UnixSocketEventBus in a temp directory like separate uvicorn workers, and
+publishes from the parent. Latency is measured from next_sequence() to
+delivery with time.monotonic(), which is system-wide on Linux, so the unix
+figure includes the flock'd sequence counter.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark event bus latency")
+    p.add_argument("--workers", type=int, default=4, help="Receiver processes for the unix bus")
+    p.add_argument("--events", type=int, default=2000)
+    p.add_argument("--interval-ms", type=float, default=1.0, help="Delay between published events")
+    return p.parse_args()
+
+
+def summarize(name: str, latencies, expected: int):
+    latencies = sorted(latencies)
+    if not latencies:
+        print(f"{name:>6}: no events delivered")
+        return
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e6
+    print(f"{name:>6}: delivered {len(latencies)}/{expected}  mean {statistics.mean(latencies) * 1e6:.0f}us  "
+          f"p50 {p(0.5):.0f}us  p99 {p(0.99):.0f}us  max {latencies[-1] * 1e6:.0f}us")
+
+
+async def _collect(bus, count: int, timeout: float):
+    latencies = []
+    done = asyncio.Event()
+
+    def deliver(seq, text):
+        latencies.append(time.monotonic() - json.loads(text)["sent"])
+        if len(latencies) >= count:
+            done.set()
+
+    bus.start(asyncio.get_running_loop(), deliver)
+    try:
+        await asyncio.wait_for(done.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    bus.stop()
+    return latencies
+
+
+def _receiver(directory: str, count: int, ready, results):
+    from app.event_bus import UnixSocketEventBus
+
+    async def run():
+        task = asyncio.ensure_future(_collect(UnixSocketEventBus(directory), count, timeout=60))
+        await asyncio.sleep(0)
+        ready.set()
+        return await task
+
+    results.put(asyncio.run(run()))
+
+
+async def _publish(bus, events: int, interval: float):
+    for _ in range(events):
+        seq = bus.next_sequence()
+        bus.publish(seq, json.dumps({"type": "bench", "seq": seq, "sent": time.monotonic()}))
+        await asyncio.sleep(interval)
+
+
+def bench_local(args):
+    from app.event_bus import LocalEventBus
+
+    async def run():
+        bus = LocalEventBus()
+        collector = asyncio.ensure_future(_collect(bus, args.events, timeout=60))
+        await asyncio.sleep(0)
+        await _publish(bus, args.events, args.interval_ms / 1000.0)
+        return await collector
+
+    summarize("local", asyncio.run(run()), args.events)
+
+
+def bench_unix(args):
+    from app.event_bus import UnixSocketEventBus
+
+    directory = tempfile.mkdtemp(prefix="picontrol-bus-")
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    procs = []
+    for _ in range(args.workers):
+        ready = ctx.Event()
+        proc = ctx.Process(target=_receiver, args=(directory, args.events, ready, results))
+        proc.start()
+        ready.wait(10)
+        procs.append(proc)
+
+    async def run():
+        bus = UnixSocketEventBus(directory)
+        # The publisher is a worker too: it only sends, its own copies are ignored
+        bus.start(asyncio.get_running_loop(), lambda seq, text: None)
+        await _publish(bus, args.events, args.interval_ms / 1000.0)
+        bus.stop()
+
+    asyncio.run(run())
+    latencies = []
+    for _ in procs:
+        latencies.extend(results.get(timeout=120))
+    for proc in procs:
+        proc.join()
+    summarize("unix", latencies, args.events * args.workers)
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("PICONTROL_DB_DIR", tempfile.mkdtemp(prefix="picontrol-bench-"))
+    bench_local(args)
+    bench_unix(args)
+
+
+if __name__ == "__main__":
+    main()
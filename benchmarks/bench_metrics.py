@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Measure the cost of recording metrics and of rendering /metrics.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_metrics --iterations 200000
+
+Reports nanoseconds per Histogram.observe() and Counter.inc() (the work
+added to every tap stage, HTTP request and SQL statement) and the time to
+render a scrape with the app's metrics registered.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark metrics overhead")
+    p.add_argument("--iterations", type=int, default=200000)
+    return p.parse_args()
+
+
+def per_call(fn, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - t0) / iterations * 1e9
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("PICONTROL_DB_DIR", tempfile.mkdtemp(prefix="picontrol-bench-"))
+    import app.main  # noqa: F401  registers every metric and collector
+    from app import metrics
+    from app.rfid import TAP_LATENCY
+
+    baseline = per_call(lambda i: None, args.iterations)
+    observe = per_call(lambda i: TAP_LATENCY.observe((i % 1000) / 1e4, "commit"), args.iterations)
+    inc = per_call(lambda i: metrics.HTTP_REQUESTS.inc("GET", "/bench", 200), args.iterations)
+    print(f"histogram observe: {observe - baseline:.0f}ns/call")
+    print(f"counter inc:       {inc - baseline:.0f}ns/call")
+
+    t0 = time.perf_counter()
+    for _ in range(100):
+        text = metrics.render()
+    print(f"render: {(time.perf_counter() - t0) * 10:.2f}ms per scrape ({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Measure poll-to-detect latency of the RC522 backend at several poll intervals.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_rc522_poll --intervals 10 25 50 100 --taps 50
+
+No hardware needed: a simulated reader places a card at random moments and
+answers polls after --spi-ms (roughly what a request + anticollision costs
+over SPI on a Pi). Each run reports the true arrival-to-callback latency next
+to the bound RC522Reader.stats() computes, plus the share of wall time spent
+holding the reader.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark RC522 poll-to-detect latency")
+    p.add_argument("--intervals", type=float, nargs="+", default=[10, 25, 50, 100], help="Poll intervals in ms")
+    p.add_argument("--taps", type=int, default=50)
+    p.add_argument("--spi-ms", type=float, default=1.5, help="Simulated duration of one poll")
+    return p.parse_args()
+
+
+class SimulatedRC522:
+    def __init__(self, spi_seconds: float):
+        self.spi = spi_seconds
+        self.card = None  # (uid, time it was placed)
+
+    def read_id_no_block(self):
+        time.sleep(self.spi)
+        card = self.card
+        return card[0] if card else None
+
+    def write_no_block(self, text):
+        raise NotImplementedError
+
+
+def run(interval_ms: float, taps: int, spi_ms: float):
+    from app.rc522 import RC522Reader
+
+    hw = SimulatedRC522(spi_ms / 1000.0)
+    reader = RC522Reader(reader_factory=lambda: hw, poll_ms=interval_ms, release_ms=interval_ms * 2)
+    latencies = []
+    detected = threading.Event()
+
+    def on_tag(uid, ts):
+        latencies.append(time.monotonic() - hw.card[1])
+        detected.set()
+
+    reader.start(on_tag)
+    t0 = time.monotonic()
+    for uid in range(1, taps + 1):
+        time.sleep(random.uniform(0, interval_ms / 1000.0))
+        detected.clear()
+        hw.card = (uid, time.monotonic())
+        detected.wait(5)
+        hw.card = None
+        time.sleep(interval_ms * 3 / 1000.0)  # card removed long enough to release
+    elapsed = time.monotonic() - t0
+    reader.close()
+
+    stats = reader.stats()
+    busy = stats["avg_poll_ms"] * stats["polls"] / 1000.0 / elapsed
+    ms = sorted(l * 1000 for l in latencies)
+    print(f"poll {interval_ms:>5.0f}ms: detected {len(ms)}/{taps}  mean {statistics.mean(ms):.1f}ms  "
+          f"p95 {ms[int(0.95 * (len(ms) - 1))]:.1f}ms  max {ms[-1]:.1f}ms  "
+          f"(stats bound avg {stats['avg_detect_latency_ms']}ms)  reader busy {busy:.0%}")
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("PICONTROL_DB_DIR", tempfile.mkdtemp(prefix="picontrol-bench-"))
+    for interval in args.intervals:
+        run(interval, args.taps, args.spi_ms)
+
+
+if __name__ == "__main__":
+    main()
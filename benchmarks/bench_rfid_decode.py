@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark decoding of recorded evdev reader events, no hardware needed.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_rfid_decode --repeat 200
+
+Replays tests/fixtures/rfid_evdev_taps.txt through KeycodeDecoder and through
+an emulation of the previous path, which resolved each key event to a
+KEY_* name (as evdev.categorize does) and looked the name up in a string
+keymap.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from collections import namedtuple
+
+from app.rfid_decoder import KeycodeDecoder, read_recorded_events, KEYCODE_TABLE, EV_KEY, KEY_DOWN, KEY_ENTER
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "rfid_evdev_taps.txt")
+
+_KeyEvent = namedtuple("_KeyEvent", "keycode keystate key_down")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark RFID evdev decoding")
+    p.add_argument("--fixture", default=FIXTURE)
+    p.add_argument("--repeat", type=int, default=200, help="Times to replay the recording")
+    return p.parse_args()
+
+
+def decode_table(events):
+    decoder = KeycodeDecoder()
+    uids = 0
+    for _, type_, code, value in events:
+        if decoder.feed(type_, code, value):
+            uids += 1
+    return uids
+
+
+def decode_legacy(events, names, keymap):
+    buffer = []
+    uids = 0
+    for _, type_, code, value in events:
+        if type_ != EV_KEY:
+            continue
+        keyevent = _KeyEvent(names.get(code, "KEY_UNKNOWN"), value, KEY_DOWN)
+        if keyevent.keystate == keyevent.key_down:
+            ch = keymap.get(keyevent.keycode)
+            if ch is None:
+                continue
+            if ch == "\n":
+                if buffer:
+                    "".join(buffer).strip()
+                    buffer = []
+                    uids += 1
+            else:
+                buffer.append(ch)
+    return uids
+
+
+def legacy_tables():
+    names = {}
+    for code, chars in enumerate(KEYCODE_TABLE):
+        if chars is not None:
+            names[code] = "KEY_" + (chars[0].upper() if chars[0].isalnum() else f"C{code}")
+    names[KEY_ENTER] = "KEY_ENTER"
+    keymap = {name: ("\n" if name == "KEY_ENTER" else KEYCODE_TABLE[code][0]) for code, name in names.items()}
+    return names, keymap
+
+
+def run(name, fn, events, repeat):
+    t0 = time.perf_counter()
+    uids = 0
+    for _ in range(repeat):
+        uids += fn(events)
+    elapsed = time.perf_counter() - t0
+    total = len(events) * repeat
+    print(f"{name:>7}: {total / elapsed / 1e6:.2f}M events/s, {uids / elapsed:,.0f} taps/s ({elapsed:.2f}s)")
+
+
+def main():
+    args = parse_args()
+    events, expected = read_recorded_events(args.fixture)
+    print(f"fixture: {len(events)} events, {len(expected)} taps, replayed {args.repeat}x")
+    names, keymap = legacy_tables()
+    run("legacy", lambda ev: decode_legacy(ev, names, keymap), events, args.repeat)
+    run("table", decode_table, events, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Measure tap throughput of RFIDService with several readers on one loop.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_rfid_readers --readers 1 2 4 --repeat 50
+
+Each "reader" is a FIFO in a temp directory fed with the recorded events from
+tests/fixtures/rfid_evdev_taps.txt, packed as struct input_event like a real
+/dev/input/eventN. The service is configured with a glob over the FIFOs and
+reads them through a minimal InputDevice stand-in (python-evdev's own
+InputDevice needs a real input device). Decoded taps are counted instead of
+written to the database, so the figure is the read/decode/dispatch path.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import struct
+import tempfile
+import threading
+import time
+import types
+
+from app.rfid_decoder import read_recorded_events
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "rfid_evdev_taps.txt")
+_EVENT = struct.Struct("llHHi")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark multi-reader RFID throughput")
+    p.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--repeat", type=int, default=50, help="Times each reader replays the recording")
+    return p.parse_args()
+
+
+class _Event:
+    __slots__ = ("sec", "usec", "type", "code", "value")
+
+    def __init__(self, sec, usec, type_, code, value):
+        self.sec, self.usec, self.type, self.code, self.value = sec, usec, type_, code, value
+
+    def timestamp(self):
+        return self.sec + self.usec / 1e6
+
+
+class FifoInputDevice:
+    """Reads struct input_event records from a FIFO like evdev.InputDevice.read()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self._partial = b""
+
+    def read(self):
+        data = os.read(self.fd, _EVENT.size * 512)
+        if not data:
+            raise BlockingIOError()
+        data = self._partial + data
+        usable = len(data) - len(data) % _EVENT.size
+        self._partial = data[usable:]
+        for record in _EVENT.iter_unpack(data[:usable]):
+            yield _Event(*record)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def pack_events(events):
+    return b"".join(_EVENT.pack(int(ts), int((ts % 1) * 1e6), t, c, v) for ts, t, c, v in events)
+
+
+def run(readers: int, payload: bytes, taps_per_reader: int, repeat: int):
+    from app.rfid import RFIDService
+
+    directory = tempfile.mkdtemp(prefix="picontrol-readers-")
+    paths = [os.path.join(directory, f"reader-{i}") for i in range(readers)]
+    for path in paths:
+        os.mkfifo(path)
+
+    expected = readers * taps_per_reader * repeat
+    done = threading.Event()
+    count = [0]
+
+    async def main():
+        service = RFIDService(mode="evdev", device=os.path.join(directory, "reader-*"), debounce_ms=0)
+        service.evdev = types.SimpleNamespace(InputDevice=FifoInputDevice, list_devices=lambda: [])
+        service._use_evdev = True
+
+        def process_tag(uid, ts=None, reader_id=None):
+            count[0] += 1
+            if count[0] >= expected:
+                done.set()
+
+        service._process_tag = process_tag
+        service.start()
+        await asyncio.sleep(0.05)  # let the first scan open the FIFOs
+
+        def feed(path):
+            fd = os.open(path, os.O_WRONLY)
+            for _ in range(repeat):
+                os.write(fd, payload)
+            os.close(fd)
+
+        writers = [threading.Thread(target=feed, args=(p,)) for p in paths]
+        t0 = time.perf_counter()
+        for w in writers:
+            w.start()
+        while not done.is_set() and time.perf_counter() - t0 < 60:
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - t0
+        service.stop()
+        for w in writers:
+            w.join()
+        return elapsed
+
+    elapsed = asyncio.run(main())
+    print(f"{readers} reader(s): {count[0]}/{expected} taps in {elapsed:.2f}s -> {count[0] / elapsed:,.0f} taps/s")
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("PICONTROL_DB_DIR", tempfile.mkdtemp(prefix="picontrol-bench-"))
+    events, uids = read_recorded_events(FIXTURE)
+    payload = pack_events(events)
+    for readers in args.readers:
+        run(readers, payload, len(uids), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
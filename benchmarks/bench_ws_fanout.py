@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Measure WebSocket broadcast latency with a few hundred simulated clients.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_ws_fanout --clients 300 --slow 10 --events 100
+
+Each simulated client's send_text sleeps for a per-client delay (fast clients
+a few ms, "slow" tablets far longer) and records when every event arrived.
+Events are pushed through the real broadcaster; the report is the latency from
+push_event to delivery on the fast clients, plus how many slow clients were
+sent a resync marker or disconnected.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark WebSocket event fan-out")
+    p.add_argument("--clients", type=int, default=300, help="Simulated fast clients")
+    p.add_argument("--slow", type=int, default=10, help="Additional slow clients")
+    p.add_argument("--events", type=int, default=100)
+    p.add_argument("--interval-ms", type=float, default=20.0, help="Delay between pushed events")
+    p.add_argument("--fast-ms", type=float, default=2.0, help="Max send delay of a fast client")
+    p.add_argument("--slow-ms", type=float, default=500.0, help="Send delay of a slow client")
+    return p.parse_args()
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.latencies = []
+        self.resyncs = 0
+        self.closed = False
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+        ev = json.loads(text)
+        if ev["type"] == "resync":
+            self.resyncs += 1
+        else:
+            self.latencies.append(time.perf_counter() - ev["sent"])
+
+    async def close(self):
+        self.closed = True
+
+
+async def run(args):
+    from app import rfid
+
+    rfid.start_broadcaster()
+    fast = [FakeWebSocket(random.uniform(0, args.fast_ms) / 1000.0) for _ in range(args.clients)]
+    slow = [FakeWebSocket(args.slow_ms / 1000.0) for _ in range(args.slow)]
+    for ws in fast + slow:
+        rfid.register_websocket(ws)
+
+    t0 = time.perf_counter()
+    for i in range(args.events):
+        rfid.push_event({"type": "checkin", "seq": i, "sent": time.perf_counter()})
+        await asyncio.sleep(args.interval_ms / 1000.0)
+
+    # Wait for the fast clients to drain
+    deadline = time.perf_counter() + 10
+    while time.perf_counter() < deadline and any(len(ws.latencies) < args.events for ws in fast):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - t0
+    rfid.stop_service()
+
+    latencies = sorted(lat for ws in fast for lat in ws.latencies)
+    delivered = len(latencies)
+    print(f"clients: {args.clients} fast + {args.slow} slow, events: {args.events}, elapsed {elapsed:.2f}s")
+    print(f"delivered to fast clients: {delivered}/{args.clients * args.events}")
+    if latencies:
+        p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+        print(f"latency ms: mean {statistics.mean(latencies) * 1000:.2f}  p50 {p(0.5):.2f}  p99 {p(0.99):.2f}  max {latencies[-1] * 1000:.2f}")
+    print(f"slow clients: {sum(1 for ws in slow if ws.resyncs)} got resync, {sum(1 for ws in slow if ws.closed)} disconnected")
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,30 @@
 Reads `rfid_uid` per line, sends a POST to the API `/checkins/` and shows the message
 returned (employee name and welcome/goodbye message). Implements
 retries in case of connection failure.
+
+With --bench it becomes a load generator for shift changes instead:
+
+    python simulador.py --bench --employees 200 --taps 2000 --rate 50 \
+        --profile burst --concurrency 32 --ws-listeners 5 --output run.json
+
+It seeds --employees employees (BENCH-<n>, UID bench-<n>; existing ones are
+reused), then fires --taps POSTs to /checkins/ from async httpx clients.
+Arrivals follow a Poisson process at --rate taps/s, or with --profile burst
+arrive --burst-size at a time with the gaps needed for the same mean rate.
+Taps are scheduled open-loop: latency counts from the scheduled arrival, so
+time spent waiting for one of --concurrency connections is included.
+Optional /ws/rfid listeners time each check-in from its POST to its event
+(needs the websockets package). The summary (throughput, errors, p50/p95/p99)
+is printed as JSON and written to --output.
 """
 from __future__ import annotations
 
+import argparse
+import asyncio
+import json
+import random
 import time
-import sys
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
@@ -43,11 +62,169 @@ def send_checkin(rfid: str, api_url: str = API_URL, retries: int = 3, timeout: f
     return None
 
 
+def percentiles(values) -> dict:
+    """p50/p95/p99/mean/max of latencies in seconds, reported in milliseconds."""
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+    pick = lambda q: round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+    return {
+        "count": len(values),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "mean": round(sum(values) / len(values) * 1000, 2),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+def arrival_offsets(taps: int, rate: float, profile: str, burst_size: int, seed: Optional[int] = None):
+    """Seconds from the start at which each tap arrives."""
+    rng = random.Random(seed)
+    offsets, t = [], 0.0
+    if profile == "burst":
+        # burst_size taps at once, spaced so the mean rate is still `rate`
+        gap = burst_size / rate
+        for i in range(taps):
+            if i and i % burst_size == 0:
+                t += gap
+            offsets.append(t)
+        return offsets
+    for _ in range(taps):
+        t += rng.expovariate(rate)
+        offsets.append(t)
+    return offsets
+
+
+async def seed_employees(client: httpx.AsyncClient, base_url: str, count: int):
+    """Create the BENCH-<n> employees; already existing ones are fine."""
+    uids = []
+    for i in range(count):
+        uid = f"bench-{i}"
+        resp = await client.post(f"{base_url}/employees/", json={"document_id": f"BENCH-{i}", "name": f"Bench {i}", "rfid_uid": uid})
+        if resp.status_code >= 500:
+            raise RuntimeError(f"Seeding failed ({resp.status_code}): {resp.text}")
+        uids.append(uid)
+    return uids
+
+
+async def _listen(ws_url: str, received: dict, ready: asyncio.Event, stop: asyncio.Event):
+    import websockets  # optional: only needed for --ws-listeners
+
+    async with websockets.connect(ws_url, max_queue=None) as ws:
+        ready.set()
+        while not stop.is_set():
+            try:
+                text = await asyncio.wait_for(ws.recv(), timeout=0.2)
+            except asyncio.TimeoutError:
+                continue
+            event = json.loads(text)
+            if event.get("type") == "checkin" and event.get("checkin_id") is not None:
+                received[event["checkin_id"]] = time.perf_counter()
+
+
+async def run_bench(args) -> dict:
+    base_url = args.api_url.rstrip("/")
+    if base_url.endswith("/checkins"):
+        base_url = base_url[: -len("/checkins")]
+    ws_url = base_url.replace("http", "ws", 1) + "/ws/rfid"
+    started_at = datetime.now(timezone.utc).isoformat()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        uids = await seed_employees(client, base_url, args.employees)
+
+        listeners, stop = [], asyncio.Event()
+        received = [dict() for _ in range(args.ws_listeners)]
+        for i in range(args.ws_listeners):
+            ready = asyncio.Event()
+            listeners.append(asyncio.create_task(_listen(ws_url, received[i], ready, stop)))
+            await asyncio.wait_for(ready.wait(), timeout=10)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies, errors, sent_at = [], {}, {}
+        offsets = arrival_offsets(args.taps, args.rate, args.profile, args.burst_size, args.seed)
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+
+        async def tap(offset: float, uid: str):
+            await asyncio.sleep(max(0.0, started + offset - time.perf_counter()))
+            scheduled = started + offset
+            async with semaphore:
+                try:
+                    resp = await client.post(f"{base_url}/checkins/", json={"rfid_uid": uid})
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                    return
+            if resp.status_code != 200:
+                errors[str(resp.status_code)] = errors.get(str(resp.status_code), 0) + 1
+                return
+            latencies.append(time.perf_counter() - scheduled)
+            sent_at[resp.json()["id"]] = scheduled
+
+        await asyncio.gather(*(tap(offset, rng.choice(uids)) for offset in offsets))
+        elapsed = time.perf_counter() - started
+
+        # Give the last events time to reach the listeners
+        if listeners:
+            deadline = time.perf_counter() + args.ws_grace
+            while time.perf_counter() < deadline and any(len(r) < len(sent_at) for r in received):
+                await asyncio.sleep(0.05)
+            stop.set()
+            await asyncio.gather(*listeners, return_exceptions=True)
+
+    ws_latencies = [r[cid] - sent for r in received for cid, sent in sent_at.items() if cid in r]
+    expected = len(sent_at) * args.ws_listeners
+    return {
+        "started_at": started_at,
+        "config": {k: getattr(args, k) for k in ("api_url", "employees", "taps", "rate", "profile", "burst_size", "concurrency", "ws_listeners", "seed")},
+        "duration_s": round(elapsed, 3),
+        "taps": {
+            "sent": args.taps,
+            "ok": len(latencies),
+            "errors": errors,
+            "error_rate": round(1 - len(latencies) / args.taps, 4) if args.taps else 0.0,
+            "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": percentiles(latencies),
+        },
+        "websocket": {
+            "listeners": args.ws_listeners,
+            "expected": expected,
+            "delivered": len(ws_latencies),
+            "missing": expected - len(ws_latencies),
+            "latency_ms": percentiles(ws_latencies),
+        },
+    }
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="RFID reader simulator and check-in load generator")
+    p.add_argument("api_url", nargs="?", default=API_URL)
+    p.add_argument("--bench", action="store_true", help="Run the load generator instead of the interactive simulator")
+    p.add_argument("--employees", type=int, default=100, help="Employees to seed and tap as")
+    p.add_argument("--taps", type=int, default=1000)
+    p.add_argument("--rate", type=float, default=50.0, help="Mean arrivals per second")
+    p.add_argument("--profile", choices=("poisson", "burst"), default="poisson")
+    p.add_argument("--burst-size", type=int, default=50, help="Taps per burst with --profile burst")
+    p.add_argument("--concurrency", type=int, default=16, help="Max requests in flight")
+    p.add_argument("--ws-listeners", type=int, default=0, help="/ws/rfid connections to time event delivery on")
+    p.add_argument("--ws-grace", type=float, default=5.0, help="Seconds to wait for late WebSocket events")
+    p.add_argument("--timeout", type=float, default=30.0)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--output", help="Also write the JSON summary to this file")
+    return p.parse_args(argv)
+
+
 def main():
-    api_url = API_URL
-    # allow passing URL as argument
-    if len(sys.argv) > 1:
-        api_url = sys.argv[1]
+    args = parse_args()
+    api_url = args.api_url
+    if args.bench:
+        result = asyncio.run(run_bench(args))
+        text = json.dumps(result, indent=2)
+        print(text)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+        return
     print("RFID Simulator - type 'exit' to quit. Using API:", api_url)
     while True:
         try:
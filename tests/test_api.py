@@ -1,5 +1,13 @@
+import uuid
+from datetime import datetime
+
 from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.crud import work_sessions
+from app.db import get_engine
 from app.main import app
+from app.models import CheckIn
 
 
 client = TestClient(app)
@@ -28,7 +36,8 @@ def test_create_employee_and_checkin():
     r3 = client.get("/checkins/")
     assert r3.status_code == 200
     lista = r3.json()
-    assert isinstance(lista, list)
+    assert isinstance(lista["items"], list)
+    assert "next_cursor" in lista
 
 
 def test_hours_worked_basic():
@@ -49,3 +58,63 @@ def test_hours_worked_basic():
     rep = r3.json()
     assert rep["employee_id"] == emp["document_id"]
     assert isinstance(rep["total_hours"], float)
+
+
+def test_list_checkins_keyset_pagination():
+    # The test database persists between runs: use an employee unique to this run
+    suffix = uuid.uuid4().hex[:8].upper()
+    r = client.post("/employees/", json={"document_id": f"P{suffix}", "name": "Pager", "rfid_uid": f"rfid-pager-{suffix}"})
+    assert r.status_code == 200
+    for _ in range(5):
+        assert client.post("/checkins/", json={"rfid_uid": f"rfid-pager-{suffix}"}).status_code == 200
+
+    seen = []
+    params = {"employee_id": f"P{suffix}", "limit": 2}
+    while True:
+        page = client.get("/checkins/", params=params).json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        if not page["next_cursor"]:
+            break
+        params.update(page["next_cursor"])
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+    # A malformed (hand-edited) cursor is the client's error
+    r = client.get("/checkins/", params={"before_id": 1, "before_ts": "not-a-time"})
+    assert r.status_code == 400
+
+
+def test_hours_report_clips_sessions_straddling_the_range():
+    suffix = uuid.uuid4().hex[:8].upper()
+    night, late = f"{suffix}D", f"{suffix}E"
+    assert client.post("/employees/", json={"document_id": night, "name": "Night", "rfid_uid": f"rfid-night-{suffix}"}).status_code == 200
+    taps = [("entry", "2024-01-31T22:00:00"), ("exit", "2024-02-01T06:00:00"),
+            ("entry", "2024-02-01T08:00:00"), ("entry", "2024-02-01T09:00:00"), ("exit", "2024-02-01T12:00:00"),
+            ("exit", "2024-02-01T13:00:00"), ("entry", "2024-02-29T20:00:00"), ("exit", "2024-03-01T04:00:00")]
+    with Session(get_engine()) as session:
+        for type_, ts in taps:
+            session.add(CheckIn(employee_id=night, type=type_, timestamp=datetime.fromisoformat(ts)))
+        session.commit()
+
+    feb = client.get(f"/reports/hours/{night}", params={"start": "2024-02-01T00:00:00", "end": "2024-03-01T00:00:00"}).json()
+    assert [(p["entry"], p["exit"]) for p in feb["periods"]] == [
+        ("2024-02-01T00:00:00", "2024-02-01T06:00:00"),
+        ("2024-02-01T09:00:00", "2024-02-01T12:00:00"),
+        ("2024-02-29T20:00:00", "2024-03-01T00:00:00"),
+    ]
+    assert abs(feb["total_hours"] - 13) < 1e-6
+    jan = client.get(f"/reports/hours/{night}", params={"start": "2024-01-01T00:00:00", "end": "2024-02-01T00:00:00"}).json()
+    whole = client.get(f"/reports/hours/{night}").json()
+    assert abs(jan["total_hours"] - 2) < 1e-6
+    assert abs(whole["total_hours"] - 2 - 13 - 4) < 1e-6
+
+    # Same sessions when all employees are paired in one statement, each with its own boundary rows
+    assert client.post("/employees/", json={"document_id": late, "name": "Late", "rfid_uid": f"rfid-late-{suffix}"}).status_code == 200
+    with Session(get_engine()) as session:
+        session.add(CheckIn(employee_id=late, type="entry", timestamp=datetime(2024, 1, 31, 23)))
+        session.add(CheckIn(employee_id=late, type="exit", timestamp=datetime(2024, 2, 1, 7)))
+        session.commit()
+        rows = [r for r in work_sessions(session, start=datetime(2024, 2, 1), end=datetime(2024, 3, 1)) if r[0] in (night, late)]
+    expected = [(night, p["entry"], p["exit"]) for p in feb["periods"]] + [(late, "2024-02-01T00:00:00", "2024-02-01T07:00:00")]
+    assert [(r.employee_id, r.entry_ts.isoformat(), r.exit_ts.isoformat()) for r in rows] == expected
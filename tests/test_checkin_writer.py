@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.checkin_writer import CheckinWriter
+
+
+client = TestClient(app)
+
+
+def test_writer_batches_taps_and_resolves_each_future():
+    r = client.post("/employees/", json={"document_id": "W001", "name": "Writer", "rfid_uid": "rfid-writer"})
+    assert r.status_code == 200
+
+    writer = CheckinWriter(window_ms=50)
+    try:
+        futures = [writer.submit_rfid("rfid-writer") for _ in range(4)]
+        futures.append(writer.submit_rfid("rfid-does-not-exist"))
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        writer.stop()
+
+    assert results[-1] is None
+    checkins = [checkin for checkin, employee, message in results[:-1]]
+    assert len({c.id for c in checkins}) == 4
+    types = [c.type for c in checkins]
+    assert types[0::2] == [types[0]] * 2
+    assert types[1::2] == [types[1]] * 2
+    assert types[0] != types[1]
+    assert writer.batches < 4
@@ -0,0 +1,74 @@
+import uuid
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.main import app
+from app.db import get_engine
+from app.crud import split_by_local_day, list_daily_summaries, rebuild_daily_summaries, backfill_daily_summaries
+from app.models import CheckIn, DailyWorkSummary
+
+
+client = TestClient(app)
+
+
+def test_split_by_local_day_crosses_local_midnight():
+    tz = ZoneInfo("Europe/Madrid")
+    # 21:00 UTC = 23:00 local (CEST); exit at 02:00 UTC = 04:00 local next day
+    start = datetime(2025, 6, 1, 21, 0, tzinfo=timezone.utc)
+    end = datetime(2025, 6, 2, 2, 0, tzinfo=timezone.utc)
+    assert split_by_local_day(start, end, tz) == [(date(2025, 6, 1), 3600.0), (date(2025, 6, 2), 4 * 3600.0)]
+
+
+def test_split_by_local_day_handles_dst_change():
+    tz = ZoneInfo("Europe/Madrid")
+    # Night of the spring-forward change: local day 2025-03-30 has 23 hours
+    start = datetime(2025, 3, 29, 23, 0, tzinfo=timezone.utc)
+    end = datetime(2025, 3, 31, 0, 0, tzinfo=timezone.utc)
+    segments = split_by_local_day(start, end, tz)
+    assert [d for d, _ in segments] == [date(2025, 3, 30), date(2025, 3, 31)]
+    assert segments[0][1] == 23 * 3600.0
+    assert sum(s for _, s in segments) == 25 * 3600.0
+
+
+def test_summaries_follow_checkins_and_rebuild():
+    client.post("/employees/", json={"document_id": "S001", "name": "Summary", "rfid_uid": "rfid-summary"})
+    client.post("/checkins/", json={"rfid_uid": "rfid-summary"})
+    client.post("/checkins/", json={"rfid_uid": "rfid-summary"})
+
+    with Session(get_engine()) as session:
+        maintained = {(s.day, round(s.worked_seconds, 6), s.open_session) for s in list_daily_summaries(session, "S001")}
+        assert maintained
+        rebuild_daily_summaries(session, batch_size=1)
+        rebuilt = {(s.day, round(s.worked_seconds, 6), s.open_session) for s in list_daily_summaries(session, "S001")}
+        assert rebuilt == maintained
+
+        # A database with check-ins but no summaries gets them computed once
+        session.exec(delete(DailyWorkSummary))
+        session.commit()
+        assert backfill_daily_summaries(session) > 0
+        backfilled = {(s.day, round(s.worked_seconds, 6), s.open_session) for s in list_daily_summaries(session, "S001")}
+        assert backfill_daily_summaries(session) == 0
+    assert backfilled == maintained
+
+
+def test_admin_hours_report_counts_whole_days():
+    client.post("/admin/setup", data={"username": "admin", "password": "12345678"})
+    client.post("/admin/login", data={"username": "admin", "password": "12345678"})
+    employee_id = f"S{uuid.uuid4().hex[:8].upper()}"
+    client.post("/employees/", json={"document_id": employee_id, "name": "Days"})
+    taps = [("entry", datetime(2024, 3, 1, 8)), ("exit", datetime(2024, 3, 1, 12)),
+            ("entry", datetime(2024, 3, 2, 8)), ("exit", datetime(2024, 3, 2, 10))]
+    with Session(get_engine()) as session:
+        for type_, ts in taps:
+            session.add(CheckIn(employee_id=employee_id, type=type_, timestamp=ts))
+        session.commit()
+        rebuild_daily_summaries(session)
+
+    r = client.get("/admin/reports/horas", params={"employee_id": employee_id, "start": "2024-03-02", "end": "2024-03-02"})
+    assert r.status_code == 200
+    assert "2024-03-01" not in r.text
+    assert "<th>Total</th><th>2,00</th>" in r.text
@@ -0,0 +1,27 @@
+import asyncio
+
+from app.event_bus import UnixSocketEventBus
+
+
+def test_unix_bus_delivers_to_every_worker(tmp_path):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        received = {"a": [], "b": []}
+        a = UnixSocketEventBus(str(tmp_path), name="a")
+        b = UnixSocketEventBus(str(tmp_path), name="b")
+        a.start(loop, lambda seq, text: received["a"].append((seq, text)))
+        b.start(loop, lambda seq, text: received["b"].append((seq, text)))
+        try:
+            # Sequence numbers are shared by every worker using the directory
+            first, second = a.next_sequence(), b.next_sequence()
+            a.publish(first, '{"type": "checkin"}')
+            await asyncio.sleep(0.05)
+        finally:
+            a.stop()
+            b.stop()
+        return first, second, received
+
+    first, second, received = asyncio.run(scenario())
+    assert second == first + 1
+    assert received["a"] == [(first, '{"type": "checkin"}')]
+    assert received["b"] == [(first, '{"type": "checkin"}')]
@@ -0,0 +1,77 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db import get_engine
+from app.main import app
+from app.models import CheckIn
+
+
+client = TestClient(app)
+
+
+def _login():
+    client.post("/admin/setup", data={"username": "admin", "password": "12345678"})
+    client.post("/admin/login", data={"username": "admin", "password": "12345678"})
+
+
+def test_export_requires_login():
+    client.get("/admin/logout")
+    r = client.get("/export/checkins")
+    assert r.status_code == 401
+
+
+def test_export_checkins_and_hours():
+    _login()
+    client.post("/employees/", json={"document_id": "E001", "name": "Exporter", "rfid_uid": "rfid-export"})
+    client.post("/checkins/", json={"rfid_uid": "rfid-export"})
+    client.post("/checkins/", json={"rfid_uid": "rfid-export"})
+
+    r = client.get("/export/checkins", params={"employee_id": "E001"})
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) >= 2
+    assert {row["employee_id"] for row in rows} == {"E001"}
+
+    r = client.get("/export/hours", params={"employee_id": "E001", "format": "ndjson", "compress": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(r.content).decode().splitlines()
+    periods = [json.loads(line) for line in lines]
+    assert periods and all(p["employee_id"] == "E001" for p in periods)
+    assert all(p["hours"] >= 0 for p in periods)
+
+
+def test_export_payroll_splits_days_and_counts_overtime():
+    pytest.importorskip("numpy")
+    _login()
+    # The test database persists between runs: use an employee unique to this run
+    suffix = uuid.uuid4().hex[:8].upper()
+    employee_id = f"E{suffix}"
+    client.post("/employees/", json={"document_id": employee_id, "name": "Payroll", "rfid_uid": f"rfid-payroll-{suffix}"})
+    taps = [("entry", "2024-05-01T22:00"), ("exit", "2024-05-02T08:00"), ("entry", "2024-05-02T12:00"), ("exit", "2024-05-02T16:00"),
+            ("entry", "2024-05-03T09:00"), ("entry", "2024-05-03T10:00"), ("exit", "2024-05-03T11:00")]
+    with Session(get_engine()) as session:
+        for type_, ts in taps:
+            session.add(CheckIn(employee_id=employee_id, type=type_, timestamp=datetime.fromisoformat(ts)))
+        session.commit()
+
+    r = client.get("/export/payroll", params={"start": "2024-05-01", "end": "2024-05-03", "employee_id": employee_id, "format": "json"})
+    assert r.status_code == 200
+    report = r.json()
+    assert report["days"] == ["2024-05-01", "2024-05-02", "2024-05-03"]
+    [row] = report["employees"]
+    assert row["hours_per_day"] == [2.0, 12.0, 1.0]
+    assert (row["total_hours"], row["overtime_hours"], row["unmatched_entries"]) == (15.0, 4.0, 1)
+
+    r = client.get("/export/payroll", params={"start": "2024-05-02", "end": "2024-05-02", "employee_id": employee_id})
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert rows[0]["2024-05-02"] == "12.0"
+    assert client.get("/export/payroll", params={"start": "2024-05-03", "end": "2024-05-01"}).status_code == 400
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app import rfid
+
+
+client = TestClient(app)
+
+
+def test_metrics_report_tap_stages_and_http_routes():
+    client.post("/employees/", json={"document_id": "M001", "name": "Metrics", "rfid_uid": "rfid-metrics"})
+    client.get("/checkins/employee/M001")
+    rfid.RFIDService(mode="mock", debounce_ms=0).inject_tag("rfid-metrics")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    for stage in ("dispatch", "commit", "publish"):
+        assert f'picontrol_tap_latency_seconds_count{{stage="{stage}"}}' in body
+    # Labelled by route template, not by the raw path
+    assert 'picontrol_http_requests_total{method="GET",route="/checkins/employee/{employee_id}",status="200"}' in body
+    assert 'picontrol_db_query_duration_seconds_count{engine="writer"}' in body
+    assert "picontrol_ws_clients 0" in body
+    assert "picontrol_checkin_queue_depth" in body
+
+
+def test_server_timing_counts_request_queries():
+    resp = client.get("/checkins/employee/M001")
+    timing = resp.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    queries = int(timing.split('desc="')[1].split()[0])
+    assert queries >= 1
+
+
+def test_slow_queries_are_logged_with_plan(monkeypatch, caplog):
+    from app.config import config
+
+    monkeypatch.setattr(config, "DB_SLOW_QUERY_MS", 0.000001)
+    with caplog.at_level("WARNING", logger="picontrol.db"):
+        client.get("/checkins/employee/M001")
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert slow
+    assert any("SEARCH" in message or "SCAN" in message for message in slow)
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.main import app
+from app.db import get_engine, init_db
+from app.crud import rebuild_presence
+from app.models import EmployeePresence
+
+
+client = TestClient(app)
+
+
+def test_presence_toggles_with_checkins():
+    r = client.post("/employees/", json={"document_id": "P001", "name": "Presence", "rfid_uid": "rfid-presence"})
+    assert r.status_code == 200
+
+    first = client.post("/checkins/", json={"rfid_uid": "rfid-presence"}).json()
+    second = client.post("/checkins/", json={"rfid_uid": "rfid-presence"}).json()
+    assert {first["type"], second["type"]} == {"entry", "exit"}
+
+    with Session(get_engine()) as session:
+        presence = session.get(EmployeePresence, "P001")
+        assert presence.last_checkin_id == second["id"]
+        assert presence.last_type == second["type"]
+
+
+def test_rebuild_presence_matches_maintained_state():
+    client.post("/employees/", json={"document_id": "P002", "name": "Rebuild", "rfid_uid": "rfid-rebuild"})
+    last = client.post("/checkins/", json={"rfid_uid": "rfid-rebuild"}).json()
+
+    with Session(get_engine()) as session:
+        assert rebuild_presence(session) >= 1
+        presence = session.get(EmployeePresence, "P002")
+        assert presence.last_checkin_id == last["id"]
+        assert presence.last_type == last["type"]
+
+
+def test_init_db_backfills_empty_presence():
+    client.post("/employees/", json={"document_id": "P003", "name": "Upgraded", "rfid_uid": "rfid-upgraded"})
+    last = client.post("/checkins/", json={"rfid_uid": "rfid-upgraded"}).json()
+    with Session(get_engine()) as session:
+        session.exec(delete(EmployeePresence))
+        session.commit()
+
+    # What startup (and a DB import) does for a database without presence rows
+    init_db()
+    with Session(get_engine()) as session:
+        presence = session.get(EmployeePresence, "P003")
+        assert presence.last_checkin_id == last["id"]
@@ -0,0 +1,74 @@
+import pytest
+
+from app import rfid
+from app.rc522 import RC522Reader
+
+
+class ScriptedReader:
+    """Answers polls from a script: a UID while a card is on the reader, else None."""
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.written = []
+
+    def read_id_no_block(self):
+        return self.script.pop(0) if self.script else None
+
+    def write_no_block(self, text):
+        self.written.append(text)
+        return 0xBEEF, text
+
+
+def test_card_resting_on_reader_taps_once_until_removed():
+    # The card is missed on some polls while it rests on the reader
+    hw = ScriptedReader([None, 42, None, 42, 42, None])
+    reader = RC522Reader(reader_factory=lambda: hw, poll_ms=0, release_ms=60000)
+    taps = [reader.poll() for _ in range(6)]
+    assert taps == [None, "42", None, None, None, None]
+
+    reader.release = 0
+    hw.script = [None, 42]
+    assert [reader.poll(), reader.poll()] == [None, "42"]
+
+    stats = reader.stats()
+    assert stats["polls"] == 8
+    assert stats["detections"] == 2
+    assert stats["max_detect_latency_ms"] >= stats["avg_detect_latency_ms"] >= 0
+
+
+def test_written_card_is_not_also_a_tap():
+    hw = ScriptedReader()
+    reader = RC522Reader(reader_factory=lambda: hw, poll_ms=0, release_ms=60000)
+    assert reader.write("E001", timeout=1) == (0xBEEF, "E001")
+    hw.script = [0xBEEF]
+    assert reader.poll() is None
+    assert hw.written == ["E001"]
+
+
+def test_write_does_not_open_a_reader_another_worker_polls(monkeypatch, tmp_path):
+    path = str(tmp_path / "reader.lock")
+    leader = rfid.LeaderLock(path)
+    assert leader.try_acquire()
+    standby = rfid.LeaderLock(path)
+    assert not standby.try_acquire()
+    monkeypatch.setattr(rfid, "_service", None)
+    monkeypatch.setattr(rfid, "_leader_lock", standby)
+    try:
+        with pytest.raises(rfid.RC522Busy):
+            rfid.write_rc522_tag("E001", timeout=1)
+    finally:
+        leader.release()
+
+
+def test_write_on_the_leader_reports_why_its_reader_failed(monkeypatch, tmp_path):
+    leader = rfid.LeaderLock(str(tmp_path / "reader.lock"))
+    assert leader.try_acquire()
+    service = rfid.RFIDService(mode="mock")
+    service._rc522_error = "no SPI device"
+    monkeypatch.setattr(rfid, "_service", service)
+    monkeypatch.setattr(rfid, "_leader_lock", leader)
+    try:
+        with pytest.raises(rfid.RC522Unavailable, match="no SPI device"):
+            rfid.write_rc522_tag("E001", timeout=1)
+    finally:
+        leader.release()
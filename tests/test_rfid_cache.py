@@ -0,0 +1,41 @@
+import sqlite3
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.main import app
+from app.db import get_engine, DB_PATH
+from app.crud import lookup_employee_by_rfid
+from app import rfid_cache
+
+
+client = TestClient(app)
+
+
+def test_reassigning_rfid_invalidates_cache():
+    client.post("/employees/", json={"document_id": "C001", "name": "First", "rfid_uid": "rfid-cache"})
+    client.post("/employees/", json={"document_id": "C002", "name": "Second"})
+    first = client.post("/checkins/", json={"rfid_uid": "rfid-cache"}).json()
+    assert first["employee_id"] == "C001"
+
+    r = client.put("/employees/C002/rfid", json={"rfid_uid": "rfid-cache"})
+    assert r.status_code == 200
+    second = client.post("/checkins/", json={"rfid_uid": "rfid-cache"}).json()
+    assert second["employee_id"] == "C002"
+
+
+def test_change_from_other_connection_is_detected():
+    client.post("/employees/", json={"document_id": "C003", "name": "External", "rfid_uid": "rfid-ext"})
+    cache = rfid_cache.get_cache()
+    with Session(get_engine()) as session:
+        assert lookup_employee_by_rfid(session, "rfid-ext").document_id == "C003"
+        hits = cache.hits
+
+        # Simulates another worker or tool writing to the same file
+        other = sqlite3.connect(DB_PATH)
+        other.execute("UPDATE employee SET rfid_uid = NULL WHERE document_id = 'C003'")
+        other.commit()
+        other.close()
+
+        assert lookup_employee_by_rfid(session, "rfid-ext") is None
+        assert cache.hits == hits
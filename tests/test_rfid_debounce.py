@@ -0,0 +1,23 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app import rfid
+
+
+client = TestClient(app)
+
+
+def test_repeated_reads_within_window_count_once():
+    client.post("/employees/", json={"document_id": "D001", "name": "Debounce", "rfid_uid": "rfid-held"})
+    before = len(client.get("/checkins/employee/D001").json())
+
+    service = rfid.RFIDService(mode="mock", debounce_ms=60000)
+    for _ in range(5):
+        service.inject_tag("rfid-held")
+
+    assert len(client.get("/checkins/employee/D001").json()) == before + 1
+    assert service.duplicates == 4
+
+    service.debounce = 0
+    service.inject_tag("rfid-held")
+    assert len(client.get("/checkins/employee/D001").json()) == before + 2
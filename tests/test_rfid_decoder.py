@@ -0,0 +1,20 @@
+import os
+
+from app.rfid_decoder import KeycodeDecoder, read_recorded_events, EV_KEY, KEY_DOWN, KEY_UP, KEY_LEFTSHIFT, KEY_ENTER
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "rfid_evdev_taps.txt")
+
+
+def test_recorded_reader_events_decode_to_uids():
+    events, expected = read_recorded_events(FIXTURE)
+    decoder = KeycodeDecoder()
+    uids = [uid for _, type_, code, value in events if (uid := decoder.feed(type_, code, value))]
+    assert uids == expected
+
+
+def test_shift_applies_to_digits_but_not_hex_letters():
+    decoder = KeycodeDecoder()
+    keys = [(KEY_LEFTSHIFT, KEY_DOWN), (30, KEY_DOWN), (30, KEY_UP), (2, KEY_DOWN), (KEY_LEFTSHIFT, KEY_UP), (2, KEY_DOWN)]
+    for code, value in keys:
+        assert decoder.feed(EV_KEY, code, value) is None
+    assert decoder.feed(EV_KEY, KEY_ENTER, KEY_DOWN) == "a!1"
@@ -0,0 +1,25 @@
+import threading
+
+from app import rfid
+
+
+def test_only_one_lock_holder_and_takeover(tmp_path):
+    path = str(tmp_path / "reader.lock")
+    leader, follower = rfid.LeaderLock(path), rfid.LeaderLock(path)
+    assert leader.try_acquire()
+    assert not follower.try_acquire()
+
+    elected = threading.Event()
+    rfid._leader_lock = follower
+    rfid._election_stop.clear()
+    thread = threading.Thread(target=rfid._wait_for_leadership, args=(elected.set, 0.05), daemon=True)
+    thread.start()
+    try:
+        assert not elected.wait(0.2)
+        leader.release()
+        assert elected.wait(1.0)
+        assert follower.held
+    finally:
+        rfid._election_stop.set()
+        follower.release()
+        rfid._leader_lock = None
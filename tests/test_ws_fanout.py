@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+from app import rfid
+from app.config import config
+
+
+class FakeWebSocket:
+    def __init__(self, delay):
+        self.delay = delay
+        self.received = []
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.received.append(json.loads(text))
+
+    async def close(self):
+        pass
+
+
+def test_slow_client_gets_resync_without_delaying_others():
+    async def scenario():
+        fast = FakeWebSocket(0)
+        slow = FakeWebSocket(0.1)
+        clients = [rfid.register_websocket(fast), rfid.register_websocket(slow)]
+        try:
+            for i in range(config.WS_QUEUE_SIZE + 10):
+                rfid.broadcast({"type": "checkin", "seq": i})
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.05)
+            fast_done = list(fast.received)
+            await asyncio.sleep(0.3)
+            return fast_done, slow.received
+        finally:
+            for client in clients:
+                client.close()
+
+    fast_events, slow_events = asyncio.run(scenario())
+    assert [ev["seq"] for ev in fast_events] == list(range(config.WS_QUEUE_SIZE + 10))
+    # The slow client's backlog was replaced by a resync marker
+    assert slow_events[0]["seq"] == 0
+    assert slow_events[1] == {"type": "resync"}
+
+
+def test_reconnect_replays_missed_events_or_asks_for_resync():
+    async def scenario(since):
+        ws = FakeWebSocket(0)
+        client = rfid.register_websocket(ws, since=since)
+        await asyncio.sleep(0.01)
+        client.close()
+        return ws.received
+
+    rfid._recent_events.clear()
+    for seq in range(10, 15):
+        rfid._recent_events.append((seq, '{"type": "checkin", "seq": %d}' % seq))
+    try:
+        assert [ev["seq"] for ev in asyncio.run(scenario(12))] == [13, 14]
+        assert asyncio.run(scenario(14)) == []
+        # Events 6..9 fell out of the buffer; so did a restarted sequence
+        assert asyncio.run(scenario(5)) == [{"type": "resync"}]
+        assert asyncio.run(scenario(99)) == [{"type": "resync"}]
+    finally:
+        rfid._recent_events.clear()
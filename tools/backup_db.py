@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Take an online backup of the PiControl DB and prune expired backups."""
+import argparse
+from app.backup import backup_with_retention
+from app.config import config
+from app.db import DB_PATH
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Online backup of the PiControl database")
+    p.add_argument("--db-path", default=DB_PATH, help="Path to sqlite DB file")
+    p.add_argument("--backup-dir", default=config.BACKUP_DIR, help="Directory to store DB backups")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    result = backup_with_retention(db_path=args.db_path, backup_dir=args.backup_dir)
+    print(f"Backup created at {result.path}")
+    print(f"Copied {result.pages} pages in {result.steps} steps ({result.restarts} restarts) in {result.duration:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@
 """Delete old check-ins and optionally archived/inactive employees."""
 from __future__ import annotations
 import argparse
-import shutil
 import os
+import time
 from datetime import datetime, timezone, timedelta
+from sqlalchemy import delete, func
 from sqlmodel import Session, select
 from app.db import get_engine
-from app.models import Employee, CheckIn
+from app.backup import backup_with_retention
+from app.models import Employee, CheckIn, EmployeePresence, DailyWorkSummary
 
 
 DEFAULT_DB_DIR = os.environ.get("PICONTROL_DB_DIR", "/var/lib/picontrol")
@@ -16,11 +18,9 @@ BACKUP_DIR = os.environ.get("PICONTROL_BACKUP_DIR", "/var/backups/picontrol")
 
 
 def backup_db(db_path: str, backup_dir: str) -> str:
-    os.makedirs(backup_dir, exist_ok=True)
-    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    dest = os.path.join(backup_dir, f"pi_control.db.backup.{ts}")
-    shutil.copy2(db_path, dest)
-    return dest
+    result = backup_with_retention(db_path=db_path, backup_dir=backup_dir)
+    print(f"Copied {result.pages} pages in {result.steps} steps ({result.restarts} restarts) in {result.duration:.2f}s")
+    return result.path
 
 
 def parse_args():
@@ -32,9 +32,95 @@ def parse_args():
     p.add_argument("--dry-run", action="store_true", help="Do not modify DB, just print what would be done")
     p.add_argument("--db-path", default=DB_PATH, help="Path to sqlite DB file")
     p.add_argument("--backup-dir", default=BACKUP_DIR, help="Directory to store DB backups")
+    p.add_argument("--chunk-size", type=int, default=5000, help="Rows deleted per transaction (default 5000)")
+    p.add_argument("--pause-ms", type=float, default=50, help="Pause between chunks so kiosk writes get through (default 50ms)")
+    p.add_argument("--vacuum-pages", type=int, default=0,
+                   help="Pages to release with incremental vacuum (default 0 = all free pages)")
     return p.parse_args()
 
 
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def delete_old_checkins(session: Session, cutoff: datetime, chunk_size: int, pause: float) -> int:
+    """Delete check-ins older than cutoff in primary-key chunks, one commit each."""
+    total = session.exec(select(func.count()).select_from(CheckIn).where(CheckIn.timestamp <= cutoff)).one()
+    print(f"Deleting {total} check-ins in chunks of {chunk_size}")
+    deleted = 0
+    last_id = 0
+    t0 = time.monotonic()
+    while True:
+        ids = session.exec(
+            select(CheckIn.id).where(CheckIn.id > last_id).where(CheckIn.timestamp <= cutoff).order_by(CheckIn.id).limit(chunk_size)
+        ).all()
+        if not ids:
+            break
+        session.exec(delete(CheckIn).where(CheckIn.id.in_(ids)))
+        session.commit()
+        deleted += len(ids)
+        last_id = ids[-1]
+        elapsed = time.monotonic() - t0
+        print(f"  {deleted}/{total} check-ins deleted ({deleted / max(elapsed, 1e-6):.0f} rows/s)")
+        time.sleep(pause)
+    return deleted
+
+
+def find_inactive_employees(session: Session, cutoff: datetime):
+    """Employees archived before cutoff or without check-ins since, in one grouped query."""
+    last_checkin = func.max(CheckIn.timestamp)
+    stmt = (
+        select(Employee.document_id, Employee.name, Employee.archived_at, last_checkin)
+        .outerjoin(CheckIn, CheckIn.employee_id == Employee.document_id)
+        .group_by(Employee.document_id)
+    )
+    to_delete = []
+    for document_id, name, archived_at, last in session.exec(stmt):
+        if archived_at is not None and _as_utc(archived_at) <= cutoff:
+            to_delete.append((document_id, name, f"archived_at {archived_at} <= cutoff"))
+        elif last is None or _as_utc(_parse_ts(last)) <= cutoff:
+            to_delete.append((document_id, name, f"last_checkin {last} <= cutoff or none"))
+    return to_delete
+
+
+def _parse_ts(value):
+    # MAX() over a DateTime column comes back as the raw stored string
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def delete_employees(session: Session, document_ids, chunk_size: int, pause: float) -> int:
+    deleted = 0
+    for i in range(0, len(document_ids), chunk_size):
+        chunk = document_ids[i:i + chunk_size]
+        session.exec(delete(EmployeePresence).where(EmployeePresence.employee_id.in_(chunk)))
+        session.exec(delete(DailyWorkSummary).where(DailyWorkSummary.employee_id.in_(chunk)))
+        session.exec(delete(Employee).where(Employee.document_id.in_(chunk)))
+        session.commit()
+        deleted += len(chunk)
+        time.sleep(pause)
+    return deleted
+
+
+def optimize(engine, vacuum_pages: int):
+    """Refresh planner statistics and hand free pages back to the filesystem."""
+    with engine.connect() as conn:
+        t0 = time.monotonic()
+        conn.exec_driver_sql("ANALYZE")
+        print(f"ANALYZE done in {time.monotonic() - t0:.2f}s")
+        mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        free = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        if mode != 2:
+            print(f"Incremental vacuum unavailable (auto_vacuum={mode}, {free} free pages); "
+                  "run VACUUM once in a maintenance window to enable it")
+            return
+        t0 = time.monotonic()
+        # The pragma frees one page per step and execute() only steps once;
+        # executescript() runs it to completion.
+        pragma = f"PRAGMA incremental_vacuum({int(vacuum_pages)});" if vacuum_pages else "PRAGMA incremental_vacuum;"
+        conn.connection.driver_connection.executescript(pragma)
+        print(f"Incremental vacuum released {free - conn.exec_driver_sql('PRAGMA freelist_count').scalar()} pages in {time.monotonic() - t0:.2f}s")
+
+
 def main():
     args = parse_args()
     cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
@@ -52,44 +138,30 @@ def main():
         print("Dry-run: skipping backup")
 
     engine = get_engine()
+    pause = args.pause_ms / 1000.0
 
     to_delete_employees = []
     deleted_checkins = 0
 
     with Session(engine) as session:
-        stmt = select(CheckIn).where(CheckIn.timestamp <= cutoff)
-        old_checkins = session.exec(stmt).all()
-        print(f"Found {len(old_checkins)} check-ins older than cutoff")
-        if not args.dry_run:
-            for f in old_checkins:
-                session.delete(f)
+        if args.dry_run:
+            count = session.exec(select(func.count()).select_from(CheckIn).where(CheckIn.timestamp <= cutoff)).one()
+            print(f"Found {count} check-ins older than cutoff")
+        else:
+            deleted_checkins = delete_old_checkins(session, cutoff, args.chunk_size, pause)
+            session.exec(delete(DailyWorkSummary).where(DailyWorkSummary.day < cutoff.date()))
             session.commit()
-            deleted_checkins = len(old_checkins)
 
         if args.delete_employees:
-            employees = session.exec(select(Employee)).all()
-            for e in employees:
-                remove = False
-                reason = None
-                if e.archived_at is not None and e.archived_at <= cutoff:
-                    remove = True
-                    reason = f"archived_at {e.archived_at} <= cutoff"
-                else:
-                    last_stmt = select(CheckIn).where(CheckIn.employee_id == e.document_id).order_by(CheckIn.timestamp.desc())
-                    last = session.exec(last_stmt).first()
-                    if not last or last.timestamp <= cutoff:
-                        remove = True
-                        reason = f"last_checkin {getattr(last, 'timestamp', None)} <= cutoff or none"
-
-                if remove:
-                    to_delete_employees.append((e, reason))
-
+            to_delete_employees = find_inactive_employees(session, cutoff)
             print(f"Found {len(to_delete_employees)} employees to delete (delete_employees=True)")
+            for document_id, name, reason in to_delete_employees:
+                print(f"{'Would delete' if args.dry_run else 'Deleting'} employee {document_id} ({name}): {reason}")
             if not args.dry_run:
-                for e, reason in to_delete_employees:
-                    print(f"Deleting employee {e.document_id} ({e.name}): {reason}")
-                    session.delete(e)
-                session.commit()
+                delete_employees(session, [d for d, _, _ in to_delete_employees], args.chunk_size, pause)
+
+    if not args.dry_run:
+        optimize(engine, args.vacuum_pages)
 
     print("Cleanup complete.")
     if args.dry_run:
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Fill a fresh PiControl database with years of synthetic check-in history.
+
+The data is shaped like a real site so hours_worked, the check-in listings,
+cleanup_old_records and the admin pages can be benchmarked without customer
+data:
+
+- morning, day, afternoon and night shifts; night shifts cross midnight, and
+  some day-shift workers clock out and back in for lunch;
+- start/end jitter, weekends off (some work Saturdays), random absences;
+- forgotten exits: the exit tap is missing, so - exactly as on a real
+  reader - the next morning's tap toggles to "exit", closing an overnight
+  session, and the employee taps again a few seconds later to get "entry";
+- hires and leavers spread over the range; leavers are archived with no
+  RFID, and some of their cards are reissued to later hires (logged as
+  reassign_rfid admin actions), plus --admin-actions routine audit entries.
+
+Check-ins are generated day by day and inserted in timestamp order, so ids
+grow with time as in production. Rows go in with executemany in large
+batches, with synchronous=OFF and the check-in index built after the load,
+then presence and daily summaries are rebuilt and the planner statistics
+refreshed. The same --seed always produces the same database.
+
+Usage:
+    PICONTROL_DB_DIR=/tmp/bench python tools/generate_history.py --employees 5000 --years 4
+"""
+from __future__ import annotations
+import argparse
+import heapq
+import os
+import random
+import sqlite3
+import time
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlmodel import SQLModel, Session, create_engine
+from app.models import CheckIn
+
+
+DEFAULT_DB_DIR = os.environ.get("PICONTROL_DB_DIR", "/var/lib/picontrol")
+DB_PATH = os.path.join(DEFAULT_DB_DIR, "pi_control.db")
+
+FIRST_NAMES = ["Ana", "Luis", "María", "José", "Carmen", "Javier", "Lucía", "David", "Elena", "Pablo",
+               "Laura", "Sergio", "Marta", "Daniel", "Sara", "Jorge", "Paula", "Alberto", "Irene", "Raúl",
+               "Nuria", "Fatima", "Youssef", "Ioana", "Andrei", "Chen", "Olga", "Samuel", "Inés", "Hugo"]
+LAST_NAMES = ["García", "Martínez", "López", "Sánchez", "Pérez", "Gómez", "Martín", "Jiménez", "Ruiz",
+              "Hernández", "Díaz", "Moreno", "Muñoz", "Álvarez", "Romero", "Alonso", "Gutiérrez", "Navarro",
+              "Torres", "Domínguez", "Vázquez", "Ramos", "Gil", "Serrano", "Blanco", "Haddouche", "Popescu"]
+
+# name -> (local start hour, hours on site)
+SHIFTS = {"morning": (6.0, 8.0), "day": (8.0, 9.0), "afternoon": (14.0, 8.0), "night": (22.0, 8.0)}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Generate synthetic check-in history into a fresh PiControl DB")
+    p.add_argument("--db-path", default=DB_PATH, help="SQLite file to create (default: $PICONTROL_DB_DIR/pi_control.db)")
+    p.add_argument("--employees", type=int, default=1000)
+    p.add_argument("--years", type=float, default=2.0, help="Length of the history, ending at --end")
+    p.add_argument("--end", type=date.fromisoformat, default=date.today(), help="Last day of history (YYYY-MM-DD)")
+    p.add_argument("--timezone", default="Europe/Madrid", help="Local timezone of the site (stored in Config)")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--night-share", type=float, default=0.15, help="Share of employees on night shifts")
+    p.add_argument("--lunch-share", type=float, default=0.5, help="Share of day-shift employees clocking out for lunch")
+    p.add_argument("--forgotten-exit-rate", type=float, default=0.01, help="Probability an exit tap is missing")
+    p.add_argument("--absence-rate", type=float, default=0.04, help="Probability of missing a working day")
+    p.add_argument("--turnover", type=float, default=0.15, help="Share of employees who leave (and are archived) per year")
+    p.add_argument("--reassign-share", type=float, default=0.5, help="Share of leavers whose card is reissued to a later hire")
+    p.add_argument("--admin-actions", type=int, default=2000, help="Routine audit log entries spread over the range")
+    p.add_argument("--batch-size", type=int, default=50000, help="Rows per executemany/commit")
+    p.add_argument("--skip-aggregates", action="store_true", help="Do not rebuild presence and daily summaries")
+    p.add_argument("--force", action="store_true", help="Delete an existing database at --db-path first")
+    return p.parse_args()
+
+
+class _Worker:
+    __slots__ = ("document_id", "name", "rfid_uid", "card", "shift", "lunch", "saturdays", "hired", "left", "archived_at")
+
+    def __init__(self, document_id, name, card, shift, lunch, saturdays, hired, left):
+        self.document_id = document_id
+        self.name = name
+        self.card = card  # UID the worker taps with
+        self.rfid_uid = card  # UID assigned at the end of the history (None once archived)
+        self.shift = shift
+        self.lunch = lunch
+        self.saturdays = saturdays
+        self.hired = hired
+        self.left = left
+        self.archived_at = None
+
+
+def plan_workers(args, rng: random.Random, start: date, end: date):
+    """Decide who works when; returns (workers, reassignments as (day, uid, from, to))."""
+    days = (end - start).days + 1
+    cards = set()
+    day_share = max(0.0, 1.0 - args.night_share - 0.35)
+    shift_weights = {"morning": 0.15, "afternoon": 0.2, "night": args.night_share, "day": day_share}
+    workers = []
+    for i in range(args.employees):
+        # Employees present from the start are the bulk; the rest are spread-out hires
+        hired = start if rng.random() < 0.6 else start + timedelta(days=rng.randrange(days))
+        left = None
+        if rng.random() < min(1.0, args.turnover * args.years):
+            tenure = rng.randrange(30, max(31, days))
+            if hired + timedelta(days=tenure) < end:
+                left = hired + timedelta(days=tenure)
+        while True:
+            card = "%08x" % rng.getrandbits(32)
+            if card not in cards:
+                cards.add(card)
+                break
+        shift = rng.choices(list(shift_weights), weights=list(shift_weights.values()))[0]
+        workers.append(_Worker(
+            document_id=f"E{i:06d}",
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            card=card,
+            shift=shift,
+            lunch=shift == "day" and rng.random() < args.lunch_share,
+            saturdays=rng.random() < 0.1,
+            hired=hired,
+            left=left,
+        ))
+
+    reassignments = []
+    leavers = sorted((w for w in workers if w.left), key=lambda w: w.left)
+    hires = sorted((w for w in workers if w.hired > start), key=lambda w: w.hired)
+    taken = set()
+    for leaver in leavers:
+        leaver.archived_at = leaver.left + timedelta(days=rng.randrange(0, 15))
+        leaver.rfid_uid = None
+        if rng.random() >= args.reassign_share:
+            continue
+        for hire in hires:
+            if hire.hired > leaver.archived_at and hire.document_id not in taken:
+                taken.add(hire.document_id)
+                hire.card = hire.rfid_uid = leaver.card
+                reassignments.append((hire.hired, leaver.card, leaver.document_id, hire.document_id))
+                break
+    # A reissued card can outlive its second holder too: only the last holder keeps it
+    for worker in workers:
+        if worker.archived_at:
+            worker.rfid_uid = None
+    return workers, reassignments
+
+
+def _shift_taps(worker: _Worker, rng: random.Random, args):
+    """(seconds after local midnight, is an entry) for each tap of one working day."""
+    start_hour, hours = SHIFTS[worker.shift]
+    start = start_hour * 3600 + rng.gauss(0, 600)
+    end = start + hours * 3600 + rng.gauss(0, 900)
+    taps = [start]
+    if worker.lunch:
+        out = start + 4 * 3600 + rng.gauss(0, 900)
+        taps += [out, out + rng.uniform(1800, 3600)]
+    taps.append(end)
+    # Exits are every other tap; a forgotten one is just missing
+    return [(t, i % 2 == 0) for i, t in enumerate(taps) if i % 2 == 0 or rng.random() >= args.forgotten_exit_rate]
+
+
+class _TimestampFormatter:
+    """Formats UTC epoch seconds the way SQLAlchemy stores naive DateTime in SQLite."""
+
+    def __init__(self):
+        self._days = {}
+
+    def __call__(self, epoch: float) -> str:
+        whole = int(epoch)
+        day, secs = divmod(whole, 86400)
+        prefix = self._days.get(day)
+        if prefix is None:
+            prefix = self._days[day] = datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y-%m-%d ")
+        h, rem = divmod(secs, 3600)
+        m, s = divmod(rem, 60)
+        return f"{prefix}{h:02d}:{m:02d}:{s:02d}.{int((epoch - whole) * 1e6):06d}"
+
+
+def generate_checkins(workers, args, rng: random.Random, start: date, end: date, tz):
+    """Yield (employee_id, type, timestamp) rows in timestamp order."""
+    fmt = _TimestampFormatter()
+    last_type = {}
+    pending = []  # heap of (epoch, employee_id, meant as an entry)
+    day = start
+    while day <= end + timedelta(days=1):
+        midnight = datetime(day.year, day.month, day.day, tzinfo=tz).timestamp()
+        if day <= end:
+            weekday = day.weekday()
+            for worker in workers:
+                if worker.hired > day or (worker.left and worker.left <= day):
+                    continue
+                if weekday == 6 or (weekday == 5 and not worker.saturdays) or rng.random() < args.absence_rate:
+                    continue
+                for offset, is_entry in _shift_taps(worker, rng, args):
+                    heapq.heappush(pending, (midnight + offset, worker.document_id, is_entry))
+        # Nothing generated later starts before the next local midnight
+        next_midnight = midnight + 86400
+        while pending and (pending[0][0] < next_midnight or day > end):
+            epoch, employee_id, is_entry = heapq.heappop(pending)
+            type_ = "exit" if last_type.get(employee_id) == "entry" else "entry"
+            last_type[employee_id] = type_
+            if is_entry and type_ == "exit":
+                # The kiosk said goodbye on arrival: tap again
+                heapq.heappush(pending, (epoch + rng.uniform(3, 20), employee_id, True))
+            yield employee_id, type_, fmt(epoch)
+        day += timedelta(days=1)
+
+
+_ROUTINE_ACTIONS = ("login", "logout", "manual_checkin", "create_employee", "update_config", "export")
+
+
+def routine_admin_actions(count: int, rng: random.Random, start: date, end: date, workers):
+    """Yield (timestamp, username, action, details) audit rows in time order."""
+    span = (end - start).days * 86400
+    users = ["admin"] + [f"manager{i}" for i in range(1, 4)]
+    fmt = _TimestampFormatter()
+    origin = datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp()
+    for offset in sorted(rng.uniform(0, span) for _ in range(count)):
+        action = rng.choice(_ROUTINE_ACTIONS)
+        details = f"employee {rng.choice(workers).document_id}" if action in ("manual_checkin", "create_employee") else None
+        yield fmt(origin + offset), rng.choice(users), action, details
+
+
+def _has_data(db_path: str) -> bool:
+    conn = sqlite3.connect(db_path)
+    try:
+        return any(conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() for table in ("employee", "checkin"))
+    except sqlite3.OperationalError:
+        return False  # tables not created yet
+    finally:
+        conn.close()
+
+
+def _fmt_date(value: date) -> str:
+    return datetime(value.year, value.month, value.day).strftime("%Y-%m-%d %H:%M:%S.000000")
+
+
+def main():
+    args = parse_args()
+    if os.path.exists(args.db_path) and _has_data(args.db_path):
+        if not args.force:
+            raise SystemExit(f"{args.db_path} already has employees or check-ins; pass --force to replace it")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db_path + suffix):
+                os.remove(args.db_path + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(args.db_path)), exist_ok=True)
+    # Imported late: importing app.db initialises the configured database
+    from app.crud import rebuild_presence, rebuild_daily_summaries
+
+    rng = random.Random(args.seed)
+    tz = ZoneInfo(args.timezone)
+    end = args.end
+    start = end - timedelta(days=int(args.years * 365.25) - 1)
+
+    conn = sqlite3.connect(args.db_path)
+    # Same file-level settings the app's writer applies to a new database
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-65536")
+    engine = create_engine(f"sqlite:///{args.db_path}")
+    SQLModel.metadata.create_all(engine)
+    # Its connection would keep the pre-load schema cached (with the index
+    # dropped below); SQLite checks CREATE INDEX names against that cache
+    engine.dispose()
+
+    workers, reassignments = plan_workers(args, rng, start, end)
+    conn.executemany(
+        "INSERT INTO employee (document_id, name, rfid_uid, archived_at) VALUES (?, ?, ?, ?)",
+        [(w.document_id, w.name, w.rfid_uid, _fmt_date(w.archived_at) if w.archived_at else None) for w in workers],
+    )
+    conn.execute("INSERT INTO config (key, value) VALUES ('timezone', ?)", (args.timezone,))
+    conn.executemany(
+        "INSERT INTO adminaction (timestamp, admin_username, action, details) VALUES (?, 'admin', 'reassign_rfid', ?)",
+        [(_fmt_date(day), f"rfid {uid} removed from {old} due to reassignment to {new}") for day, uid, old, new in reassignments],
+    )
+    conn.executemany(
+        "INSERT INTO adminaction (timestamp, admin_username, action, details) VALUES (?, ?, ?, ?)",
+        routine_admin_actions(args.admin_actions, rng, start, end, workers),
+    )
+    conn.commit()
+    print(f"{len(workers)} employees ({sum(1 for w in workers if w.archived_at)} archived, "
+          f"{len(reassignments)} card reassignments), {start} to {end}")
+
+    # Building the index once after the load is much cheaper than maintaining it
+    indexes = [index for index in CheckIn.__table__.indexes]
+    for index in indexes:
+        conn.execute(f"DROP INDEX IF EXISTS {index.name}")
+    insert = "INSERT INTO checkin (employee_id, type, timestamp) VALUES (?, ?, ?)"
+    total = 0
+    t0 = time.monotonic()
+    batch = []
+    for row in generate_checkins(workers, args, rng, start, end, tz):
+        batch.append(row)
+        if len(batch) >= args.batch_size:
+            conn.executemany(insert, batch)
+            conn.commit()
+            total += len(batch)
+            batch = []
+            if total % (args.batch_size * 20) == 0:
+                print(f"  {total:,} check-ins ({total / (time.monotonic() - t0):,.0f} rows/s)")
+    conn.executemany(insert, batch)
+    conn.commit()
+    total += len(batch)
+    elapsed = time.monotonic() - t0
+    print(f"Inserted {total:,} check-ins in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    t0 = time.monotonic()
+    for index in indexes:
+        index.create(engine)
+    print(f"Built check-in indexes in {time.monotonic() - t0:.1f}s")
+
+    if not args.skip_aggregates:
+        with Session(engine) as session:
+            t0 = time.monotonic()
+            rows = rebuild_presence(session)
+            print(f"Rebuilt presence for {rows} employees in {time.monotonic() - t0:.1f}s")
+            t0 = time.monotonic()
+            rows = rebuild_daily_summaries(session)
+            print(f"Rebuilt {rows} daily work summaries in {time.monotonic() - t0:.1f}s")
+
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    engine.dispose()
+    print(f"Wrote {args.db_path} ({os.path.getsize(args.db_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Payroll report for every employee over a range of local days.
+
+Writes one row per employee (total hours, overtime against the
+max_hours_per_day setting, unmatched entries, then one column per day) as
+CSV or NDJSON, or the whole report as JSON. Needs NumPy.
+
+    python tools/payroll_report.py --start 2025-01-01 --end 2025-01-31 --output enero.csv
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import date
+
+from sqlmodel import Session
+from app.db import get_read_engine
+from app.payroll import PayrollUnavailable, payroll_report, payroll_rows
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="All-employee payroll report (hours, per-day hours, overtime, unmatched entries)")
+    p.add_argument("--start", type=date.fromisoformat, required=True, help="First local day (YYYY-MM-DD)")
+    p.add_argument("--end", type=date.fromisoformat, required=True, help="Last local day, inclusive (YYYY-MM-DD)")
+    p.add_argument("--employee", help="Only this employee")
+    p.add_argument("--max-hours", type=float, help="Overtime threshold per day (default: max_hours_per_day setting)")
+    p.add_argument("--format", choices=("csv", "ndjson", "json"), default="csv")
+    p.add_argument("--output", help="File to write (default: stdout)")
+    return p.parse_args()
+
+
+def write(report: dict, fmt: str, out):
+    if fmt == "json":
+        json.dump(report, out, indent=2)
+        out.write("\n")
+        return
+    header, rows = payroll_rows(report)
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(header)
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(dict(zip(header, row))) + "\n")
+
+
+def main():
+    args = parse_args()
+    if args.end < args.start:
+        sys.exit("--end must not be before --start")
+    t0 = time.monotonic()
+    try:
+        with Session(get_read_engine()) as session:
+            report = payroll_report(session, args.start, args.end, employee_id=args.employee, max_hours_per_day=args.max_hours)
+    except PayrollUnavailable as e:
+        sys.exit(f"{e} (pip install numpy)")
+    elapsed = time.monotonic() - t0
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write(report, args.format, f)
+    else:
+        write(report, args.format, sys.stdout)
+    print(f"{len(report['employees'])} employees, {len(report['days'])} days in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
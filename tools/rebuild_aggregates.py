@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Recompute derived check-in state (presence, daily summaries) from CheckIn.
+
+Run once after upgrading an existing database, or after importing/editing a
+database outside the application.
+"""
+import time
+from sqlmodel import Session
+from app.db import get_engine
+from app.crud import rebuild_presence, rebuild_daily_summaries
+
+
+def main():
+    engine = get_engine()
+    with Session(engine) as session:
+        t0 = time.monotonic()
+        rows = rebuild_presence(session)
+        print(f"Rebuilt presence for {rows} employees in {time.monotonic() - t0:.2f}s")
+        t0 = time.monotonic()
+        rows = rebuild_daily_summaries(session)
+        print(f"Rebuilt {rows} daily work summaries in {time.monotonic() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()